@@ -0,0 +1,72 @@
+from django.db import transaction
+from core.caching import bump_versions
+from users.models import User
+from .models import Notification
+from .outbox import enqueue_notification_emails
+from .push import publish_notifications
+from .counters import forget_unread_counts
+
+BATCH_SIZE = 1000
+
+
+def recipients_for(recipients=None, role=None, project=None, supervisor=None):
+    """Return a ``User`` queryset for exactly one recipient selector."""
+    if recipients is not None:
+        users = User.objects.filter(id__in=recipients)
+    elif role is not None:
+        users = User.objects.filter(role=role)
+    elif project is not None:
+        users = User.objects.filter(assigned_projects_as_student=project)
+    else:
+        users = User.objects.filter(
+            assigned_projects_as_student__supervisor=supervisor
+        ).distinct()
+    return users.filter(is_active=True).order_by("id")
+
+
+@transaction.atomic
+def send_notifications(users, message, type="info", link=None):
+    """Create one notification per user and queue their emails.
+
+    Recipients are streamed in batches of ``BATCH_SIZE``, so memory and the
+    number of queries grow with the batch count rather than per recipient.
+    Returns the number of notifications created.
+    """
+    created = 0
+    batch = []
+    for user_id, email in users.values_list("id", "email").iterator(
+        chunk_size=BATCH_SIZE
+    ):
+        batch.append((user_id, email))
+        if len(batch) == BATCH_SIZE:
+            created += _create_batch(batch, message, type, link)
+            batch = []
+    if batch:
+        created += _create_batch(batch, message, type, link)
+    return created
+
+
+def _create_batch(batch, message, type, link):
+    return create_notifications(
+        [
+            Notification(recipient_id=user_id, message=message, type=type, link=link)
+            for user_id, _ in batch
+        ],
+        emails=dict(batch),
+    )
+
+
+def create_notifications(notifications, emails=None):
+    """Insert unsaved ``notifications`` with one ``bulk_create``.
+
+    ``bulk_create`` sends no signals, so this does what they would: queue the
+    emails (``emails`` maps recipient ids to addresses), push the events and
+    invalidate the recipients' unread counts and cached lists.
+    """
+    notifications = Notification.objects.bulk_create(notifications)
+    recipient_ids = {notification.recipient_id for notification in notifications}
+    enqueue_notification_emails(notifications, emails=emails)
+    publish_notifications(notifications)
+    forget_unread_counts(recipient_ids)
+    bump_versions("announcements.notification", recipient_ids)
+    return len(notifications)
@@ -0,0 +1,46 @@
+from django.core.cache import cache
+from django.db import transaction
+from .models import Notification
+
+# The cached count is reconciled with the database at least this often.
+UNREAD_COUNT_TTL = 300
+
+
+def unread_cache_key(user_id):
+    return f"notifications:unread:{user_id}"
+
+
+def unread_count(user_id):
+    """Return the user's unread count, counting in the database on a miss."""
+    key = unread_cache_key(user_id)
+    count = cache.get(key)
+    if count is None:
+        count = Notification.objects.filter(recipient_id=user_id, read=False).count()
+        cache.set(key, count, UNREAD_COUNT_TTL)
+    return count
+
+
+def adjust_unread_count(user_id, delta):
+    """Shift a cached count once the current transaction commits.
+
+    A count that is not cached is left alone; the next read recounts it.
+    """
+
+    def apply():
+        try:
+            cache.incr(unread_cache_key(user_id), delta)
+        except ValueError:
+            pass
+
+    transaction.on_commit(apply)
+
+
+def set_unread_count(user_id, count):
+    transaction.on_commit(
+        lambda: cache.set(unread_cache_key(user_id), count, UNREAD_COUNT_TTL)
+    )
+
+
+def forget_unread_counts(user_ids):
+    keys = [unread_cache_key(user_id) for user_id in user_ids]
+    transaction.on_commit(lambda: cache.delete_many(keys))
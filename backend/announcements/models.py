@@ -1,4 +1,5 @@
 from django.db import models
+from django.utils import timezone
 from users.models import User
 
 
@@ -17,6 +18,59 @@ class Notification(models.Model):
     created_at = models.DateTimeField(auto_now_add=True)
     link = models.URLField(blank=True, null=True)
     email_sent = models.BooleanField(default=False)
+    updated_at = models.DateTimeField(auto_now=True)
+
+    class Meta:
+        indexes = [
+            models.Index(fields=["updated_at", "id"], name="notification_updated_idx"),
+            models.Index(fields=["created_at", "id"], name="notification_created_idx"),
+            models.Index(
+                fields=["recipient", "created_at", "id"],
+                name="notification_recipient_idx",
+            ),
+            models.Index(
+                fields=["recipient", "created_at"],
+                condition=models.Q(read=False),
+                name="notification_unread_idx",
+            ),
+        ]
 
     def __str__(self):
         return f"To {self.recipient.email}: {self.message[:30]}..."
+
+
+class OutgoingEmail(models.Model):
+    """Durable outbox row for an email the delivery worker still has to send."""
+
+    STATUS_CHOICES = [
+        ("pending", "Pending"),
+        ("sending", "Sending"),
+        ("sent", "Sent"),
+        ("failed", "Failed"),
+    ]
+    notification = models.ForeignKey(
+        Notification,
+        on_delete=models.CASCADE,
+        null=True,
+        blank=True,
+        related_name="emails",
+    )
+    to = models.EmailField()
+    subject = models.CharField(max_length=255)
+    body = models.TextField()
+    status = models.CharField(max_length=20, choices=STATUS_CHOICES, default="pending")
+    attempts = models.PositiveIntegerField(default=0)
+    next_attempt_at = models.DateTimeField(default=timezone.now)
+    last_error = models.TextField(blank=True)
+    created_at = models.DateTimeField(auto_now_add=True)
+    sent_at = models.DateTimeField(null=True, blank=True)
+
+    class Meta:
+        indexes = [
+            models.Index(
+                fields=["status", "next_attempt_at"], name="outgoing_email_due_idx"
+            ),
+        ]
+
+    def __str__(self):
+        return f"{self.subject} to {self.to} ({self.status})"
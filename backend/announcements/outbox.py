@@ -0,0 +1,145 @@
+import datetime
+
+from django.conf import settings
+from django.core.mail import EmailMessage, get_connection
+from django.db import transaction
+from django.db.models import F, Q
+from django.utils import timezone
+from core.caching import bump_versions
+from .models import Notification, OutgoingEmail
+
+
+def notification_email(notification, email):
+    return OutgoingEmail(
+        notification=notification,
+        to=email,
+        subject=f"FYP Notification: {notification.type.title()}",
+        body=notification.message,
+    )
+
+
+def enqueue_notification_emails(notifications, emails=None):
+    """Queue one email per notification with a single bulk insert.
+
+    ``emails`` optionally maps recipient ids to addresses so callers that
+    already know them avoid touching ``notification.recipient``.
+    """
+    rows = []
+    for notification in notifications:
+        if notification.email_sent:
+            continue
+        if emails is not None:
+            email = emails.get(notification.recipient_id)
+        else:
+            email = notification.recipient.email
+        if email:
+            rows.append(notification_email(notification, email))
+    return OutgoingEmail.objects.bulk_create(
+        rows, batch_size=settings.EMAIL_OUTBOX_BATCH_SIZE
+    )
+
+
+def claim_due(batch_size):
+    """Lease a batch of due rows so concurrent workers never send twice.
+
+    Rows stay in ``sending`` until delivered; if a worker dies the lease
+    (``EMAIL_OUTBOX_LEASE``, independent of the retry backoff) expires and
+    the rows become due again.
+    """
+    now = timezone.now()
+    with transaction.atomic():
+        due = (
+            OutgoingEmail.objects.filter(
+                Q(status="pending") | Q(status="sending"), next_attempt_at__lte=now
+            )
+            .order_by("next_attempt_at", "id")
+            .select_for_update(skip_locked=True)
+        )
+        ids = list(due.values_list("id", flat=True)[:batch_size])
+        OutgoingEmail.objects.filter(id__in=ids).update(
+            status="sending",
+            next_attempt_at=now
+            + datetime.timedelta(seconds=settings.EMAIL_OUTBOX_LEASE),
+        )
+    return list(OutgoingEmail.objects.filter(id__in=ids).order_by("id"))
+
+
+def deliver_pending(batch_size=None):
+    """Send one batch of due emails over a single connection.
+
+    Returns ``(sent, failed)`` counts. Failed rows are retried with
+    exponential backoff until ``EMAIL_OUTBOX_MAX_ATTEMPTS`` is reached.
+    Rows still unsent when half the lease has passed are released unchanged
+    rather than risk the lease expiring and another worker sending them too.
+    """
+    batch = claim_due(batch_size or settings.EMAIL_OUTBOX_BATCH_SIZE)
+    if not batch:
+        return 0, 0
+
+    deadline = timezone.now() + datetime.timedelta(
+        seconds=settings.EMAIL_OUTBOX_LEASE / 2
+    )
+    sent, failed, released = [], [], []
+    connection = get_connection(fail_silently=False)
+    try:
+        connection.open()
+        for index, email in enumerate(batch):
+            if timezone.now() >= deadline:
+                released = batch[index:]
+                break
+            message = EmailMessage(
+                email.subject,
+                email.body,
+                settings.DEFAULT_FROM_EMAIL,
+                [email.to],
+                connection=connection,
+            )
+            try:
+                message.send()
+            except Exception as exc:
+                email.last_error = str(exc)
+                failed.append(email)
+            else:
+                sent.append(email)
+    except Exception as exc:
+        # The connection itself failed: nothing left in the batch went out.
+        done = {email.id for email in sent + failed + released}
+        for email in batch:
+            if email.id not in done:
+                email.last_error = str(exc)
+                failed.append(email)
+    finally:
+        connection.close()
+
+    now = timezone.now()
+    with transaction.atomic():
+        if released:
+            OutgoingEmail.objects.filter(
+                id__in=[email.id for email in released], status="sending"
+            ).update(status="pending", next_attempt_at=now)
+        if sent:
+            OutgoingEmail.objects.filter(id__in=[email.id for email in sent]).update(
+                status="sent", sent_at=now, attempts=F("attempts") + 1
+            )
+            notifications = Notification.objects.filter(
+                id__in=[email.notification_id for email in sent]
+            )
+            notifications.update(email_sent=True, updated_at=now)
+            bump_versions(
+                "announcements.notification",
+                notifications.values_list("recipient_id", flat=True),
+            )
+        for email in failed:
+            email.attempts += 1
+            if email.attempts >= settings.EMAIL_OUTBOX_MAX_ATTEMPTS:
+                email.status = "failed"
+            else:
+                email.status = "pending"
+                email.next_attempt_at = now + datetime.timedelta(
+                    seconds=settings.EMAIL_OUTBOX_RETRY_DELAY
+                    * 2 ** (email.attempts - 1)
+                )
+        OutgoingEmail.objects.bulk_update(
+            failed, ["attempts", "status", "next_attempt_at", "last_error"]
+        )
+    return len(sent), len(failed)
@@ -0,0 +1,201 @@
+import asyncio
+import json
+import threading
+from collections import defaultdict
+
+from django.conf import settings
+from django.core.serializers.json import DjangoJSONEncoder
+from django.db import transaction
+from django.utils.module_loading import import_string
+
+HEARTBEAT_SECONDS = 15
+
+
+class InProcessBroker:
+    """Deliver events to subscribers connected to this process.
+
+    Publishers may run in any thread (sync views run in a worker thread under
+    ASGI); each subscriber's queue is fed through its own event loop.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._subscribers = defaultdict(set)
+
+    def publish(self, user_id, event):
+        with self._lock:
+            subscribers = list(self._subscribers.get(user_id, ()))
+        for loop, queue in subscribers:
+            loop.call_soon_threadsafe(queue.put_nowait, event)
+
+    async def subscribe(self, user_id):
+        subscription = _QueueSubscription(self, user_id)
+        with self._lock:
+            self._subscribers[user_id].add(subscription.key)
+        return subscription
+
+    def unsubscribe(self, user_id, key):
+        with self._lock:
+            self._subscribers[user_id].discard(key)
+            if not self._subscribers[user_id]:
+                del self._subscribers[user_id]
+
+
+class _QueueSubscription:
+    def __init__(self, broker, user_id):
+        self.broker = broker
+        self.user_id = user_id
+        self.queue = asyncio.Queue()
+        self.key = (asyncio.get_running_loop(), self.queue)
+
+    async def get(self, timeout):
+        """Return the next event, or None if nothing arrived within ``timeout``."""
+        try:
+            return await asyncio.wait_for(self.queue.get(), timeout)
+        except asyncio.TimeoutError:
+            return None
+
+    async def close(self):
+        self.broker.unsubscribe(self.user_id, self.key)
+
+
+class RedisBroker:
+    """Share events between processes over Redis-compatible pub/sub.
+
+    Needs the ``redis`` package; any server speaking the Redis protocol
+    (including a local stand-in) will do.
+    """
+
+    def __init__(self, url):
+        import redis
+        import redis.asyncio
+
+        self._client = redis.Redis.from_url(url)
+        self._async_client = redis.asyncio.Redis.from_url(url)
+
+    @staticmethod
+    def channel(user_id):
+        return f"fyp:push:{user_id}"
+
+    def publish(self, user_id, event):
+        self._client.publish(self.channel(user_id), json.dumps(event))
+
+    async def subscribe(self, user_id):
+        pubsub = self._async_client.pubsub()
+        await pubsub.subscribe(self.channel(user_id))
+        return _PubSubSubscription(pubsub, self.channel(user_id))
+
+
+class _PubSubSubscription:
+    def __init__(self, pubsub, channel):
+        self.pubsub = pubsub
+        self.channel = channel
+
+    async def get(self, timeout):
+        message = await self.pubsub.get_message(
+            ignore_subscribe_messages=True, timeout=timeout
+        )
+        return json.loads(message["data"]) if message else None
+
+    async def close(self):
+        await self.pubsub.unsubscribe(self.channel)
+        await self.pubsub.aclose()
+
+
+_broker = None
+
+
+def get_broker():
+    global _broker
+    if _broker is None:
+        broker_class = import_string(settings.PUSH_BROKER)
+        if settings.PUSH_BROKER_URL:
+            _broker = broker_class(settings.PUSH_BROKER_URL)
+        else:
+            _broker = broker_class()
+    return _broker
+
+
+def _encode(event):
+    # Round-trip through JSON so every broker sees plain, serializable data.
+    return json.loads(json.dumps(event, cls=DjangoJSONEncoder))
+
+
+def publish_after_commit(deliveries):
+    """Push each ``(user_ids, event)`` pair once the transaction commits."""
+    deliveries = [(user_ids, _encode(event)) for user_ids, event in deliveries]
+
+    def send():
+        broker = get_broker()
+        for user_ids, event in deliveries:
+            for user_id in user_ids:
+                broker.publish(user_id, event)
+
+    transaction.on_commit(send)
+
+
+def notification_event(notification):
+    return {
+        "type": "notification",
+        "data": {
+            "id": notification.id,
+            "recipient": notification.recipient_id,
+            "message": notification.message,
+            "type": notification.type,
+            "read": notification.read,
+            "created_at": notification.created_at,
+            "link": notification.link,
+            "email_sent": notification.email_sent,
+        },
+    }
+
+
+def feedback_message_event(message):
+    return {
+        "type": "feedback_message",
+        "data": {
+            "id": message.id,
+            "thread": message.thread_id,
+            "sender": message.sender_id,
+            "message": message.message,
+            "created_at": message.created_at,
+        },
+    }
+
+
+def publish_notifications(notifications):
+    publish_after_commit(
+        ([notification.recipient_id], notification_event(notification))
+        for notification in notifications
+    )
+
+
+def publish_feedback_message(message):
+    """Push a new feedback message to the submission's student and supervisor."""
+    from submissions.models import Submission
+
+    participants = set(
+        Submission.objects.filter(feedback_thread=message.thread_id)
+        .values_list("student_id", "project__supervisor_id")
+        .get()
+    )
+    participants.discard(None)
+    participants.discard(message.sender_id)
+    if participants:
+        publish_after_commit([(participants, feedback_message_event(message))])
+
+
+async def event_stream(user_id):
+    """Yield server-sent events for ``user_id`` with periodic heartbeats."""
+    subscription = await get_broker().subscribe(user_id)
+    try:
+        yield "retry: 5000\n\n"
+        while True:
+            event = await subscription.get(HEARTBEAT_SECONDS)
+            if event is None:
+                yield ": heartbeat\n\n"
+            else:
+                data = json.dumps(event["data"])
+                yield f"event: {event['type']}\ndata: {data}\n\n"
+    finally:
+        await subscription.close()
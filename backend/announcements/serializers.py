@@ -1,4 +1,5 @@
 from rest_framework import serializers
+from users.models import User
 from .models import Notification
 
 
@@ -19,3 +20,27 @@ class NotificationSerializer(serializers.ModelSerializer):
             "email_sent",
         ]
         read_only_fields = ["created_at", "recipient_email", "email_sent"]
+
+
+class NotificationBroadcastSerializer(serializers.Serializer):
+    SELECTORS = ["recipients", "role", "project", "supervisor"]
+
+    message = serializers.CharField()
+    type = serializers.ChoiceField(
+        choices=Notification.NOTIFICATION_TYPES, default="info"
+    )
+    link = serializers.URLField(required=False, allow_null=True)
+    recipients = serializers.ListField(
+        child=serializers.IntegerField(), required=False, max_length=10000
+    )
+    role = serializers.ChoiceField(choices=User.ROLE_CHOICES, required=False)
+    project = serializers.IntegerField(required=False)
+    supervisor = serializers.IntegerField(required=False)
+
+    def validate(self, attrs):
+        selected = [name for name in self.SELECTORS if name in attrs]
+        if len(selected) != 1:
+            raise serializers.ValidationError(
+                f"Provide exactly one of: {', '.join(self.SELECTORS)}."
+            )
+        return attrs
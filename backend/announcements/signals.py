@@ -0,0 +1,30 @@
+from django.db.models.signals import post_save, post_delete
+from django.dispatch import receiver
+from core.caching import track_versions
+from submissions.models import FeedbackMessage
+from .models import Notification
+from .push import publish_notifications, publish_feedback_message
+from .counters import adjust_unread_count, forget_unread_counts
+
+
+@receiver(post_save, sender=Notification)
+def push_new_notification(sender, instance, created, **kwargs):
+    if created:
+        publish_notifications([instance])
+        if not instance.read:
+            adjust_unread_count(instance.recipient_id, 1)
+
+
+@receiver(post_delete, sender=Notification)
+def forget_deleted_notification(sender, instance, **kwargs):
+    if not instance.read:
+        forget_unread_counts([instance.recipient_id])
+
+
+@receiver(post_save, sender=FeedbackMessage)
+def push_new_feedback_message(sender, instance, created, **kwargs):
+    if created:
+        publish_feedback_message(instance)
+
+
+track_versions(Notification, user_field="recipient_id")
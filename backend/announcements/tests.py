@@ -0,0 +1,311 @@
+import asyncio
+import datetime
+from smtplib import SMTPException
+from unittest import mock
+
+from django.core import mail
+from django.core.cache import cache
+from django.core.mail.backends.base import BaseEmailBackend
+from django.db import connection
+from django.test import RequestFactory, TestCase, override_settings
+from django.test.utils import CaptureQueriesContext
+from django.utils import timezone
+from rest_framework.test import APIClient
+from rest_framework_simplejwt.tokens import AccessToken
+from users.models import User
+from announcements.models import Notification, OutgoingEmail
+from announcements.outbox import claim_due, deliver_pending
+from announcements.push import InProcessBroker, event_stream
+from announcements.views import stream_user
+from fyps.models import ProjectProposal, Project
+from submissions.models import Submission, FeedbackThread, FeedbackMessage
+
+
+class FailingBackend(BaseEmailBackend):
+    def send_messages(self, email_messages):
+        raise SMTPException("Connection refused")
+
+
+class EmailOutboxTests(TestCase):
+    def setUp(self):
+        self.user = User.objects.create_user(email="student@example.com")
+        self.admin = User.objects.create_user(
+            email="admin@example.com", role="admin", is_superuser=True
+        )
+        self.client = APIClient()
+        self.client.force_authenticate(self.admin)
+
+    def create_notification(self):
+        response = self.client.post(
+            "/api/announcements/notifications/",
+            {"recipient": self.user.id, "message": "Proposal approved"},
+        )
+        self.assertEqual(response.status_code, 201)
+        return Notification.objects.get(id=response.data["id"])
+
+    def test_request_only_queues_the_email(self):
+        notification = self.create_notification()
+        self.assertEqual(len(mail.outbox), 0)
+        email = OutgoingEmail.objects.get()
+        self.assertEqual(email.notification, notification)
+        self.assertEqual(email.to, "student@example.com")
+        self.assertEqual(email.status, "pending")
+
+    def test_worker_delivers_batch_and_marks_notifications(self):
+        first = self.create_notification()
+        second = self.create_notification()
+        self.assertEqual(deliver_pending(), (2, 0))
+        self.assertEqual(len(mail.outbox), 2)
+        self.assertEqual(mail.outbox[0].body, "Proposal approved")
+        self.assertTrue(Notification.objects.get(id=first.id).email_sent)
+        self.assertTrue(Notification.objects.get(id=second.id).email_sent)
+        self.assertEqual(deliver_pending(), (0, 0))
+
+    def test_notification_and_email_commit_together(self):
+        with mock.patch(
+            "announcements.views.enqueue_notification_emails",
+            side_effect=RuntimeError("queue unavailable"),
+        ):
+            with self.assertRaises(RuntimeError):
+                self.create_notification()
+        self.assertFalse(Notification.objects.exists())
+
+    @override_settings(EMAIL_OUTBOX_LEASE=600, EMAIL_OUTBOX_RETRY_DELAY=60)
+    def test_lease_is_separate_from_backoff(self):
+        self.create_notification()
+        before = timezone.now()
+        [email] = claim_due(10)
+        self.assertEqual(email.status, "sending")
+        self.assertGreaterEqual(
+            email.next_attempt_at, before + datetime.timedelta(seconds=600)
+        )
+
+    @override_settings(EMAIL_OUTBOX_LEASE=0)
+    def test_unsent_rows_are_released_before_the_lease_runs_out(self):
+        self.create_notification()
+        self.assertEqual(deliver_pending(), (0, 0))
+        self.assertEqual(len(mail.outbox), 0)
+        email = OutgoingEmail.objects.get()
+        self.assertEqual((email.status, email.attempts), ("pending", 0))
+
+    @override_settings(
+        EMAIL_BACKEND="announcements.tests.FailingBackend",
+        EMAIL_OUTBOX_MAX_ATTEMPTS=2,
+    )
+    def test_failures_back_off_then_give_up(self):
+        self.create_notification()
+        self.assertEqual(deliver_pending(), (0, 1))
+        email = OutgoingEmail.objects.get()
+        self.assertEqual(email.status, "pending")
+        self.assertEqual(email.attempts, 1)
+        self.assertIn("Connection refused", email.last_error)
+        # Not due again until the backoff has elapsed.
+        self.assertEqual(deliver_pending(), (0, 0))
+
+        OutgoingEmail.objects.update(next_attempt_at=email.created_at)
+        self.assertEqual(deliver_pending(), (0, 1))
+        email.refresh_from_db()
+        self.assertEqual(email.status, "failed")
+        self.assertFalse(email.notification.email_sent)
+
+
+class BroadcastTests(TestCase):
+    def setUp(self):
+        self.supervisor = User.objects.create_user(
+            email="supervisor@example.com", role="supervisor"
+        )
+        self.admin = User.objects.create_user(
+            email="admin@example.com", role="admin", is_superuser=True
+        )
+        self.client = APIClient()
+
+    def test_fan_out_to_role_in_bounded_queries(self):
+        User.objects.bulk_create(
+            User(email=f"student{index}@example.com", role="student")
+            for index in range(5000)
+        )
+        self.client.force_authenticate(self.admin)
+        with CaptureQueriesContext(connection) as context:
+            response = self.client.post(
+                "/api/announcements/notifications/broadcast/",
+                {"message": "Defense schedule published", "role": "student"},
+                format="json",
+            )
+        self.assertEqual(response.status_code, 201)
+        # Multi-row inserts only: the count depends on the backend's bind
+        # parameter limit (SQLite: 999), never on one query per recipient.
+        self.assertLess(len(context.captured_queries), 120)
+        self.assertEqual(response.data["created"], 5000)
+        self.assertEqual(Notification.objects.count(), 5000)
+        self.assertEqual(OutgoingEmail.objects.count(), 5000)
+
+    def test_supervisor_is_limited_to_own_projects(self):
+        self.client.force_authenticate(self.supervisor)
+        response = self.client.post(
+            "/api/announcements/notifications/broadcast/",
+            {"message": "Hello", "role": "student"},
+            format="json",
+        )
+        self.assertEqual(response.status_code, 403)
+
+    def test_requires_exactly_one_selector(self):
+        self.client.force_authenticate(self.admin)
+        response = self.client.post(
+            "/api/announcements/notifications/broadcast/",
+            {"message": "Hello", "role": "student", "recipients": [1]},
+            format="json",
+        )
+        self.assertEqual(response.status_code, 400)
+
+
+class RecordingBroker:
+    def __init__(self):
+        self.published = []
+
+    def publish(self, user_id, event):
+        self.published.append((user_id, event))
+
+
+class PushTests(TestCase):
+    def setUp(self):
+        self.student = User.objects.create_user(email="student@example.com")
+        self.supervisor = User.objects.create_user(
+            email="supervisor@example.com", role="supervisor"
+        )
+        self.broker = RecordingBroker()
+        patcher = mock.patch(
+            "announcements.push.get_broker", return_value=self.broker
+        )
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
+    def test_new_notification_is_pushed_after_commit(self):
+        with self.captureOnCommitCallbacks(execute=True):
+            notification = Notification.objects.create(
+                recipient=self.student, message="Milestone due"
+            )
+            self.assertEqual(self.broker.published, [])
+        [(user_id, event)] = self.broker.published
+        self.assertEqual(user_id, self.student.id)
+        self.assertEqual(event["type"], "notification")
+        self.assertEqual(event["data"]["id"], notification.id)
+
+    def test_feedback_message_is_pushed_to_the_other_participant(self):
+        proposal = ProjectProposal.objects.create(
+            title="P", description="", document="p.pdf", student=self.student
+        )
+        project = Project.objects.create(
+            proposal=proposal, title="P", description="", supervisor=self.supervisor
+        )
+        submission = Submission.objects.create(
+            title="S", file="s.zip", student=self.student, project=project
+        )
+        thread = FeedbackThread.objects.create(submission=submission)
+        with self.captureOnCommitCallbacks(execute=True):
+            FeedbackMessage.objects.create(
+                thread=thread, sender=self.supervisor, message="Looks good"
+            )
+        [(user_id, event)] = self.broker.published
+        self.assertEqual(user_id, self.student.id)
+        self.assertEqual(event["data"]["message"], "Looks good")
+
+    def test_stream_requires_authentication(self):
+        response = self.client.get("/api/announcements/stream/")
+        self.assertEqual(response.status_code, 401)
+
+    def test_stream_takes_signed_links_not_access_tokens(self):
+        url = "/api/announcements/stream/"
+        factory = RequestFactory()
+        token = str(AccessToken.for_user(self.student))
+        self.assertIsNone(stream_user(factory.get(url, {"token": token})))
+
+        client = APIClient()
+        client.force_authenticate(self.student)
+        response = client.post("/api/download-links/", {"path": url}, format="json")
+        self.assertEqual(response.status_code, 200)
+        link = response.data["url"]
+        self.assertEqual(stream_user(factory.get(link)), self.student)
+        other = link.replace(url, "/api/announcements/notifications/")
+        self.assertIsNone(stream_user(factory.get(other)))
+        with override_settings(DOWNLOAD_LINK_MAX_AGE=-1):
+            self.assertIsNone(stream_user(factory.get(link)))
+
+
+class InProcessBrokerTests(TestCase):
+    def test_event_stream_yields_published_events(self):
+        broker = InProcessBroker()
+
+        async def read_two():
+            with mock.patch("announcements.push.get_broker", return_value=broker):
+                stream = event_stream(7)
+                self.assertEqual(await stream.__anext__(), "retry: 5000\n\n")
+                broker.publish(7, {"type": "notification", "data": {"id": 1}})
+                broker.publish(8, {"type": "notification", "data": {"id": 2}})
+                chunk = await stream.__anext__()
+                await stream.aclose()
+                return chunk
+
+        chunk = asyncio.run(read_two())
+        self.assertEqual(chunk, 'event: notification\ndata: {"id": 1}\n\n')
+        self.assertEqual(dict(broker._subscribers), {})
+
+
+class UnreadCountTests(TestCase):
+    def setUp(self):
+        cache.clear()
+        self.user = User.objects.create_user(email="student@example.com")
+        self.other = User.objects.create_user(email="other@example.com")
+        self.client = APIClient()
+        self.client.force_authenticate(self.user)
+
+    def notify(self, user, count):
+        with self.captureOnCommitCallbacks(execute=True):
+            return [
+                Notification.objects.create(recipient=user, message="Hello")
+                for _ in range(count)
+            ]
+
+    def get_count(self):
+        return self.client.get("/api/announcements/notifications/unread_count/").data[
+            "unread_count"
+        ]
+
+    def test_count_is_served_from_cache_and_kept_current(self):
+        notifications = self.notify(self.user, 3)
+        self.notify(self.other, 2)
+        self.assertEqual(self.get_count(), 3)
+        with self.assertNumQueries(0):
+            self.get_count()
+
+        self.notify(self.user, 1)
+        with self.captureOnCommitCallbacks(execute=True):
+            response = self.client.patch(
+                f"/api/announcements/notifications/{notifications[0].id}/",
+                {"read": True},
+            )
+        self.assertTrue(response.data["read"])
+        with self.assertNumQueries(0):
+            self.assertEqual(self.get_count(), 3)
+
+    def test_mark_read_and_mark_all_read_are_single_updates(self):
+        notifications = self.notify(self.user, 4)
+        foreign = self.notify(self.other, 1)
+        self.assertEqual(self.get_count(), 4)
+        with self.captureOnCommitCallbacks(execute=True):
+            with self.assertNumQueries(1):
+                response = self.client.post(
+                    "/api/announcements/notifications/mark_read/",
+                    {"ids": [notifications[0].id, foreign[0].id]},
+                    format="json",
+                )
+        self.assertEqual(response.data["updated"], 1)
+        self.assertEqual(self.get_count(), 3)
+
+        with self.captureOnCommitCallbacks(execute=True):
+            with self.assertNumQueries(1):
+                response = self.client.post(
+                    "/api/announcements/notifications/mark_all_read/"
+                )
+        self.assertEqual(response.data["updated"], 3)
+        self.assertEqual(self.get_count(), 0)
+        self.assertFalse(Notification.objects.get(id=foreign[0].id).read)
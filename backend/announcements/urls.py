@@ -1,7 +1,10 @@
 from rest_framework.routers import DefaultRouter
-from .views import NotificationViewSet
+from django.urls import path
+from .views import NotificationViewSet, notification_stream
 
 router = DefaultRouter()
 router.register(r"notifications", NotificationViewSet, basename="notification")
 
-urlpatterns = router.urls
+urlpatterns = router.urls + [
+    path("stream/", notification_stream, name="notification-stream"),
+]
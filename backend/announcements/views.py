@@ -1,15 +1,43 @@
+from asgiref.sync import sync_to_async
+from django.db import transaction
+from django.http import JsonResponse, StreamingHttpResponse
+from django.utils import timezone
 from rest_framework import viewsets, permissions, status
+from rest_framework.decorators import action
+from rest_framework.exceptions import AuthenticationFailed, PermissionDenied
 from rest_framework.response import Response
+from rest_framework_simplejwt.exceptions import InvalidToken
+from core.caching import ResponseCacheMixin, bump_versions
+from core.querysets import EagerLoadingMixin
 from .models import Notification
-from .serializers import NotificationSerializer
-from django.core.mail import send_mail
-from django.conf import settings
+from .serializers import NotificationSerializer, NotificationBroadcastSerializer
+from .outbox import enqueue_notification_emails
+from .broadcast import recipients_for, send_notifications
+from .push import event_stream
+from . import counters
+from fyps.access import accessible_project_ids
+from fyps.views import IsSupervisorOrAdmin
+from users.authentication import (
+    CachedJWTAuthentication,
+    SignedLinkAuthentication,
+    link_user,
+)
 
 
-class NotificationViewSet(viewsets.ModelViewSet):
+class NotificationViewSet(
+    ResponseCacheMixin, EagerLoadingMixin, viewsets.ModelViewSet
+):
     queryset = Notification.objects.all().order_by("-created_at")
     serializer_class = NotificationSerializer
+    cursor_ordering = ("-created_at", "-id")
     permission_classes = [permissions.IsAuthenticated]
+    cache_dependencies = ("users.user",)
+    user_cache_dependencies = ("announcements.notification",)
+
+    def get_cache_dependencies(self):
+        if self.request.user.is_superuser:
+            return ("users.user", "announcements.notification"), ()
+        return super().get_cache_dependencies()
 
     def get_queryset(self):
         user = self.request.user
@@ -17,22 +45,11 @@ class NotificationViewSet(viewsets.ModelViewSet):
             return Notification.objects.all()
         return Notification.objects.filter(recipient=user)
 
+    @transaction.atomic
     def perform_create(self, serializer):
+        # The notification and its queued email commit together or not at all.
         notification = serializer.save()
-        self.send_notification_email(notification)
-
-    def send_notification_email(self, notification):
-        if notification.email_sent or not notification.recipient.email:
-            return
-        subject = f"FYP Notification: {notification.type.title()}"
-        message = notification.message
-        recipient_list = [notification.recipient.email]
-        try:
-            send_mail(subject, message, settings.DEFAULT_FROM_EMAIL, recipient_list)
-            notification.email_sent = True
-            notification.save()
-        except Exception:
-            pass
+        enqueue_notification_emails([notification])
 
     def update(self, request, *args, **kwargs):
         # Allow marking as read
@@ -40,7 +57,118 @@ class NotificationViewSet(viewsets.ModelViewSet):
         instance = self.get_object()
         serializer = self.get_serializer(instance, data=request.data, partial=partial)
         serializer.is_valid(raise_exception=True)
-        if "read" in serializer.validated_data:
-            instance.read = serializer.validated_data["read"]
-            instance.save()
+        read = serializer.validated_data.get("read", instance.read)
+        if read != instance.read:
+            instance.read = read
+            instance.save(update_fields=["read", "updated_at"])
+            counters.adjust_unread_count(instance.recipient_id, -1 if read else 1)
         return Response(self.get_serializer(instance).data)
+
+    @action(detail=False, methods=["get"])
+    def unread_count(self, request):
+        return Response({"unread_count": counters.unread_count(request.user.id)})
+
+    @action(detail=False, methods=["post"])
+    def mark_read(self, request):
+        ids = request.data.get("ids")
+        if not isinstance(ids, list) or not all(isinstance(i, int) for i in ids):
+            return Response(
+                {"ids": ["A list of notification ids is required."]},
+                status=status.HTTP_400_BAD_REQUEST,
+            )
+        updated = Notification.objects.filter(
+            recipient=request.user, read=False, id__in=ids
+        ).update(read=True, updated_at=timezone.now())
+        counters.adjust_unread_count(request.user.id, -updated)
+        bump_versions("announcements.notification", [request.user.id])
+        return Response({"updated": updated})
+
+    @action(detail=False, methods=["post"])
+    def mark_all_read(self, request):
+        updated = Notification.objects.filter(
+            recipient=request.user, read=False
+        ).update(read=True, updated_at=timezone.now())
+        counters.set_unread_count(request.user.id, 0)
+        bump_versions("announcements.notification", [request.user.id])
+        return Response({"updated": updated})
+
+    @action(
+        detail=False,
+        methods=["post"],
+        permission_classes=[IsSupervisorOrAdmin],
+        serializer_class=NotificationBroadcastSerializer,
+    )
+    def broadcast(self, request):
+        serializer = NotificationBroadcastSerializer(data=request.data)
+        serializer.is_valid(raise_exception=True)
+        data = serializer.validated_data
+        user = request.user
+        if user.role == "supervisor":
+            # Supervisors may only reach the students on their own projects.
+            if "project" in data:
+                if data["project"] not in accessible_project_ids(user):
+                    raise PermissionDenied("You do not supervise this project.")
+            elif data.get("supervisor") != user.id:
+                raise PermissionDenied(
+                    "Supervisors can only notify their own projects' students."
+                )
+        users = recipients_for(
+            recipients=data.get("recipients"),
+            role=data.get("role"),
+            project=data.get("project"),
+            supervisor=data.get("supervisor"),
+        )
+        created = send_notifications(
+            users, data["message"], type=data["type"], link=data.get("link")
+        )
+        return Response({"created": created}, status=status.HTTP_201_CREATED)
+
+
+def stream_user(request):
+    """Resolve the user of a stream request.
+
+    ``EventSource`` cannot send headers, so besides an ``Authorization``
+    header or the ``access_token`` cookie the request may carry a
+    ``sign_link`` token for this path, from ``POST /api/download-links/``.
+    Access tokens are never read from the URL.
+    """
+    header = request.headers.get("Authorization", "")
+    if header.startswith("Bearer "):
+        raw_token = header.split(" ", 1)[1]
+    else:
+        raw_token = request.COOKIES.get("access_token")
+    try:
+        if raw_token:
+            authentication = CachedJWTAuthentication()
+            return authentication.get_user(
+                authentication.get_validated_token(raw_token)
+            )
+        link_token = request.GET.get("token")
+        if link_token:
+            return link_user(link_token, request.method, request.path)
+    except (InvalidToken, AuthenticationFailed):
+        pass
+    return None
+
+
+async def notification_stream(request):
+    """Server-sent events with new notifications and feedback messages.
+
+    Must be served by the ASGI application so the open connection does not
+    pin a worker thread.
+    """
+    user = await sync_to_async(stream_user)(request)
+    if user is None or not user.is_active:
+        return JsonResponse(
+            {"detail": "Authentication credentials were not provided."}, status=401
+        )
+    response = StreamingHttpResponse(
+        event_stream(user.id), content_type="text/event-stream"
+    )
+    response["Cache-Control"] = "no-cache"
+    response["X-Accel-Buffering"] = "no"
+    return response
+
+
+# Lets DownloadLinkView sign ?token= links for the stream.
+notification_stream.authentication_classes = [SignedLinkAuthentication]
@@ -0,0 +1,141 @@
+import hashlib
+import time
+
+from django.conf import settings
+from django.core.cache import cache
+from django.core.exceptions import ImproperlyConfigured
+from django.db import transaction
+from django.db.models.signals import post_delete, post_save
+from django.http import HttpResponseNotModified
+from django.utils.cache import patch_vary_headers
+from django.utils.http import parse_etags
+from rest_framework.response import Response
+
+# Backends whose entries, and so invalidations, are private to one process.
+PROCESS_LOCAL_CACHES = ("django.core.cache.backends.locmem.LocMemCache",)
+
+
+def require_shared_cache():
+    """Refuse to serve from several workers on a process-local cache.
+
+    Writes invalidate cached access scopes, users and rubrics only in the
+    cache they run against; with LocMemCache every other worker would keep
+    its copy until the entry expires. Called from the WSGI/ASGI entrypoints.
+    """
+    backend = settings.CACHES["default"]["BACKEND"]
+    if settings.WEB_CONCURRENCY > 1 and backend in PROCESS_LOCAL_CACHES:
+        raise ImproperlyConfigured(
+            f"WEB_CONCURRENCY={settings.WEB_CONCURRENCY} needs a shared cache; "
+            f"set CACHE_BACKEND to Redis or Memcached instead of {backend}."
+        )
+
+
+def version_key(label, user_id=None):
+    if user_id is None:
+        return f"responses:version:{label}"
+    return f"responses:version:{label}:{user_id}"
+
+
+def bump_versions(label, user_ids=None):
+    """Invalidate cached responses built from ``label`` rows.
+
+    With ``user_ids`` (for per-user rows such as notifications) those users'
+    stamps move along with the global one, which only views spanning every
+    user depend on. Stamps move now and again on commit, so a response cached
+    from pre-commit data is not served afterwards.
+    """
+    keys = [version_key(label)]
+    if user_ids is not None:
+        keys += [version_key(label, user_id) for user_id in set(user_ids)]
+
+    def bump():
+        stamp = time.time_ns()
+        cache.set_many({key: stamp for key in keys}, settings.RESPONSE_VERSION_TTL)
+
+    bump()
+    transaction.on_commit(bump)
+
+
+def track_versions(model, user_field=None):
+    """Bump ``model``'s stamp whenever one of its rows is saved or deleted."""
+    label = model._meta.label_lower
+
+    def changed(sender, instance, **kwargs):
+        if user_field is None:
+            bump_versions(label)
+        else:
+            bump_versions(label, [getattr(instance, user_field)])
+
+    post_save.connect(changed, sender=model, weak=False)
+    post_delete.connect(changed, sender=model, weak=False)
+
+
+def current_versions(keys):
+    """Read the stamps for ``keys``, starting any that are missing."""
+    stamps = cache.get_many(keys)
+    missing = [key for key in keys if key not in stamps]
+    if missing:
+        stamp = time.time_ns()
+        for key in missing:
+            # add() keeps a stamp a concurrent request already started.
+            cache.add(key, stamp, settings.RESPONSE_VERSION_TTL)
+        stamps.update(cache.get_many(missing))
+    return [stamps.get(key) for key in keys]
+
+
+class ResponseCacheMixin:
+    """Cache a viewset's list responses per user and answer revalidation.
+
+    ``cache_dependencies`` names the models (``app_label.model``) whose rows
+    the list is built from, including those that only affect its scoping;
+    ``user_cache_dependencies`` those stamped per user. The strong ETag is
+    derived from the user, the full path and the current stamps alone, so a
+    matching ``If-None-Match`` is answered with 304 before any query runs and
+    an unchanged list is never serialized twice.
+
+    Stamps only move in the cache the write ran against, so several workers
+    need a shared one (see ``require_shared_cache``). They also expire after
+    ``RESPONSE_VERSION_TTL``, which restarts them and bounds how long a missed
+    bump can serve a stale list or 304.
+    """
+
+    cache_dependencies = ()
+    user_cache_dependencies = ()
+
+    def get_cache_dependencies(self):
+        """Return ``(global labels, per-user labels)`` for this request."""
+        return self.cache_dependencies, self.user_cache_dependencies
+
+    def list_etag(self, request):
+        user = request.user
+        global_labels, user_labels = self.get_cache_dependencies()
+        keys = [version_key(label) for label in global_labels]
+        keys += [version_key(label, user.pk) for label in user_labels]
+        fingerprint = "|".join(
+            str(part)
+            for part in [
+                self.basename,
+                user.pk,
+                user.role,
+                request.get_full_path(),
+                *current_versions(keys),
+            ]
+        )
+        return '"%s"' % hashlib.sha256(fingerprint.encode()).hexdigest()
+
+    def list(self, request, *args, **kwargs):
+        etag = self.list_etag(request)
+        if_none_match = parse_etags(request.headers.get("If-None-Match", ""))
+        if etag in if_none_match or "*" in if_none_match:
+            response = HttpResponseNotModified()
+        else:
+            key = f"responses:data:{etag}"
+            data = cache.get(key)
+            if data is None:
+                data = super().list(request, *args, **kwargs).data
+                cache.set(key, data, settings.RESPONSE_CACHE_TTL)
+            response = Response(data)
+        response["ETag"] = etag
+        response["Cache-Control"] = "private, no-cache"
+        patch_vary_headers(response, ["Authorization", "Cookie"])
+        return response
@@ -0,0 +1,18 @@
+from rest_framework import pagination
+
+
+class CursorPagination(pagination.CursorPagination):
+    """Keyset pagination ordered by the view's ``cursor_ordering``.
+
+    Each viewset declares its ordering column followed by ``id`` as a tie
+    breaker, so pages stay stable when timestamps collide and every page is an
+    index range scan rather than an ``OFFSET``.
+    """
+
+    page_size = 50
+    page_size_query_param = "page_size"
+    max_page_size = 200
+    ordering = ("-id",)
+
+    def get_ordering(self, request, queryset, view):
+        return tuple(getattr(view, "cursor_ordering", self.ordering))
@@ -0,0 +1,107 @@
+from django.core.exceptions import FieldDoesNotExist
+from django.db.models import Prefetch
+from rest_framework import serializers
+from rest_framework.relations import ManyRelatedField, RelatedField
+
+_plans = {}
+
+
+def _relation(model, name):
+    """Return the relation field ``name`` on ``model``, or None for plain fields."""
+    try:
+        field = model._meta.get_field(name)
+    except FieldDoesNotExist:
+        return None
+    return field if field.is_relation else None
+
+
+def build_plan(serializer, model, prefix=""):
+    """Derive ``(select_related, prefetch_related)`` lookups from a serializer.
+
+    Nested serializers on single-valued relations become joins, nested
+    ``many=True`` serializers and many-valued related fields become prefetches
+    (with their own plan applied to the prefetch queryset), and dotted
+    ``source=`` paths such as ``"uploaded_by.email"`` join along the path.
+    """
+    select, prefetch = [], []
+    for field in serializer.fields.values():
+        if field.write_only or field.source == "*":
+            continue
+        relation = _relation(model, field.source_attrs[0])
+        if relation is None:
+            continue
+        lookup = prefix + field.source_attrs[0]
+        if isinstance(field, serializers.ListSerializer):
+            queryset = eager_load(
+                relation.related_model._default_manager.all(), field.child
+            )
+            prefetch.append(Prefetch(lookup, queryset=queryset))
+        elif isinstance(field, serializers.BaseSerializer):
+            select.append(lookup)
+            nested_select, nested_prefetch = build_plan(
+                field, relation.related_model, lookup + "__"
+            )
+            select.extend(nested_select)
+            prefetch.extend(nested_prefetch)
+        elif isinstance(field, ManyRelatedField):
+            prefetch.append(lookup)
+        elif isinstance(field, RelatedField):
+            # Primary keys are read straight from the ``*_id`` column.
+            continue
+        else:
+            path, current = [], model
+            for attr in field.source_attrs[:-1]:
+                relation = _relation(current, attr)
+                if relation is None:
+                    break
+                path.append(attr)
+                current = relation.related_model
+                if relation.many_to_many or relation.one_to_many:
+                    prefetch.append(prefix + "__".join(path))
+                    break
+            else:
+                if path:
+                    select.append(prefix + "__".join(path))
+    return select, prefetch
+
+
+def eager_load(queryset, serializer):
+    """Apply the joins and prefetches ``serializer`` needs to ``queryset``.
+
+    ``serializer`` may be a serializer class or instance; plans for classes
+    are computed once and cached.
+    """
+    if isinstance(serializer, type):
+        if serializer not in _plans:
+            _plans[serializer] = build_plan(serializer(), queryset.model)
+        select, prefetch = _plans[serializer]
+    else:
+        select, prefetch = build_plan(serializer, queryset.model)
+    if select:
+        queryset = queryset.select_related(*select)
+    if prefetch:
+        queryset = queryset.prefetch_related(*prefetch)
+    return queryset
+
+
+class EagerLoadingMixin:
+    """Eager-load whatever the viewset's serializer reads from related rows.
+
+    Hooked into ``filter_queryset`` so it applies on top of each viewset's own
+    role-scoped ``get_queryset``, for both list and detail requests.
+    """
+
+    def filter_queryset(self, queryset):
+        return eager_load(
+            super().filter_queryset(queryset), self.get_serializer_class()
+        )
+
+
+def list_queryset(viewset_class, request):
+    """The role-scoped queryset ``viewset_class`` would list for ``request``.
+
+    Lets endpoints that span several models (sync, dashboard) reuse each
+    viewset's scoping instead of restating it.
+    """
+    view = viewset_class(request=request, format_kwarg=None, kwargs={}, action="list")
+    return view, view.get_queryset()
@@ -12,6 +12,7 @@ https://docs.djangoproject.com/en/5.1/ref/settings/
 
 import os
 from pathlib import Path
+from corsheaders.defaults import default_headers
 
 # Build paths inside the project like this: BASE_DIR / 'subdir'.
 BASE_DIR = Path(__file__).resolve().parent.parent
@@ -52,13 +53,71 @@ INSTALLED_APPS = [
 ]
 REST_FRAMEWORK = {
     "DEFAULT_AUTHENTICATION_CLASSES": (
-        "rest_framework_simplejwt.authentication.JWTAuthentication",
+        "users.authentication.CachedJWTAuthentication",
     ),
     "DEFAULT_PERMISSION_CLASSES": [
         "rest_framework.permissions.IsAuthenticated",
     ],
+    "DEFAULT_PAGINATION_CLASS": "core.pagination.CursorPagination",
 }
 CORS_ALLOWED_ORIGINS = ["http://localhost:5173"]
+CORS_ALLOW_HEADERS = (*default_headers, "upload-offset")
+CORS_EXPOSE_HEADERS = ["Upload-Offset"]
+
+# Cached list responses (core.caching) expire after this long even when no
+# version stamp has moved.
+RESPONSE_CACHE_TTL = 600
+# Version stamps restart after this long, changing every ETag built from them;
+# it bounds staleness from an invalidation the cache did not see.
+RESPONSE_VERSION_TTL = 60
+
+# Token-to-user resolutions are cached this long; saving a user or
+# blacklisting one of their tokens drops them early in the shared cache. This
+# is the revocation window for anything that misses that drop.
+AUTH_USER_CACHE_TTL = 60
+
+# Lifetime in seconds of the signed ?token= of download and export links and of
+# the notification stream URL (checked when the stream connects).
+DOWNLOAD_LINK_MAX_AGE = int(os.getenv("DOWNLOAD_LINK_MAX_AGE", "300"))
+
+# /api/sync/ tokens step back this many seconds so rows committed by slower
+# transactions are not missed; tombstones (and so tokens) older than the
+# retention are pruned by the prune_tombstones command and force a full sync.
+SYNC_TOKEN_OVERLAP = 10
+SYNC_TOMBSTONE_RETENTION_DAYS = 30
+# Rows per /api/sync/ page; longer syncs continue with the page's ?cursor=.
+SYNC_PAGE_SIZE = 500
+
+# Pending milestones past their due date are marked overdue by the
+# sweep_overdue_milestones command; a positive interval (seconds) also runs the
+# sweep on a background thread of each serving (WSGI/ASGI) process, for
+# deployments without cron.
+MILESTONE_SWEEP_INTERVAL = int(os.getenv("MILESTONE_SWEEP_INTERVAL", "0"))
+
+# POST /api/users/provision/ accepts this many rows and hashes their passwords
+# on this many threads; the provision_users command has no limit and hashes on
+# a process pool.
+PROVISION_API_MAX_ROWS = 5000
+PROVISION_HASH_THREADS = 4
+
+# Notification emails are queued in announcements.OutgoingEmail and delivered by
+# the send_queued_email worker, batched over one SMTP connection.
+EMAIL_OUTBOX_BATCH_SIZE = 100
+EMAIL_OUTBOX_MAX_ATTEMPTS = 5
+EMAIL_OUTBOX_RETRY_DELAY = 60  # seconds, doubled after every failed attempt
+# SMTP socket timeout, so one stuck message cannot hold a batch indefinitely.
+EMAIL_TIMEOUT = 10
+# A claimed batch is leased for this long before another worker may take it.
+# The worker stops sending once half of it has passed and hands the rest back,
+# so the lease only has to outlast that plus one message (EMAIL_TIMEOUT).
+EMAIL_OUTBOX_LEASE = 10 * 60
+
+# New notifications and feedback messages are pushed to connected clients over
+# /api/announcements/stream/ (served under ASGI). Set PUSH_BROKER to
+# "announcements.push.RedisBroker" and PUSH_BROKER_URL to share events between
+# processes.
+PUSH_BROKER = os.getenv("PUSH_BROKER", "announcements.push.InProcessBroker")
+PUSH_BROKER_URL = os.getenv("PUSH_BROKER_URL", "")
 
 MIDDLEWARE = [
     "corsheaders.middleware.CorsMiddleware",
@@ -116,6 +175,42 @@ else:
     }
 
 
+# File downloads: "" streams from Django; "x-accel-redirect" (nginx, with an
+# internal location at DOWNLOAD_ACCEL_PREFIX aliased to MEDIA_ROOT) or
+# "x-sendfile" (Apache/lighttpd) hand the transfer to the front proxy.
+DOWNLOAD_OFFLOAD = os.getenv("DOWNLOAD_OFFLOAD", "")
+DOWNLOAD_ACCEL_PREFIX = os.getenv("DOWNLOAD_ACCEL_PREFIX", "/protected-media/")
+
+# Resumable uploads: partial files are streamed here chunk by chunk and moved
+# into the FileField storage once complete.
+CHUNKED_UPLOAD_DIR = Path(
+    os.getenv("CHUNKED_UPLOAD_DIR", BASE_DIR / "chunked_uploads")
+)
+CHUNKED_UPLOAD_MAX_CHUNK_SIZE = 16 * 1024 * 1024
+CHUNKED_UPLOAD_MAX_SIZE = 2 * 1024 * 1024 * 1024
+# Sessions idle this long are deleted by the prune_chunked_uploads command.
+CHUNKED_UPLOAD_EXPIRY_HOURS = int(os.getenv("CHUNKED_UPLOAD_EXPIRY_HOURS", "24"))
+
+
+# Cache
+# https://docs.djangoproject.com/en/5.1/topics/cache/
+# Counters and cached lookups live here. Cached entries (project access
+# scopes, users, rubrics, response stamps) are invalidated in this cache, which
+# LocMemCache keeps per process, so serving from several workers needs a shared
+# backend (django.core.cache.backends.redis.RedisCache or memcached).
+CACHES = {
+    "default": {
+        "BACKEND": os.getenv(
+            "CACHE_BACKEND", "django.core.cache.backends.locmem.LocMemCache"
+        ),
+        "LOCATION": os.getenv("CACHE_LOCATION", ""),
+    }
+}
+# Serving processes per host (gunicorn and uvicorn read it too); the WSGI/ASGI
+# entrypoints refuse to start more than one on a process-local cache.
+WEB_CONCURRENCY = int(os.getenv("WEB_CONCURRENCY", "1"))
+
+
 # Password validation
 # https://docs.djangoproject.com/en/5.1/ref/settings/#auth-password-validators
 
@@ -152,6 +247,14 @@ USE_TZ = True
 
 STATIC_URL = "static/"
 
+# Uploaded files are stored once per distinct content; see fyps.storage.
+STORAGES = {
+    "default": {"BACKEND": "fyps.storage.ContentAddressedStorage"},
+    "staticfiles": {
+        "BACKEND": "django.contrib.staticfiles.storage.StaticFilesStorage"
+    },
+}
+
 # Default primary key field type
 # https://docs.djangoproject.com/en/5.1/ref/settings/#default-auto-field
 
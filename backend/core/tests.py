@@ -0,0 +1,220 @@
+import datetime
+import time
+from unittest import mock
+
+from django.conf import settings
+from django.core.cache import cache
+from django.core.exceptions import ImproperlyConfigured
+from django.db import connection
+from django.test import SimpleTestCase, TestCase, override_settings
+from django.test.utils import CaptureQueriesContext
+from rest_framework.test import APIClient
+from users.models import User
+from fyps.models import ProjectProposal, Project, Milestone, Document
+from submissions.models import Submission, FeedbackThread, FeedbackMessage
+from evaluations.models import EvaluationRubric, Evaluation
+from announcements.models import Notification
+from core.caching import require_shared_cache
+
+LIST_ENDPOINTS = [
+    "/api/fyps/proposals/",
+    "/api/fyps/projects/",
+    "/api/fyps/milestones/",
+    "/api/fyps/documents/",
+    "/api/submissions/submissions/",
+    "/api/submissions/feedback-threads/",
+    "/api/submissions/feedback-messages/",
+    "/api/announcements/notifications/",
+    "/api/evaluations/rubrics/",
+    "/api/evaluations/evaluations/",
+]
+
+
+class ListQueryCountTests(TestCase):
+    """List endpoints must cost the same number of queries for 1 or N rows."""
+
+    def setUp(self):
+        self.supervisor = User.objects.create_user(
+            email="supervisor@example.com", role="supervisor"
+        )
+        self.student = User.objects.create_user(
+            email="student@example.com", role="student"
+        )
+        self.admin = User.objects.create_user(
+            email="admin@example.com", role="admin", is_superuser=True
+        )
+        self.rubric = EvaluationRubric.objects.create(
+            name="Final", criteria=[], max_score=100
+        )
+        self.created = 0
+
+    def add_project(self):
+        self.created += 1
+        index = self.created
+        proposal = ProjectProposal.objects.create(
+            title=f"Proposal {index}",
+            description="",
+            document="proposals/p.pdf",
+            status="approved",
+            student=self.student,
+            supervisor=self.supervisor,
+        )
+        project = Project.objects.create(
+            proposal=proposal,
+            title=f"Project {index}",
+            description="",
+            supervisor=self.supervisor,
+        )
+        project.students.add(self.student)
+        for title in ("Draft", "Final"):
+            Milestone.objects.create(
+                project=project, title=title, due_date=datetime.date.today()
+            )
+        Document.objects.create(
+            project=project,
+            file="documents/d.pdf",
+            name="Report",
+            uploaded_by=self.student,
+        )
+        submission = Submission.objects.create(
+            title="Code",
+            file="submissions/s.zip",
+            student=self.student,
+            project=project,
+        )
+        thread = FeedbackThread.objects.create(submission=submission)
+        for sender in (self.student, self.supervisor):
+            FeedbackMessage.objects.create(thread=thread, sender=sender, message="Hi")
+        Evaluation.objects.create(
+            project=project,
+            evaluator=self.supervisor,
+            rubric=self.rubric,
+            scores=[],
+            total_score=50,
+        )
+        for user in (self.student, self.supervisor, self.admin):
+            Notification.objects.create(recipient=user, message="New submission")
+
+    def count_queries(self, client, url):
+        # Measure the queries of building the list, not of the response cache.
+        cache.clear()
+        with CaptureQueriesContext(connection) as context:
+            response = client.get(url)
+        self.assertEqual(response.status_code, 200, url)
+        return len(context.captured_queries)
+
+    def test_list_query_count_is_constant(self):
+        self.add_project()
+        clients = {}
+        baseline = {}
+        for user in (self.student, self.supervisor, self.admin):
+            clients[user] = APIClient()
+            clients[user].force_authenticate(user)
+            for url in LIST_ENDPOINTS:
+                baseline[user, url] = self.count_queries(clients[user], url)
+
+        for _ in range(4):
+            self.add_project()
+        for (user, url), expected in baseline.items():
+            with self.subTest(role=user.role, url=url):
+                self.assertEqual(self.count_queries(clients[user], url), expected)
+
+
+class CursorPaginationTests(TestCase):
+    def setUp(self):
+        cache.clear()
+
+    def test_pages_cover_every_row_once(self):
+        user = User.objects.create_user(email="student@example.com")
+        Notification.objects.bulk_create(
+            Notification(recipient=user, message=f"Message {index}")
+            for index in range(7)
+        )
+        client = APIClient()
+        client.force_authenticate(user)
+
+        seen = []
+        url = "/api/announcements/notifications/?page_size=3"
+        while url:
+            response = client.get(url)
+            self.assertLessEqual(len(response.data["results"]), 3)
+            seen.extend(row["id"] for row in response.data["results"])
+            url = response.data["next"]
+        expected = Notification.objects.order_by("-created_at", "-id")
+        self.assertEqual(seen, list(expected.values_list("id", flat=True)))
+
+
+class ResponseCacheTests(TestCase):
+    def setUp(self):
+        cache.clear()
+        self.student = User.objects.create_user(email="student@example.com")
+        self.other = User.objects.create_user(email="other@example.com")
+        self.client = APIClient()
+        self.client.force_authenticate(self.student)
+        EvaluationRubric.objects.create(name="Final", criteria=[], max_score=100)
+
+    def test_unchanged_list_is_revalidated_without_queries(self):
+        url = "/api/evaluations/rubrics/"
+        response = self.client.get(url)
+        etag = response["ETag"]
+        with self.assertNumQueries(0):
+            response = self.client.get(url, HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, 304)
+        with self.assertNumQueries(0):
+            response = self.client.get(url)
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(len(response.data["results"]), 1)
+
+        EvaluationRubric.objects.create(name="Midterm", criteria=[], max_score=50)
+        response = self.client.get(url, HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, 200)
+        self.assertNotEqual(response["ETag"], etag)
+        self.assertEqual(len(response.data["results"]), 2)
+
+    def test_stamps_expire(self):
+        # A worker that missed a bump must not answer 304 indefinitely.
+        url = "/api/evaluations/rubrics/"
+        etag = self.client.get(url)["ETag"]
+        later = time.time() + settings.RESPONSE_VERSION_TTL + 1
+        with mock.patch("time.time", return_value=later):
+            response = self.client.get(url, HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, 200)
+        self.assertNotEqual(response["ETag"], etag)
+
+    def test_notification_stamps_are_per_user(self):
+        url = "/api/announcements/notifications/"
+        etag = self.client.get(url)["ETag"]
+        Notification.objects.create(recipient=self.other, message="Not yours")
+        response = self.client.get(url, HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, 304)
+
+        Notification.objects.create(recipient=self.student, message="Yours")
+        response = self.client.get(url, HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(len(response.data["results"]), 1)
+
+        etag = response["ETag"]
+        self.client.post("/api/announcements/notifications/mark_all_read/")
+        response = self.client.get(url, HTTP_IF_NONE_MATCH=etag)
+        self.assertTrue(response.data["results"][0]["read"])
+
+    def test_cache_is_per_user(self):
+        url = "/api/evaluations/rubrics/"
+        etag = self.client.get(url)["ETag"]
+        self.client.force_authenticate(self.other)
+        response = self.client.get(url, HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, 200)
+
+
+class SharedCacheTests(SimpleTestCase):
+    locmem = {"default": {"BACKEND": "django.core.cache.backends.locmem.LocMemCache"}}
+    redis = {"default": {"BACKEND": "django.core.cache.backends.redis.RedisCache"}}
+
+    def test_several_workers_need_a_shared_cache(self):
+        with override_settings(CACHES=self.locmem, WEB_CONCURRENCY=1):
+            require_shared_cache()
+        with override_settings(CACHES=self.redis, WEB_CONCURRENCY=4):
+            require_shared_cache()
+        with override_settings(CACHES=self.locmem, WEB_CONCURRENCY=4):
+            with self.assertRaises(ImproperlyConfigured):
+                require_shared_cache()
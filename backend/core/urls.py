@@ -1,6 +1,10 @@
 from django.contrib import admin
 from django.urls import path, include
 from rest_framework_simplejwt.views import TokenObtainPairView, TokenRefreshView
+from fyps.dashboard import DashboardView
+from fyps.downloads import DownloadLinkView
+from fyps.search import SearchView
+from fyps.sync import SyncView
 
 urlpatterns = [
     path("admin/", admin.site.urls),
@@ -17,4 +21,9 @@ urlpatterns = [
     path("api/submissions/", include("submissions.urls")),
     path("api/announcements/", include("announcements.urls")),
     path("api/evaluations/", include("evaluations.urls")),
+    path("api/panels/", include("panels.urls")),
+    path("api/sync/", SyncView.as_view(), name="sync"),
+    path("api/dashboard/", DashboardView.as_view(), name="dashboard"),
+    path("api/search/", SearchView.as_view(), name="search"),
+    path("api/download-links/", DownloadLinkView.as_view(), name="download-links"),
 ]
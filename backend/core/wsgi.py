@@ -14,3 +14,9 @@ from django.core.wsgi import get_wsgi_application
 os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'core.settings')
 
 application = get_wsgi_application()
+
+from core.caching import require_shared_cache  # noqa: E402
+from fyps.overdue import start_configured_sweeper  # noqa: E402
+
+require_shared_cache()
+start_configured_sweeper()
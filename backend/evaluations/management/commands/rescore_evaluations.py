@@ -0,0 +1,43 @@
+from django.core.management.base import BaseCommand, CommandError
+from evaluations.models import EvaluationRubric
+from evaluations.rubrics import BATCH_SIZE, rescore_rubric
+
+
+class Command(BaseCommand):
+    help = (
+        "Recompute the total score of every evaluation from its scores and "
+        "rubric, e.g. after a rubric's criteria changed."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "rubrics",
+            nargs="*",
+            type=int,
+            help="Ids of the rubrics to rescore; all rubrics when omitted.",
+        )
+        parser.add_argument(
+            "--batch-size",
+            type=int,
+            default=BATCH_SIZE,
+            help="Evaluations read and written per batch.",
+        )
+
+    def handle(self, *args, **options):
+        rubrics = EvaluationRubric.objects.order_by("pk")
+        if options["rubrics"]:
+            rubrics = rubrics.filter(pk__in=options["rubrics"])
+            missing = set(options["rubrics"]) - {rubric.pk for rubric in rubrics}
+            if missing:
+                raise CommandError(f"Unknown rubrics: {sorted(missing)}")
+        for rubric in rubrics:
+            updated, invalid = rescore_rubric(rubric, options["batch_size"])
+            self.stdout.write(f'"{rubric.name}": updated {updated} totals.')
+            if invalid:
+                self.stdout.write(
+                    self.style.WARNING(
+                        f"{len(invalid)} evaluations no longer fit the rubric "
+                        f"and were left unchanged, e.g. {invalid[:20]}"
+                    )
+                )
+        self.stdout.write(self.style.SUCCESS("Rescoring finished."))
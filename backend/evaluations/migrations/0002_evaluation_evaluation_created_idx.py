@@ -0,0 +1,20 @@
+# Generated by Django 5.1.15 on 2026-10-18 06:44
+
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('evaluations', '0001_initial'),
+        ('fyps', '0006_document_document_uploaded_idx_and_more'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='evaluation',
+            index=models.Index(fields=['created_at', 'id'], name='evaluation_created_idx'),
+        ),
+    ]
@@ -0,0 +1,24 @@
+# Generated by Django 5.1.15 on 2026-10-18 06:45
+
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('evaluations', '0002_evaluation_evaluation_created_idx'),
+        ('fyps', '0007_document_document_project_idx_and_more'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='evaluation',
+            index=models.Index(fields=['project', 'created_at', 'id'], name='evaluation_project_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='evaluation',
+            index=models.Index(fields=['evaluator', 'created_at', 'id'], name='evaluation_evaluator_idx'),
+        ),
+    ]
@@ -0,0 +1,25 @@
+# Generated by Django 5.1.15 on 2026-10-18 07:07
+
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('evaluations', '0003_evaluation_evaluation_project_idx_and_more'),
+        ('fyps', '0010_tombstone_updated_at'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='evaluation',
+            name='updated_at',
+            field=models.DateTimeField(auto_now=True),
+        ),
+        migrations.AddIndex(
+            model_name='evaluation',
+            index=models.Index(fields=['updated_at', 'id'], name='evaluation_updated_idx'),
+        ),
+    ]
@@ -1,3 +1,6 @@
+import hashlib
+import json
+
 from django.db import models
 from users.models import User
 from fyps.models import Project
@@ -13,6 +16,12 @@ class EvaluationRubric(models.Model):
     def __str__(self):
         return self.name
 
+    @property
+    def criteria_version(self):
+        """Digest of ``criteria``; cached derivations are checked against it."""
+        encoded = json.dumps(self.criteria, sort_keys=True).encode()
+        return hashlib.sha256(encoded).hexdigest()
+
 
 class Evaluation(models.Model):
     project = models.ForeignKey(
@@ -28,10 +37,22 @@ class Evaluation(models.Model):
     total_score = models.FloatField()
     comments = models.TextField(blank=True)
     created_at = models.DateTimeField(auto_now_add=True)
+    updated_at = models.DateTimeField(auto_now=True)
 
     class Meta:
         unique_together = ("project", "evaluator")
         ordering = ["-created_at"]
+        indexes = [
+            models.Index(fields=["updated_at", "id"], name="evaluation_updated_idx"),
+            models.Index(fields=["created_at", "id"], name="evaluation_created_idx"),
+            models.Index(
+                fields=["project", "created_at", "id"], name="evaluation_project_idx"
+            ),
+            models.Index(
+                fields=["evaluator", "created_at", "id"],
+                name="evaluation_evaluator_idx",
+            ),
+        ]
 
     def __str__(self):
         return f"{self.project.title} by {self.evaluator.email} ({self.total_score})"
@@ -0,0 +1,153 @@
+from django.core.cache import cache
+from django.db import transaction
+from django.utils import timezone
+from rest_framework.exceptions import ValidationError
+from fyps.analytics import bump_counter
+from .models import Evaluation
+from .stats import forget_rubric_stats
+
+# Entries carry the criteria_version they were compiled from, so a worker
+# whose cache missed an edit recompiles rather than score against the old
+# criteria; the TTL only evicts entries of edited or idle rubrics.
+RUBRIC_TTL = 10 * 60
+BATCH_SIZE = 1000
+
+
+def rubric_cache_key(rubric_id):
+    return f"evaluations:rubric:{rubric_id}"
+
+
+def forget_compiled_rubric(rubric_id):
+    key = rubric_cache_key(rubric_id)
+    cache.delete(key)
+    transaction.on_commit(lambda: cache.delete(key))
+
+
+def _is_number(value):
+    return isinstance(value, (int, float)) and not isinstance(value, bool)
+
+
+def validate_criteria(criteria):
+    """Check a rubric's ``[{"name", "max"}]`` list; returns it unchanged."""
+    if not isinstance(criteria, list) or not criteria:
+        raise ValidationError(["Enter at least one criterion."])
+    names = set()
+    for criterion in criteria:
+        if not isinstance(criterion, dict):
+            raise ValidationError(['Each criterion needs a "name" and a "max".'])
+        name, maximum = criterion.get("name"), criterion.get("max")
+        if not isinstance(name, str) or not name.strip():
+            raise ValidationError(["Every criterion needs a name."])
+        if name in names:
+            raise ValidationError([f'"{name}" is listed more than once.'])
+        if not _is_number(maximum) or not maximum > 0:
+            raise ValidationError([f'The max of "{name}" must be a positive number.'])
+        names.add(name)
+    return criteria
+
+
+def compile_criteria(criteria):
+    """``{name: (column index, max score)}`` in rubric order."""
+    return {
+        criterion["name"]: (index, criterion["max"])
+        for index, criterion in enumerate(criteria)
+    }
+
+
+def compiled_rubric(rubric):
+    """The rubric's compiled criteria, parsed once and shared through the cache.
+
+    A cached entry is only used while it matches ``rubric.criteria``.
+    """
+    key = rubric_cache_key(rubric.pk)
+    version = rubric.criteria_version
+    entry = cache.get(key)
+    if entry is not None and entry[0] == version:
+        return entry[1]
+    compiled = compile_criteria(rubric.criteria)
+    cache.set(key, (version, compiled), RUBRIC_TTL)
+    return compiled
+
+
+def score(compiled, scores):
+    """Validate ``scores`` against a compiled rubric.
+
+    Every criterion must be scored exactly once, from 0 up to its max.
+    Returns the scores in rubric order and their total; raises
+    ``ValidationError`` listing every problem otherwise.
+    """
+    if not isinstance(scores, list):
+        raise ValidationError({"scores": ['Expected a list of {"name", "score"}.']})
+    values = [None] * len(compiled)
+    errors = []
+    for item in scores:
+        name = item.get("name") if isinstance(item, dict) else None
+        entry = compiled.get(name)
+        if entry is None:
+            errors.append(f'"{name}" is not a criterion of this rubric.')
+            continue
+        index, maximum = entry
+        value = item.get("score")
+        if values[index] is not None:
+            errors.append(f'"{name}" is scored more than once.')
+        elif not _is_number(value) or not 0 <= value <= maximum:
+            errors.append(f'"{name}" must be a number from 0 to {maximum:g}.')
+            values[index] = False
+        else:
+            values[index] = value
+    errors.extend(
+        f'"{name}" is not scored.'
+        for name, (index, _) in compiled.items()
+        if values[index] is None
+    )
+    if errors:
+        raise ValidationError({"scores": errors})
+    ordered = [
+        {"name": name, "score": values[index]}
+        for name, (index, _) in compiled.items()
+    ]
+    return ordered, sum(values)
+
+
+@transaction.atomic
+def rescore_rubric(rubric, batch_size=BATCH_SIZE):
+    """Recompute ``total_score`` of every evaluation of ``rubric`` in one pass.
+
+    Rows whose totals change are written back with ``bulk_update``; rows that
+    no longer fit the rubric are left alone and their ids returned. Bulk
+    updates send no signals, so the analytics total and cached statistics are
+    adjusted here. Returns ``(updated, invalid ids)``.
+    """
+    compiled = compile_criteria(rubric.criteria)
+    now = timezone.now()
+    updated, delta, invalid, batch = 0, 0, [], []
+
+    def flush():
+        nonlocal updated
+        Evaluation.objects.bulk_update(batch, ["total_score", "updated_at"])
+        updated += len(batch)
+        batch.clear()
+
+    rows = (
+        Evaluation.objects.filter(rubric=rubric)
+        .order_by("pk")
+        .only("id", "scores", "total_score")
+        .iterator(chunk_size=batch_size)
+    )
+    for evaluation in rows:
+        try:
+            _, total = score(compiled, evaluation.scores)
+        except ValidationError:
+            invalid.append(evaluation.pk)
+            continue
+        if total != evaluation.total_score:
+            delta += total - evaluation.total_score
+            evaluation.total_score, evaluation.updated_at = total, now
+            batch.append(evaluation)
+            if len(batch) == batch_size:
+                flush()
+    flush()
+    if updated:
+        bump_counter("evaluations", total=delta)
+        forget_rubric_stats([rubric.pk])
+    return updated, invalid
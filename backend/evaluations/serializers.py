@@ -1,5 +1,6 @@
 from rest_framework import serializers
 from .models import EvaluationRubric, Evaluation
+from .rubrics import compiled_rubric, score, validate_criteria
 
 
 class EvaluationRubricSerializer(serializers.ModelSerializer):
@@ -7,6 +8,9 @@ class EvaluationRubricSerializer(serializers.ModelSerializer):
         model = EvaluationRubric
         fields = ["id", "name", "criteria", "max_score"]
 
+    def validate_criteria(self, value):
+        return validate_criteria(value)
+
 
 class EvaluationSerializer(serializers.ModelSerializer):
     evaluator_email = serializers.EmailField(source="evaluator.email", read_only=True)
@@ -24,4 +28,22 @@ class EvaluationSerializer(serializers.ModelSerializer):
             "comments",
             "created_at",
         ]
-        read_only_fields = ["evaluator", "evaluator_email", "created_at"]
+        read_only_fields = [
+            "evaluator",
+            "evaluator_email",
+            "total_score",
+            "created_at",
+        ]
+
+    def validate(self, attrs):
+        # The total is always derived from the scores, never taken from clients.
+        if self.instance and "scores" not in attrs and "rubric" not in attrs:
+            return attrs
+        rubric = attrs.get("rubric", getattr(self.instance, "rubric", None))
+        if rubric is None:
+            raise serializers.ValidationError(
+                {"rubric": ["Choose the rubric the scores are given against."]}
+            )
+        scores = attrs.get("scores", getattr(self.instance, "scores", None))
+        attrs["scores"], attrs["total_score"] = score(compiled_rubric(rubric), scores)
+        return attrs
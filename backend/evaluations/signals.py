@@ -0,0 +1,31 @@
+from django.db.models.signals import post_delete, post_init, post_save
+from core.caching import track_versions
+from .models import Evaluation, EvaluationRubric
+from .rubrics import forget_compiled_rubric
+from .stats import forget_rubric_stats
+
+track_versions(EvaluationRubric)
+
+
+def remember_stats_rubric(sender, instance, **kwargs):
+    instance._stats_rubric_id = instance.__dict__.get("rubric_id")
+
+
+def forget_evaluation_stats(sender, instance, **kwargs):
+    # Moving an evaluation to another rubric changes both rubrics' statistics.
+    previous = getattr(instance, "_stats_rubric_id", None)
+    forget_rubric_stats([previous, instance.rubric_id])
+    instance._stats_rubric_id = instance.rubric_id
+
+
+def forget_rubric_on_change(sender, instance, **kwargs):
+    # Renamed or removed criteria change the per-criterion columns.
+    forget_compiled_rubric(instance.pk)
+    forget_rubric_stats([instance.pk])
+
+
+post_init.connect(remember_stats_rubric, sender=Evaluation)
+post_save.connect(forget_evaluation_stats, sender=Evaluation)
+post_delete.connect(forget_evaluation_stats, sender=Evaluation)
+post_save.connect(forget_rubric_on_change, sender=EvaluationRubric)
+post_delete.connect(forget_rubric_on_change, sender=EvaluationRubric)
@@ -0,0 +1,217 @@
+import math
+import warnings
+
+from django.core.cache import cache
+from django.db import transaction
+from django.utils import timezone
+from .models import Evaluation
+
+# Entries are dropped whenever an evaluation of the rubric changes and carry
+# the criteria_version they were computed for. The TTL bounds how long a drop
+# missed by a raw bulk write or another worker's cache shows old numbers.
+STATS_TTL = 5 * 60
+PERCENTILES = (10, 25, 50, 75, 90)
+CHUNK_SIZE = 2000
+# Evaluator spreads below this are rounding noise of a constant score.
+MIN_SPREAD = 1e-9
+
+
+def stats_cache_key(rubric_id):
+    return f"evaluations:stats:{rubric_id}"
+
+
+def forget_rubric_stats(rubric_ids):
+    """Drop cached statistics now and again once the transaction commits."""
+    keys = [stats_cache_key(rubric_id) for rubric_id in set(rubric_ids) if rubric_id]
+    if keys:
+        cache.delete_many(keys)
+        transaction.on_commit(lambda: cache.delete_many(keys))
+
+
+def load_scores(rubric):
+    """Stream the rubric's evaluations into arrays.
+
+    Returns ``(project ids, evaluator ids, totals, scores)`` where ``scores``
+    has one column per rubric criterion and NaN where a score is missing.
+    """
+    import numpy as np
+
+    column = {criterion["name"]: i for i, criterion in enumerate(rubric.criteria)}
+    projects, evaluators, totals, scores = [], [], [], []
+    rows = (
+        Evaluation.objects.filter(rubric=rubric)
+        .order_by()
+        .values_list("project_id", "evaluator_id", "total_score", "scores")
+        .iterator(chunk_size=CHUNK_SIZE)
+    )
+    for project_id, evaluator_id, total, items in rows:
+        row = [math.nan] * len(column)
+        for item in items or []:
+            index = column.get(item.get("name"))
+            if index is not None:
+                try:
+                    row[index] = float(item.get("score"))
+                except (TypeError, ValueError):
+                    pass
+        projects.append(project_id)
+        evaluators.append(evaluator_id)
+        totals.append(total)
+        scores.append(row)
+    return (
+        np.array(projects, dtype=np.int64),
+        np.array(evaluators, dtype=np.int64),
+        np.array(totals, dtype=np.float64),
+        np.array(scores, dtype=np.float64).reshape(len(scores), len(column)),
+    )
+
+
+def _number(value):
+    value = float(value)
+    return None if math.isnan(value) else round(value, 4)
+
+
+def _describe(values):
+    """Count, mean, sample variance and percentiles of each column."""
+    import numpy as np
+
+    counts = np.sum(~np.isnan(values), axis=0)
+    with warnings.catch_warnings():
+        # All-NaN columns (a criterion nobody scored) yield NaN, reported as null.
+        warnings.simplefilter("ignore", RuntimeWarning)
+        means = np.nanmean(values, axis=0)
+        variances = np.nanvar(values, axis=0, ddof=1)
+        if len(values):
+            percentiles = np.nanpercentile(values, PERCENTILES, axis=0)
+        else:
+            percentiles = np.full((len(PERCENTILES), values.shape[1]), np.nan)
+    return [
+        {
+            "count": int(counts[i]),
+            "mean": _number(means[i]),
+            "variance": _number(variances[i]),
+            "percentiles": {
+                str(p): _number(percentiles[j, i]) for j, p in enumerate(PERCENTILES)
+            },
+        }
+        for i in range(values.shape[1])
+    ]
+
+
+def _grouped(groups, values):
+    """Per-group count, mean and population std of ``values``, via bincount.
+
+    Two passes (deviations from the group mean) rather than E[x²] - E[x]²,
+    which cancels badly and leaves a spurious spread for constant groups.
+    """
+    import numpy as np
+
+    counts = np.bincount(groups)
+    with np.errstate(invalid="ignore", divide="ignore"):
+        means = np.bincount(groups, weights=values) / counts
+        deviations = values - means[groups]
+        stds = np.sqrt(np.bincount(groups, weights=deviations * deviations) / counts)
+    return counts, means, stds
+
+
+def _disagreement(projects, values):
+    """Mean and max spread between evaluators of the same project.
+
+    Only projects scored by at least two evaluators count; NaN scores are left
+    out per column.
+    """
+    import numpy as np
+
+    present = ~np.isnan(values)
+    _, groups = np.unique(projects[present], return_inverse=True)
+    counts, _, stds = _grouped(groups, values[present])
+    shared = stds[counts > 1]
+    if not shared.size:
+        return {"projects": 0, "mean_std": None, "max_std": None}
+    return {
+        "projects": int(shared.size),
+        "mean_std": _number(shared.mean()),
+        "max_std": _number(shared.max()),
+    }
+
+
+def compute_rubric_stats(rubric):
+    """Score statistics for every evaluation made with ``rubric``.
+
+    Per criterion and for the total: count, mean, variance and percentiles,
+    plus how far evaluators of the same project disagree. Totals are also
+    z-scored within each evaluator, which removes lenient or harsh marking,
+    and each project's mean z-score is mapped back onto the overall scale.
+    """
+    import numpy as np
+
+    projects, evaluators, totals, scores = load_scores(rubric)
+    criteria = [
+        {"name": criterion["name"], "max": criterion.get("max"), **summary}
+        for criterion, summary in zip(rubric.criteria, _describe(scores))
+    ]
+    for i, criterion in enumerate(criteria):
+        criterion["disagreement"] = _disagreement(projects, scores[:, i])
+
+    result = {
+        "rubric": rubric.id,
+        "evaluations": int(totals.size),
+        "computed_at": timezone.now(),
+        "criteria": criteria,
+        "total": {
+            **_describe(totals.reshape(-1, 1))[0],
+            "disagreement": _disagreement(projects, totals),
+        },
+        "evaluators": [],
+        "projects": [],
+    }
+    if not totals.size:
+        return result
+
+    evaluator_ids, by_evaluator = np.unique(evaluators, return_inverse=True)
+    counts, means, stds = _grouped(by_evaluator, totals)
+    # A single or constant score carries no spread to normalize by.
+    spread = np.where(stds > MIN_SPREAD, stds, np.inf)[by_evaluator]
+    z = (totals - means[by_evaluator]) / spread
+    overall_mean, overall_std = totals.mean(), totals.std()
+    result["evaluators"] = [
+        {
+            "evaluator": int(evaluator_ids[i]),
+            "evaluations": int(counts[i]),
+            "mean_total": _number(means[i]),
+            "std_total": _number(stds[i]),
+            "leniency": _number(means[i] - overall_mean),
+        }
+        for i in range(evaluator_ids.size)
+    ]
+
+    project_ids, by_project = np.unique(projects, return_inverse=True)
+    counts, raw_means, _ = _grouped(by_project, totals)
+    _, mean_z, _ = _grouped(by_project, z)
+    normalized = overall_mean + mean_z * overall_std
+    order = np.argsort(-normalized, kind="stable")
+    result["projects"] = [
+        {
+            "project": int(project_ids[i]),
+            "evaluations": int(counts[i]),
+            "mean_total": _number(raw_means[i]),
+            "mean_z": _number(mean_z[i]),
+            "normalized_total": _number(normalized[i]),
+        }
+        for i in order
+    ]
+    return result
+
+
+def rubric_stats(rubric):
+    """``compute_rubric_stats`` cached until an evaluation of the rubric changes.
+
+    A cached entry is only used while it matches ``rubric.criteria``.
+    """
+    key = stats_cache_key(rubric.id)
+    version = rubric.criteria_version
+    entry = cache.get(key)
+    if entry is not None and entry[0] == version:
+        return entry[1]
+    stats = compute_rubric_stats(rubric)
+    cache.set(key, (version, stats), STATS_TTL)
+    return stats
@@ -0,0 +1,258 @@
+import importlib.util
+import io
+import sys
+import unittest
+from unittest import mock
+
+from django.core.cache import cache
+from django.core.management import call_command
+from django.test import TestCase
+from rest_framework.test import APIClient
+from users.models import User
+from fyps.models import Project, ProjectProposal
+from evaluations.models import Evaluation, EvaluationRubric
+from evaluations.rubrics import compiled_rubric, rubric_cache_key
+from evaluations.stats import stats_cache_key
+
+HAS_NUMPY = importlib.util.find_spec("numpy") is not None
+
+
+class RubricTestMixin:
+    def setUp(self):
+        cache.clear()
+        self.admin = User.objects.create_user(email="admin@example.com", role="admin")
+        self.lenient = User.objects.create_user(
+            email="lenient@example.com", role="supervisor"
+        )
+        self.harsh = User.objects.create_user(
+            email="harsh@example.com", role="supervisor"
+        )
+        self.rubric = EvaluationRubric.objects.create(
+            name="Final",
+            criteria=[{"name": "Design", "max": 10}, {"name": "Report", "max": 10}],
+            max_score=20,
+        )
+        self.projects = [self.create_project(index) for index in range(3)]
+        self.client = APIClient()
+        self.client.force_authenticate(self.admin)
+        self.stats_url = f"/api/evaluations/rubrics/{self.rubric.id}/stats/"
+
+    def create_project(self, index):
+        student = User.objects.create_user(email=f"student{index}@example.com")
+        proposal = ProjectProposal.objects.create(
+            title=f"Proposal {index}",
+            description="",
+            document="proposals/p.pdf",
+            status="approved",
+            student=student,
+            supervisor=self.lenient,
+        )
+        return Project.objects.create(
+            proposal=proposal,
+            title=f"Project {index}",
+            description="",
+            supervisor=self.lenient,
+        )
+
+    def evaluate(self, project, evaluator, design, report):
+        return Evaluation.objects.create(
+            project=project,
+            evaluator=evaluator,
+            rubric=self.rubric,
+            scores=[
+                {"name": "Design", "score": design},
+                {"name": "Report", "score": report},
+            ],
+            total_score=design + report,
+        )
+
+
+class EvaluationScoringTests(RubricTestMixin, TestCase):
+    url = "/api/evaluations/evaluations/"
+
+    def post(self, scores, **data):
+        self.client.force_authenticate(self.lenient)
+        return self.client.post(
+            self.url,
+            {"project": self.projects[0].id, "rubric": self.rubric.id, **data}
+            | {"scores": scores},
+            format="json",
+        )
+
+    def test_total_is_computed_from_the_scores(self):
+        response = self.post(
+            [{"name": "Report", "score": 6.5}, {"name": "Design", "score": 8}],
+            total_score=100,
+        )
+        self.assertEqual(response.status_code, 201)
+        self.assertEqual(response.data["total_score"], 14.5)
+        # Stored in rubric order.
+        self.assertEqual(
+            Evaluation.objects.get().scores,
+            [{"name": "Design", "score": 8}, {"name": "Report", "score": 6.5}],
+        )
+
+    def test_scores_must_fit_the_rubric(self):
+        response = self.post(
+            [
+                {"name": "Design", "score": 11},
+                {"name": "Slides", "score": 3},
+                {"name": "Design", "score": 2},
+            ]
+        )
+        self.assertEqual(response.status_code, 400)
+        self.assertEqual(
+            response.data["scores"],
+            [
+                '"Design" must be a number from 0 to 10.',
+                '"Slides" is not a criterion of this rubric.',
+                '"Design" is scored more than once.',
+                '"Report" is not scored.',
+            ],
+        )
+        self.assertFalse(Evaluation.objects.exists())
+
+    def test_rubric_is_required(self):
+        response = self.post([{"name": "Design", "score": 1}], rubric=None)
+        self.assertEqual(response.status_code, 400)
+        self.assertIn("rubric", response.data)
+
+    def test_updates_recompute_the_total(self):
+        evaluation = self.evaluate(self.projects[0], self.lenient, 5, 5)
+        self.client.force_authenticate(self.lenient)
+        url = f"{self.url}{evaluation.id}/"
+        response = self.client.patch(url, {"comments": "Solid"}, format="json")
+        self.assertEqual(response.data["total_score"], 10)
+        response = self.client.patch(
+            url,
+            {
+                "scores": [
+                    {"name": "Design", "score": 9},
+                    {"name": "Report", "score": 7},
+                ]
+            },
+            format="json",
+        )
+        self.assertEqual(response.data["total_score"], 16)
+
+    def test_compiled_rubric_is_cached_until_the_rubric_changes(self):
+        self.assertEqual(
+            compiled_rubric(self.rubric), {"Design": (0, 10), "Report": (1, 10)}
+        )
+        self.assertIsNotNone(cache.get(rubric_cache_key(self.rubric.id)))
+        self.rubric.criteria = [{"name": "Design", "max": 20}]
+        self.rubric.save()
+        self.assertIsNone(cache.get(rubric_cache_key(self.rubric.id)))
+        self.assertEqual(compiled_rubric(self.rubric), {"Design": (0, 20)})
+
+        # An edit this cache never heard of, e.g. made by another worker.
+        EvaluationRubric.objects.filter(pk=self.rubric.pk).update(
+            criteria=[{"name": "Design", "max": 5}]
+        )
+        self.rubric.refresh_from_db()
+        self.assertEqual(compiled_rubric(self.rubric), {"Design": (0, 5)})
+
+    def test_rubric_criteria_are_validated(self):
+        self.client.force_authenticate(self.admin)
+        response = self.client.post(
+            "/api/evaluations/rubrics/",
+            {
+                "name": "Midterm",
+                "criteria": [{"name": "Design", "max": 0}],
+                "max_score": 10,
+            },
+            format="json",
+        )
+        self.assertEqual(response.status_code, 400)
+        self.assertIn("criteria", response.data)
+
+    def test_rescore_command_recomputes_totals(self):
+        fits = self.evaluate(self.projects[0], self.lenient, 4, 6)
+        stale = self.evaluate(self.projects[1], self.lenient, 3, 3)
+        Evaluation.objects.filter(pk=stale.pk).update(total_score=50)
+        broken = self.evaluate(self.projects[2], self.lenient, 2, 2)
+        Evaluation.objects.filter(pk=broken.pk).update(
+            scores=[{"name": "Design", "score": 2}]
+        )
+
+        call_command("rescore_evaluations", str(self.rubric.id), stdout=io.StringIO())
+        totals = dict(Evaluation.objects.values_list("pk", "total_score"))
+        self.assertEqual(totals, {fits.pk: 10, stale.pk: 6, broken.pk: 4})
+
+
+class RubricStatsTests(RubricTestMixin, TestCase):
+    def test_only_admins_see_statistics(self):
+        self.client.force_authenticate(self.lenient)
+        self.assertEqual(self.client.get(self.stats_url).status_code, 403)
+
+    def test_missing_numpy_is_reported(self):
+        self.evaluate(self.projects[0], self.lenient, 9, 9)
+        with mock.patch.dict(sys.modules, {"numpy": None}):
+            response = self.client.get(self.stats_url)
+        self.assertEqual(response.status_code, 503)
+        self.assertIn("NumPy", response.data["detail"])
+
+    @unittest.skipUnless(HAS_NUMPY, "NumPy is not installed")
+    def test_criteria_and_disagreement(self):
+        first, second, third = self.projects
+        self.evaluate(first, self.lenient, 9, 9)
+        self.evaluate(first, self.harsh, 5, 7)
+        self.evaluate(second, self.lenient, 8, 6)
+        self.evaluate(third, self.harsh, 3, 4)
+
+        response = self.client.get(self.stats_url)
+        self.assertEqual(response.status_code, 200)
+        data = response.data
+        self.assertEqual(data["evaluations"], 4)
+        design = data["criteria"][0]
+        self.assertEqual(design["name"], "Design")
+        self.assertEqual(design["count"], 4)
+        self.assertEqual(design["mean"], 6.25)
+        self.assertEqual(design["percentiles"]["50"], 6.5)
+        self.assertAlmostEqual(design["variance"], 7.5833, places=4)
+        # Only the first project has two evaluators: Design 9 vs 5.
+        self.assertEqual(design["disagreement"]["projects"], 1)
+        self.assertEqual(design["disagreement"]["mean_std"], 2.0)
+        self.assertEqual(data["total"]["disagreement"]["max_std"], 3.0)
+
+    @unittest.skipUnless(HAS_NUMPY, "NumPy is not installed")
+    def test_normalization_removes_evaluator_leniency(self):
+        first, second, third = self.projects
+        # The harsh evaluator marks everything 8 points lower.
+        for project, total in ((first, 18), (second, 14), (third, 10)):
+            self.evaluate(project, self.lenient, total / 2, total / 2)
+        for project, total in ((first, 10), (second, 6)):
+            self.evaluate(project, self.harsh, total / 2, total / 2)
+
+        data = self.client.get(self.stats_url).data
+        leniency = {row["evaluator"]: row["leniency"] for row in data["evaluators"]}
+        self.assertGreater(leniency[self.lenient.id], leniency[self.harsh.id])
+        ranked = [row["project"] for row in data["projects"]]
+        self.assertEqual(ranked, [first.id, second.id, third.id])
+        self.assertEqual(data["projects"][0]["mean_z"], 1.1124)
+
+    @unittest.skipUnless(HAS_NUMPY, "NumPy is not installed")
+    def test_cached_until_an_evaluation_changes(self):
+        evaluation = self.evaluate(self.projects[0], self.lenient, 9, 9)
+        self.assertEqual(self.client.get(self.stats_url).data["total"]["mean"], 18.0)
+        self.assertIsNotNone(cache.get(stats_cache_key(self.rubric.id)))
+
+        with self.assertNumQueries(1):  # the rubric lookup only
+            self.client.get(self.stats_url)
+        evaluation.total_score = 12
+        evaluation.save()
+        self.assertIsNone(cache.get(stats_cache_key(self.rubric.id)))
+        self.assertEqual(self.client.get(self.stats_url).data["total"]["mean"], 12.0)
+
+        evaluation.delete()
+        self.assertEqual(self.client.get(self.stats_url).data["evaluations"], 0)
+
+    @unittest.skipUnless(HAS_NUMPY, "NumPy is not installed")
+    def test_criteria_edits_missed_by_the_cache_are_noticed(self):
+        self.evaluate(self.projects[0], self.lenient, 9, 9)
+        self.client.get(self.stats_url)
+        EvaluationRubric.objects.filter(pk=self.rubric.pk).update(
+            criteria=[{"name": "Design", "max": 10}]
+        )
+        criteria = self.client.get(self.stats_url).data["criteria"]
+        self.assertEqual([c["name"] for c in criteria], ["Design"])
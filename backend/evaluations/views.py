@@ -1,7 +1,13 @@
-from rest_framework import viewsets, permissions
+from django.db.models import Q
+from rest_framework import viewsets, permissions, status
+from rest_framework.decorators import action
+from rest_framework.response import Response
+from core.caching import ResponseCacheMixin
+from core.querysets import EagerLoadingMixin
 from .models import EvaluationRubric, Evaluation
 from .serializers import EvaluationRubricSerializer, EvaluationSerializer
-from fyps.models import Project
+from .stats import rubric_stats
+from fyps.access import accessible_project_ids
 
 
 class IsAdminOrReadOnly(permissions.BasePermission):
@@ -11,15 +17,37 @@ class IsAdminOrReadOnly(permissions.BasePermission):
         return request.user.is_authenticated and request.user.role == "admin"
 
 
-class EvaluationRubricViewSet(viewsets.ModelViewSet):
+class IsAdmin(permissions.BasePermission):
+    def has_permission(self, request, view):
+        return request.user.is_authenticated and request.user.role == "admin"
+
+
+class EvaluationRubricViewSet(
+    ResponseCacheMixin, EagerLoadingMixin, viewsets.ModelViewSet
+):
     queryset = EvaluationRubric.objects.all()
     serializer_class = EvaluationRubricSerializer
+    cursor_ordering = ("id",)
     permission_classes = [IsAdminOrReadOnly]
+    cache_dependencies = ("evaluations.evaluationrubric",)
+
+    @action(detail=True, methods=["get"], permission_classes=[IsAdmin])
+    def stats(self, request, pk=None):
+        """Score statistics of the rubric's evaluations, see ``stats``."""
+        rubric = self.get_object()
+        try:
+            return Response(rubric_stats(rubric))
+        except ImportError:
+            return Response(
+                {"detail": "Score statistics need NumPy, which is not installed."},
+                status=status.HTTP_503_SERVICE_UNAVAILABLE,
+            )
 
 
-class EvaluationViewSet(viewsets.ModelViewSet):
+class EvaluationViewSet(EagerLoadingMixin, viewsets.ModelViewSet):
     queryset = Evaluation.objects.all().order_by("-created_at")
     serializer_class = EvaluationSerializer
+    cursor_ordering = ("-created_at", "-id")
     permission_classes = [permissions.IsAuthenticated]
 
     def perform_create(self, serializer):
@@ -28,9 +56,11 @@ class EvaluationViewSet(viewsets.ModelViewSet):
     def get_queryset(self):
         user = self.request.user
         if user.role == "student":
-            return Evaluation.objects.filter(project__students=user)
+            return Evaluation.objects.filter(
+                project_id__in=accessible_project_ids(user)
+            )
         elif user.role == "supervisor":
             return Evaluation.objects.filter(
-                project__supervisor=user
-            ) | Evaluation.objects.filter(evaluator=user)
+                Q(project_id__in=accessible_project_ids(user)) | Q(evaluator=user)
+            )
         return Evaluation.objects.all()
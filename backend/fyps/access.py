@@ -0,0 +1,53 @@
+from django.core.cache import cache
+from django.db import transaction
+from .models import Project
+
+# Membership changes invalidate entries explicitly, in the shared cache the
+# entrypoints require (core.caching.require_shared_cache). The TTL is the
+# revocation window for anything that misses that: a raw bulk write, or a
+# worker started on a process-local cache.
+PROJECT_ACCESS_TTL = 60
+
+
+def project_access_key(role, user_id):
+    # The role is part of the key, so a role change never reads stale scope.
+    return f"projects:access:{role}:{user_id}"
+
+
+def accessible_project_ids(user):
+    """Return the ids of the projects a student or supervisor is on.
+
+    Cached per user so role-scoped querysets and permission checks become an
+    ``id__in`` lookup instead of a join through the membership table. Admins
+    are not scoped; callers handle them before asking.
+    """
+    key = project_access_key(user.role, user.pk)
+    project_ids = cache.get(key)
+    if project_ids is None:
+        if user.role == "student":
+            rows = Project.students.through.objects.filter(user_id=user.pk)
+            project_ids = frozenset(rows.values_list("project_id", flat=True))
+        elif user.role == "supervisor":
+            rows = Project.objects.filter(supervisor_id=user.pk)
+            project_ids = frozenset(rows.values_list("id", flat=True))
+        else:
+            project_ids = frozenset()
+        cache.set(key, project_ids, PROJECT_ACCESS_TTL)
+    return project_ids
+
+
+def forget_project_access(user_ids):
+    """Drop cached scopes now and again once the transaction commits.
+
+    The second delete catches a concurrent request that re-cached the old
+    membership before this transaction's changes became visible.
+    """
+    keys = [
+        project_access_key(role, user_id)
+        for user_id in set(user_ids)
+        if user_id is not None
+        for role in ("student", "supervisor")
+    ]
+    if keys:
+        cache.delete_many(keys)
+        transaction.on_commit(lambda: cache.delete_many(keys))
@@ -0,0 +1,189 @@
+import datetime
+
+from django.db import transaction
+from django.db.models import Count, F, Q, Sum
+from django.db.models.functions import TruncDate
+from django.utils import timezone
+from users.models import User
+from submissions.models import Submission
+from evaluations.models import Evaluation
+from .models import (
+    ProjectProposal,
+    Project,
+    Milestone,
+    Document,
+    AnalyticsCounter,
+    AnalyticsDailyCount,
+)
+
+# (payload key, model, field, choices) for every per-choice breakdown.
+BREAKDOWNS = [
+    ("user_counts", User, "role", User.ROLE_CHOICES),
+    ("project_counts", Project, "status", Project.STATUS_CHOICES),
+    ("proposal_counts", ProjectProposal, "status", ProjectProposal.STATUS_CHOICES),
+    ("milestone_counts", Milestone, "status", Milestone.STATUS_CHOICES),
+    ("document_counts", Document, "type", Document.DOCUMENT_TYPES),
+]
+
+# Models whose counters are kept current by signals: model -> (counter prefix,
+# tracked field, whether the field is summed into ``total`` instead of being
+# used as the choice suffix of the key).
+TRACKED = {
+    **{model: (name, field, False) for name, model, field, _ in BREAKDOWNS},
+    Submission: ("total_submissions", None, False),
+    Evaluation: ("evaluations", "total_score", True),
+}
+
+# (history key, model, creation timestamp field) for the daily trend buckets.
+HISTORY = [
+    ("proposals", ProjectProposal, "submitted_at"),
+    ("documents", Document, "uploaded_at"),
+    ("submissions", Submission, "submitted_at"),
+    ("evaluations", Evaluation, "created_at"),
+]
+
+
+def count_by_choice(queryset, field, choices):
+    """Count rows per choice value of ``field`` in a single grouped query.
+
+    Every choice gets its own ``COUNT(...) FILTER (WHERE ...)`` column, so
+    choices with no rows still come back as 0.
+    """
+    aggregates = {
+        value: Count("pk", filter=Q(**{field: value})) for value, _ in choices
+    }
+    return queryset.aggregate(**aggregates)
+
+
+def compute_counters():
+    """Scan the source tables (one query each) into ``{key: (count, total)}``."""
+    counters = {}
+    for name, model, field, choices in BREAKDOWNS:
+        for value, count in count_by_choice(
+            model.objects.all(), field, choices
+        ).items():
+            counters[f"{name}.{value}"] = (count, 0)
+    counters["total_submissions"] = (Submission.objects.count(), 0)
+    evaluations = Evaluation.objects.aggregate(
+        count=Count("pk"), total=Sum("total_score")
+    )
+    counters["evaluations"] = (evaluations["count"], evaluations["total"] or 0)
+    return counters
+
+
+def counter_entry(model, value):
+    """Return the ``(key, total)`` a tracked instance contributes to."""
+    name, field, weighted = TRACKED[model]
+    if field is None:
+        return name, 0
+    if weighted:
+        return name, value or 0
+    return f"{name}.{value}", 0
+
+
+def bump_counter(key, count=0, total=0):
+    """Apply a delta to one counter with a single atomic ``UPDATE``.
+
+    Counters only exist once the snapshot has been built; until then the
+    delta is dropped and the first rebuild picks the change up.
+    """
+    AnalyticsCounter.objects.filter(key=key).update(
+        count=F("count") + count, total=F("total") + total, updated_at=timezone.now()
+    )
+
+
+def bump_daily(key, date, count=1):
+    updated = AnalyticsDailyCount.objects.filter(key=key, date=date).update(
+        count=F("count") + count
+    )
+    if not updated:
+        _, created = AnalyticsDailyCount.objects.get_or_create(
+            key=key, date=date, defaults={"count": count}
+        )
+        if not created:
+            AnalyticsDailyCount.objects.filter(key=key, date=date).update(
+                count=F("count") + count
+            )
+
+
+@transaction.atomic
+def rebuild_snapshot(history=False):
+    """Recompute every counter from scratch, optionally with daily history."""
+    now = timezone.now()
+    counters = [
+        AnalyticsCounter(
+            key=key, count=count, total=total, rebuilt_at=now, updated_at=now
+        )
+        for key, (count, total) in compute_counters().items()
+    ]
+    AnalyticsCounter.objects.all().delete()
+    AnalyticsCounter.objects.bulk_create(counters)
+    if history:
+        rebuild_history()
+    return counters
+
+
+def rebuild_history():
+    buckets = []
+    for key, model, field in HISTORY:
+        rows = (
+            model.objects.annotate(date=TruncDate(field))
+            .values("date")
+            .annotate(count=Count("pk"))
+            .order_by()
+        )
+        buckets.extend(
+            AnalyticsDailyCount(key=key, date=row["date"], count=row["count"])
+            for row in rows
+        )
+    AnalyticsDailyCount.objects.all().delete()
+    AnalyticsDailyCount.objects.bulk_create(buckets)
+
+
+def read_snapshot():
+    """Build the admin dashboard payload from the persisted counters.
+
+    This reads the small, fixed-size counters table only; the snapshot is
+    built on first use if it does not exist yet.
+    """
+    rows = list(AnalyticsCounter.objects.all())
+    if not rows:
+        rows = rebuild_snapshot()
+    counters = {row.key: row for row in rows}
+
+    def count(key):
+        return counters[key].count if key in counters else 0
+
+    payload = {
+        name: {value: count(f"{name}.{value}") for value, _ in choices}
+        for name, _, _, choices in BREAKDOWNS
+    }
+    payload["total_submissions"] = count("total_submissions")
+    evaluations = counters.get("evaluations")
+    payload["avg_evaluation_score"] = (
+        evaluations.total / evaluations.count
+        if evaluations and evaluations.count
+        else None
+    )
+    payload["overdue_milestones"] = payload["milestone_counts"]["overdue"]
+
+    updated_at = max(row.updated_at for row in rows)
+    payload["snapshot"] = {
+        "rebuilt_at": min(row.rebuilt_at for row in rows),
+        "updated_at": updated_at,
+        "age_seconds": (timezone.now() - updated_at).total_seconds(),
+    }
+    return payload
+
+
+def read_history(days=30):
+    """Return ``{key: [{"date", "count"}, ...]}`` for the last ``days`` days."""
+    since = timezone.localdate() - datetime.timedelta(days=days - 1)
+    history = {key: [] for key, _, _ in HISTORY}
+    for row in AnalyticsDailyCount.objects.filter(date__gte=since).values(
+        "key", "date", "count"
+    ):
+        history.setdefault(row["key"], []).append(
+            {"date": row["date"], "count": row["count"]}
+        )
+    return history
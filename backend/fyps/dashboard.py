@@ -0,0 +1,102 @@
+from django.db.models import Avg, Count
+from rest_framework import permissions
+from rest_framework.response import Response
+from rest_framework.views import APIView
+from announcements import counters
+from announcements.models import Notification
+from core.querysets import list_queryset
+from evaluations.views import EvaluationViewSet
+from submissions.views import SubmissionViewSet
+from .analytics import count_by_choice
+from .models import Milestone, Project, ProjectProposal
+from .views import MilestoneViewSet, ProjectProposalViewSet, ProjectViewSet
+
+LIST_SIZE = 5
+
+
+def _scoped(viewset_class, request):
+    return list_queryset(viewset_class, request)[1].order_by()
+
+
+def _with_total(counts):
+    return {"total": sum(counts.values()), **counts}
+
+
+def dashboard_summary(request):
+    """Everything a home page shows, in a fixed number of queries.
+
+    Each model is scoped by its list endpoint's ``get_queryset``; counts are
+    single aggregate queries and lists are capped at ``LIST_SIZE`` rows of
+    plain values, so the query count does not grow with the data.
+    """
+    user = request.user
+    proposals = _scoped(ProjectProposalViewSet, request)
+    projects = _scoped(ProjectViewSet, request)
+    milestones = _scoped(MilestoneViewSet, request)
+    submissions = _scoped(SubmissionViewSet, request)
+    evaluations = _scoped(EvaluationViewSet, request)
+
+    totals = evaluations.aggregate(
+        count=Count("pk"),
+        projects=Count("project_id", distinct=True),
+        average=Avg("total_score"),
+    )
+    return {
+        "role": user.role,
+        "counts": {
+            "proposals": _with_total(
+                count_by_choice(proposals, "status", ProjectProposal.STATUS_CHOICES)
+            ),
+            "projects": _with_total(
+                count_by_choice(projects, "status", Project.STATUS_CHOICES)
+            ),
+            "milestones": _with_total(
+                count_by_choice(milestones, "status", Milestone.STATUS_CHOICES)
+            ),
+            "submissions": submissions.count(),
+            "evaluations": totals["count"],
+            "evaluated_projects": totals["projects"],
+            "unread_notifications": counters.unread_count(user.id),
+        },
+        "upcoming_milestones": list(
+            # Overdue milestones sort first, ahead of the next ones due.
+            milestones.exclude(status="completed")
+            .order_by("due_date", "id")
+            .values(
+                "id", "title", "due_date", "status", "project_id", "project__title"
+            )[:LIST_SIZE]
+        ),
+        "latest_submissions": list(
+            submissions.order_by("-submitted_at", "-id").values(
+                "id",
+                "title",
+                "submitted_at",
+                "project_id",
+                "project__title",
+                "student__email",
+            )[:LIST_SIZE]
+        ),
+        "unread_notifications": list(
+            Notification.objects.filter(recipient=user, read=False)
+            .order_by("-created_at", "-id")
+            .values("id", "message", "type", "link", "created_at")[:LIST_SIZE]
+        ),
+        "average_score": totals["average"],
+        # The best-scoring projects; counts.evaluated_projects says how many
+        # there are in all.
+        "project_scores": list(
+            evaluations.values("project_id", "project__title")
+            .annotate(count=Count("pk"), average=Avg("total_score"))
+            .order_by("-average", "project_id")[:LIST_SIZE]
+        ),
+    }
+
+
+class DashboardView(APIView):
+    """Summary for the signed-in user's home page, replacing one list request
+    per model with a single call."""
+
+    permission_classes = [permissions.IsAuthenticated]
+
+    def get(self, request):
+        return Response(dashboard_summary(request))
@@ -0,0 +1,210 @@
+import mimetypes
+import os
+import re
+from urllib.parse import quote
+
+from django.conf import settings
+from django.http import FileResponse, HttpResponse
+from django.shortcuts import get_object_or_404
+from django.urls import Resolver404, resolve
+from django.utils.cache import get_conditional_response
+from django.utils.http import http_date, parse_http_date_safe
+from rest_framework import permissions
+from rest_framework.decorators import action
+from rest_framework.exceptions import ValidationError
+from rest_framework.response import Response
+from rest_framework.settings import api_settings
+from rest_framework.views import APIView
+from users.authentication import SignedLinkAuthentication, sign_link
+from .storage import blob_sha256
+
+RANGE = re.compile(r"^bytes=(\d*)-(\d*)$")
+# Downloads are opened as plain links, which can only carry a token in the URL:
+# a short-lived one signed for that path by DownloadLinkView.
+LINK_AUTHENTICATION_CLASSES = [
+    *api_settings.DEFAULT_AUTHENTICATION_CLASSES,
+    SignedLinkAuthentication,
+]
+
+
+def parse_range(header, size):
+    """Resolve a ``Range`` header to an inclusive ``(start, end)`` pair.
+
+    Returns None when the whole file should be sent (no header, a malformed
+    one, or several ranges, which servers may ignore) and False when the
+    range cannot be satisfied.
+    """
+    match = RANGE.match(header or "")
+    if not match or match.groups() == ("", ""):
+        return None
+    first, last = match.groups()
+    if not first:
+        length = int(last)
+        return (max(size - length, 0), size - 1) if length and size else False
+    start = int(first)
+    end = min(int(last), size - 1) if last else size - 1
+    if start >= size:
+        return False
+    return (start, end) if start <= end else None
+
+
+class RangeFile:
+    """Expose ``length`` bytes from the current position of an open file.
+
+    Keeps ``fileno`` so a WSGI server's ``sendfile`` path still applies; it
+    sends from the current offset up to the response's Content-Length.
+    """
+
+    def __init__(self, file, length):
+        self.file = file
+        self.remaining = length
+
+    def read(self, size=-1):
+        if size < 0 or size > self.remaining:
+            size = self.remaining
+        data = self.file.read(size)
+        self.remaining -= len(data)
+        return data
+
+    def fileno(self):
+        return self.file.fileno()
+
+    def close(self):
+        self.file.close()
+
+
+class FileDownloadMixin:
+    """``GET <pk>/download/`` for a viewset whose model has a FileField.
+
+    Access follows the viewset's role-scoped ``get_queryset``. Responses carry
+    an ETag (the content hash for blob-stored files) and Last-Modified, answer
+    conditional requests with 304 and single ranges with 206. With
+    ``DOWNLOAD_OFFLOAD`` set, the bytes are left to the front proxy.
+    """
+
+    download_field = "file"
+    download_name_field = "title"
+
+    @action(
+        detail=True,
+        methods=["get"],
+        authentication_classes=LINK_AUTHENTICATION_CLASSES,
+    )
+    def download(self, request, pk=None):
+        queryset = self.get_queryset().only(
+            "pk", self.download_field, self.download_name_field
+        )
+        obj = get_object_or_404(queryset, pk=pk)
+        self.check_object_permissions(request, obj)
+        file = getattr(obj, self.download_field)
+        if not file.name:
+            return HttpResponse(status=404)
+        try:
+            path = file.path
+            stat = os.stat(path)
+        except (NotImplementedError, FileNotFoundError):
+            return HttpResponse(status=404)
+
+        sha256 = blob_sha256(file.name)
+        if sha256:
+            etag = f'"{sha256}"'
+        else:
+            etag = f'"{stat.st_size:x}-{stat.st_mtime_ns:x}"'
+        last_modified = int(stat.st_mtime)
+        response = get_conditional_response(
+            request._request, etag=etag, last_modified=last_modified
+        )
+        if response is None:
+            response = self.file_response(
+                request, obj, file, path, stat.st_size, etag, last_modified
+            )
+        response["ETag"] = etag
+        response["Last-Modified"] = http_date(last_modified)
+        response["Cache-Control"] = "private, no-cache"
+        return response
+
+    def download_filename(self, obj, file):
+        stem = getattr(obj, self.download_name_field) or "download"
+        return stem + os.path.splitext(file.name)[1]
+
+    def file_response(self, request, obj, file, path, size, etag, last_modified):
+        filename = self.download_filename(obj, file)
+        offload = settings.DOWNLOAD_OFFLOAD
+        if offload:
+            # The proxy streams the file itself, Range requests included.
+            response = HttpResponse(
+                content_type=mimetypes.guess_type(filename)[0]
+                or "application/octet-stream"
+            )
+            response["Content-Disposition"] = (
+                f"attachment; filename*=UTF-8''{quote(filename)}"
+            )
+            if offload == "x-accel-redirect":
+                prefix = settings.DOWNLOAD_ACCEL_PREFIX
+                response["X-Accel-Redirect"] = prefix + quote(file.name)
+            else:
+                response["X-Sendfile"] = path
+            return response
+
+        # A stale If-Range validator means the client's partial copy is of a
+        # different file: send the whole thing instead.
+        byte_range = None
+        if_range = request.headers.get("If-Range")
+        if if_range in (None, etag) or parse_http_date_safe(if_range) == last_modified:
+            byte_range = parse_range(request.headers.get("Range"), size)
+        if byte_range is False:
+            response = HttpResponse(status=416)
+            response["Content-Range"] = f"bytes */{size}"
+            return response
+
+        handle = open(path, "rb")
+        if byte_range is None:
+            response = FileResponse(handle, as_attachment=True, filename=filename)
+        else:
+            start, end = byte_range
+            handle.seek(start)
+            response = FileResponse(
+                RangeFile(handle, end - start + 1),
+                as_attachment=True,
+                filename=filename,
+                status=206,
+            )
+            response["Content-Length"] = end - start + 1
+            response["Content-Range"] = f"bytes {start}-{end}/{size}"
+        response["Accept-Ranges"] = "bytes"
+        return response
+
+
+def accepts_signed_links(view):
+    """Whether a resolved view authenticates with ``SignedLinkAuthentication``.
+
+    DRF views list it in their ``authentication_classes`` initkwargs; plain
+    Django views, such as the notification stream, carry the attribute.
+    """
+    initkwargs = getattr(view, "initkwargs", {})
+    classes = initkwargs.get("authentication_classes") or getattr(
+        view, "authentication_classes", ()
+    )
+    return SignedLinkAuthentication in classes
+
+
+class DownloadLinkView(APIView):
+    """Sign a ``?token=`` for one download, export or stream URL of the caller.
+
+    ``POST {"path": "/api/fyps/documents/5/download/"}`` returns the URL with
+    the token appended. The token only authenticates the caller for that
+    path; the endpoint itself still applies their role scoping.
+    """
+
+    permission_classes = [permissions.IsAuthenticated]
+
+    def post(self, request):
+        path = str(request.data.get("path", ""))
+        try:
+            match = resolve(path)
+        except Resolver404:
+            match = None
+        if match is None or not accepts_signed_links(match.func):
+            raise ValidationError({"path": ["Not a download or export address."]})
+        token = sign_link(request.user, path)
+        return Response({"url": f"{path}?token={quote(token)}"})
@@ -0,0 +1,202 @@
+import itertools
+import json
+import os
+import zipfile
+
+from django.core.serializers.json import DjangoJSONEncoder
+from django.db.models import Prefetch
+from django.http import StreamingHttpResponse
+from django.utils import timezone
+from django.utils.text import get_valid_filename
+from submissions.models import Submission
+from users.models import User
+from .models import Document
+
+READ_SIZE = 64 * 1024
+CHUNK_SIZE = 500
+EARLIEST_ZIP_DATE = (1980, 1, 1, 0, 0, 0)
+
+
+class _Sink:
+    """Write-only file the archive is written into, drained after each write.
+
+    It has no ``seek``, so ``zipfile`` streams: sizes and CRCs go in data
+    descriptors after each member instead of being patched into its header.
+    """
+
+    def __init__(self):
+        self.chunks = []
+        self.position = 0
+
+    def write(self, data):
+        self.chunks.append(bytes(data))
+        self.position += len(data)
+        return len(data)
+
+    def tell(self):
+        return self.position
+
+    def flush(self):
+        pass
+
+    def drain(self):
+        data = b"".join(self.chunks)
+        self.chunks.clear()
+        return data
+
+
+def stream_zip(members):
+    """Yield a ZIP archive of ``(name, size, modified, chunks)`` members.
+
+    Only one read-sized block is held at a time, whatever the archive size.
+    Members are stored uncompressed: submissions are mostly PDFs and archives
+    that do not shrink further.
+    """
+    sink = _Sink()
+    with zipfile.ZipFile(sink, "w", compression=zipfile.ZIP_STORED) as archive:
+        for name, size, modified, chunks in members:
+            info = zipfile.ZipInfo(name, date_time=_zip_date(modified))
+            info.file_size = size  # lets zipfile pick ZIP64 for > 4 GiB members
+            with archive.open(info, "w") as member:
+                for chunk in chunks:
+                    member.write(chunk)
+                    yield sink.drain()
+            yield sink.drain()
+    yield sink.drain()
+
+
+def _zip_date(moment):
+    date_time = timezone.localtime(moment).timetuple()[:6]
+    return max(date_time, EARLIEST_ZIP_DATE)
+
+
+def _read(file):
+    with file.open("rb") as handle:
+        yield from handle.chunks(READ_SIZE)
+
+
+def _grouped(rows, attribute):
+    """Hand out rows ordered by ``attribute`` one group at a time, in order."""
+    groups = itertools.groupby(rows, key=lambda row: getattr(row, attribute))
+    pending = next(groups, None)
+
+    def take(key):
+        nonlocal pending
+        while pending is not None and pending[0] < key:
+            pending = next(groups, None)
+        if pending is None or pending[0] != key:
+            return []
+        rows = list(pending[1])
+        pending = next(groups, None)
+        return rows
+
+    return take
+
+
+def _name(text):
+    return get_valid_filename(text) or "untitled"
+
+
+def _member(file, path, item, modified):
+    """Describe ``file`` in its manifest ``item``; None if it is missing."""
+    path += os.path.splitext(file.name)[1]
+    try:
+        size = file.size
+    except (OSError, ValueError):
+        item.update(path=None, missing=True)
+        return None
+    item.update(path=path, size=size)
+    return path, size, modified, _read(file)
+
+
+def project_members(projects):
+    """Archive members for every submission and latest document of ``projects``.
+
+    Three streamed queries regardless of the number of projects; the
+    ``manifest.json`` describing everything comes last.
+    """
+    projects = (
+        projects.select_related("supervisor")
+        .prefetch_related(Prefetch("students", queryset=User.objects.only("email")))
+        .order_by("id")
+    )
+    project_ids = projects.values("id")
+    submissions = _grouped(
+        Submission.objects.filter(project__in=project_ids)
+        .select_related("student")
+        .order_by("project_id", "submitted_at", "id")
+        .iterator(chunk_size=CHUNK_SIZE),
+        "project_id",
+    )
+    documents = _grouped(
+        Document.objects.filter(project__in=project_ids)
+        .order_by("project_id", "name", "-version")
+        .iterator(chunk_size=CHUNK_SIZE),
+        "project_id",
+    )
+
+    manifest = []
+    for project in projects.iterator(chunk_size=CHUNK_SIZE):
+        folder = f"{project.id}-{_name(project.title)}"
+        entry = {
+            "id": project.id,
+            "title": project.title,
+            "status": project.status,
+            "supervisor": project.supervisor.email if project.supervisor else None,
+            "students": [student.email for student in project.students.all()],
+            "submissions": [],
+            "documents": [],
+        }
+        manifest.append(entry)
+
+        for submission in submissions(project.id):
+            item = {
+                "id": submission.id,
+                "title": submission.title,
+                "student": submission.student.email,
+                "submitted_at": submission.submitted_at,
+            }
+            member = _member(
+                submission.file,
+                f"{folder}/submissions/{submission.id}-{_name(submission.title)}",
+                item,
+                submission.submitted_at,
+            )
+            entry["submissions"].append(item)
+            if member:
+                yield member
+
+        latest = {}
+        for document in documents(project.id):
+            latest.setdefault(document.name, document)
+        for document in latest.values():
+            item = {
+                "id": document.id,
+                "name": document.name,
+                "type": document.type,
+                "version": document.version,
+                "uploaded_at": document.uploaded_at,
+            }
+            member = _member(
+                document.file,
+                f"{folder}/documents/{_name(document.name)}-v{document.version}",
+                item,
+                document.uploaded_at,
+            )
+            entry["documents"].append(item)
+            if member:
+                yield member
+
+    now = timezone.now()
+    body = json.dumps(
+        {"generated_at": now, "projects": manifest}, cls=DjangoJSONEncoder, indent=2
+    ).encode()
+    yield "manifest.json", len(body), now, [body]
+
+
+def export_response(projects, filename):
+    response = StreamingHttpResponse(
+        stream_zip(project_members(projects)), content_type="application/zip"
+    )
+    response["Content-Disposition"] = f'attachment; filename="{filename}"'
+    return response
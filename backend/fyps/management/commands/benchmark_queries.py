@@ -0,0 +1,328 @@
+import datetime
+import random
+import statistics
+import time
+
+from django.contrib.auth.hashers import make_password
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connection
+from django.utils import timezone
+from users.models import User
+from fyps.models import ProjectProposal, Project, Milestone, Document
+from submissions.models import Submission, FeedbackThread, FeedbackMessage
+from evaluations.models import Evaluation
+from announcements.models import Notification
+
+INDEXED_MODELS = [
+    ProjectProposal,
+    Milestone,
+    Document,
+    Submission,
+    FeedbackMessage,
+    Evaluation,
+    Notification,
+]
+BATCH_SIZE = 2000
+PAGE = 50
+
+
+def access_paths(student, supervisor):
+    """The role-scoped list queries the viewsets issue, one page each."""
+    return [
+        (
+            "proposals by student",
+            ProjectProposal.objects.filter(student=student).order_by(
+                "-submitted_at", "-id"
+            ),
+        ),
+        (
+            "proposals by supervisor",
+            ProjectProposal.objects.filter(supervisor=supervisor).order_by(
+                "-submitted_at", "-id"
+            ),
+        ),
+        (
+            "milestones by student",
+            Milestone.objects.filter(project__students=student).order_by(
+                "due_date", "id"
+            ),
+        ),
+        (
+            "documents by supervisor",
+            Document.objects.filter(project__supervisor=supervisor).order_by(
+                "-uploaded_at", "-id"
+            ),
+        ),
+        (
+            "submissions by student",
+            Submission.objects.filter(student=student).order_by(
+                "-submitted_at", "-id"
+            ),
+        ),
+        (
+            "submissions by supervisor",
+            Submission.objects.filter(project__supervisor=supervisor).order_by(
+                "-submitted_at", "-id"
+            ),
+        ),
+        (
+            "feedback by supervisor",
+            FeedbackMessage.objects.filter(
+                thread__submission__project__supervisor=supervisor
+            ).order_by("created_at", "id"),
+        ),
+        (
+            "evaluations by student",
+            Evaluation.objects.filter(project__students=student).order_by(
+                "-created_at", "-id"
+            ),
+        ),
+        (
+            "notifications by recipient",
+            Notification.objects.filter(recipient=student).order_by(
+                "-created_at", "-id"
+            ),
+        ),
+        (
+            "unread notifications",
+            Notification.objects.filter(recipient=student, read=False).order_by(
+                "-created_at"
+            ),
+        ),
+    ]
+
+
+class Command(BaseCommand):
+    help = (
+        "Seed a synthetic dataset and record EXPLAIN plans and latencies of the "
+        "role-scoped list queries with and without the composite indexes. "
+        "It writes synthetic rows and drops the real indexes while measuring, "
+        "so it only runs against a scratch database confirmed with --scratch."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--seed",
+            type=int,
+            default=0,
+            help="Insert roughly this many notifications/submissions first.",
+        )
+        parser.add_argument("--repeat", type=int, default=20)
+        parser.add_argument(
+            "--scratch",
+            action="store_true",
+            help="Confirm the default database is a disposable copy.",
+        )
+
+    def handle(self, *args, **options):
+        if not options["scratch"]:
+            name = connection.settings_dict["NAME"]
+            raise CommandError(
+                f"Refusing to seed and drop indexes on database {name!r}. Point "
+                "DATABASES['default'] at a scratch copy and pass --scratch."
+            )
+        if options["seed"]:
+            self.seed(options["seed"])
+        student = User.objects.filter(role="student").order_by("?").first()
+        supervisor = User.objects.filter(role="supervisor").order_by("?").first()
+        if student is None or supervisor is None:
+            raise CommandError("No data to benchmark; pass --seed.")
+
+        paths = access_paths(student, supervisor)
+        after = self.measure(paths, options["repeat"])
+        self.drop_indexes()
+        try:
+            before = self.measure(paths, options["repeat"])
+        finally:
+            self.create_indexes()
+
+        for label, _ in paths:
+            self.stdout.write(self.style.MIGRATE_HEADING(label))
+            self.stdout.write(
+                f"  without indexes: {before[label][0]:.3f} ms\n"
+                f"  with indexes:    {after[label][0]:.3f} ms"
+            )
+            self.stdout.write("  plan without indexes:\n    " + before[label][1])
+            self.stdout.write("  plan with indexes:\n    " + after[label][1])
+
+    def measure(self, paths, repeat):
+        results = {}
+        for label, queryset in paths:
+            page = queryset[:PAGE]
+            plan = page.explain().replace("\n", "\n    ")
+            timings = []
+            for _ in range(repeat):
+                start = time.perf_counter()
+                list(page.all())
+                timings.append((time.perf_counter() - start) * 1000)
+            results[label] = (statistics.median(timings), plan)
+        return results
+
+    def drop_indexes(self):
+        with connection.schema_editor() as editor:
+            for model in INDEXED_MODELS:
+                for index in model._meta.indexes:
+                    editor.remove_index(model, index)
+
+    def create_indexes(self):
+        with connection.schema_editor() as editor:
+            for model in INDEXED_MODELS:
+                for index in model._meta.indexes:
+                    editor.add_index(model, index)
+        with connection.cursor() as cursor:
+            cursor.execute("ANALYZE")
+
+    def seed(self, rows):
+        rng = random.Random(0)
+        now = timezone.now()
+        password = make_password(None)
+        tag = int(time.time())
+
+        def created(model, objects):
+            return model.objects.bulk_create(objects, batch_size=BATCH_SIZE)
+
+        def moment():
+            return now - datetime.timedelta(minutes=rng.randrange(525600))
+
+        supervisors = created(
+            User,
+            [
+                User(
+                    email=f"bench-sup{i}-{tag}@example.com",
+                    role="supervisor",
+                    password=password,
+                )
+                for i in range(max(1, rows // 1000))
+            ],
+        )
+        students = created(
+            User,
+            [
+                User(
+                    email=f"bench-stu{i}-{tag}@example.com",
+                    role="student",
+                    password=password,
+                )
+                for i in range(max(2, rows // 50))
+            ],
+        )
+        proposals = created(
+            ProjectProposal,
+            [
+                ProjectProposal(
+                    title=f"Proposal {i}",
+                    description="",
+                    document="proposals/bench.pdf",
+                    status="approved",
+                    student=student,
+                    supervisor=rng.choice(supervisors),
+                )
+                for i, student in enumerate(students)
+            ],
+        )
+        projects = created(
+            Project,
+            [
+                Project(
+                    proposal=proposal,
+                    title=proposal.title,
+                    description="",
+                    supervisor=proposal.supervisor,
+                )
+                for proposal in proposals[::2]
+            ],
+        )
+        Membership = Project.students.through
+        Membership.objects.bulk_create(
+            [
+                Membership(project=project, user=student)
+                for project, pair in zip(
+                    projects, zip(students[::2], students[1::2])
+                )
+                for student in pair
+            ],
+            batch_size=BATCH_SIZE,
+        )
+        Milestone.objects.bulk_create(
+            [
+                Milestone(
+                    project=rng.choice(projects),
+                    title=f"Milestone {i}",
+                    due_date=moment().date(),
+                )
+                for i in range(rows // 10)
+            ],
+            batch_size=BATCH_SIZE,
+        )
+        Document.objects.bulk_create(
+            [
+                Document(
+                    project=rng.choice(projects),
+                    file="documents/bench.pdf",
+                    name=f"Document {i}",
+                    uploaded_by=rng.choice(students),
+                )
+                for i in range(rows // 10)
+            ],
+            batch_size=BATCH_SIZE,
+        )
+        submissions = created(
+            Submission,
+            [
+                Submission(
+                    title=f"Submission {i}",
+                    file="submissions/bench.zip",
+                    student=rng.choice(students),
+                    project=rng.choice(projects),
+                )
+                for i in range(rows // 2)
+            ],
+        )
+        threads = created(
+            FeedbackThread,
+            [FeedbackThread(submission=submission) for submission in submissions],
+        )
+        FeedbackMessage.objects.bulk_create(
+            [
+                FeedbackMessage(
+                    thread=rng.choice(threads), sender=rng.choice(students), message=""
+                )
+                for _ in range(rows // 2)
+            ],
+            batch_size=BATCH_SIZE,
+        )
+        Evaluation.objects.bulk_create(
+            [
+                Evaluation(
+                    project=project,
+                    evaluator=project.supervisor,
+                    scores=[],
+                    total_score=rng.randrange(100),
+                )
+                for project in projects
+            ],
+            batch_size=BATCH_SIZE,
+        )
+        Notification.objects.bulk_create(
+            [
+                Notification(
+                    recipient=rng.choice(students),
+                    message=f"Notification {i}",
+                    read=rng.random() < 0.8,
+                )
+                for i in range(rows)
+            ],
+            batch_size=BATCH_SIZE,
+        )
+        # auto_now_add ignores explicit values, so spread timestamps afterwards.
+        for model, field in [
+            (Submission, "submitted_at"),
+            (FeedbackMessage, "created_at"),
+            (Notification, "created_at"),
+            (Document, "uploaded_at"),
+        ]:
+            objects = list(model.objects.only("id"))
+            for obj in objects:
+                setattr(obj, field, moment())
+            model.objects.bulk_update(objects, [field], batch_size=BATCH_SIZE)
+        self.stdout.write(self.style.SUCCESS(f"Seeded a {rows}-row dataset."))
@@ -0,0 +1,37 @@
+import datetime
+
+from django.core.management.base import BaseCommand
+from fyps.storage import collect_blobs, recount_blobs
+
+
+class Command(BaseCommand):
+    help = (
+        "Recount blob references from the FileFields that use them and delete "
+        "blobs nothing has referenced for the grace period."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--grace-hours",
+            type=float,
+            default=24,
+            help="Keep unreferenced blobs used more recently than this.",
+        )
+        parser.add_argument(
+            "--dry-run",
+            action="store_true",
+            help="Report what would be deleted without deleting it.",
+        )
+
+    def handle(self, *args, **options):
+        fixed = recount_blobs()
+        count, size = collect_blobs(
+            datetime.timedelta(hours=options["grace_hours"]),
+            dry_run=options["dry_run"],
+        )
+        verb = "Would delete" if options["dry_run"] else "Deleted"
+        self.stdout.write(
+            self.style.SUCCESS(
+                f"Fixed {fixed} refcounts. {verb} {count} blobs ({size} bytes)."
+            )
+        )
@@ -0,0 +1,56 @@
+import time
+
+from django.core.management.base import BaseCommand
+from fyps.similarity import BATCH_SIZE, reindex_proposals
+
+
+class Command(BaseCommand):
+    help = (
+        "Recompute the similarity signatures of proposals, including their "
+        "extractable document text, across a process pool. With --pending, "
+        "only new and edited proposals, which saves queue for this worker."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--workers",
+            type=int,
+            default=None,
+            help="Worker processes (default: one per CPU).",
+        )
+        parser.add_argument("--batch-size", type=int, default=BATCH_SIZE)
+        parser.add_argument(
+            "--pending",
+            action="store_true",
+            help="Only index proposals that have no signature yet.",
+        )
+        parser.add_argument(
+            "--loop",
+            action="store_true",
+            help="Keep running and poll for pending proposals (implies --pending).",
+        )
+        parser.add_argument(
+            "--interval",
+            type=float,
+            default=5,
+            help="Seconds to sleep between polls when nothing is pending.",
+        )
+
+    def handle(self, *args, **options):
+        pending_only = options["pending"] or options["loop"]
+        while True:
+            started = time.perf_counter()
+            indexed = reindex_proposals(
+                options["workers"], options["batch_size"], pending_only
+            )
+            if indexed or not options["loop"]:
+                self.stdout.write(
+                    self.style.SUCCESS(
+                        f"Indexed {indexed} proposals in "
+                        f"{time.perf_counter() - started:.1f}s."
+                    )
+                )
+            if not options["loop"]:
+                break
+            if not indexed:
+                time.sleep(options["interval"])
@@ -0,0 +1,93 @@
+from django.core.files import File
+from django.core.files.storage import default_storage
+from django.core.management.base import BaseCommand, CommandError
+from django.utils import timezone
+from core.caching import bump_versions
+from fyps.storage import (
+    BLOB_PREFIX,
+    ContentAddressedStorage,
+    blob_fields,
+    recount_blobs,
+)
+
+BATCH_SIZE = 500
+
+
+class LegacyFile(File):
+    """A file already on disk, handed to storage to be moved, not copied."""
+
+    def __init__(self, path, name):
+        super().__init__(open(path, "rb"), name=name)
+        self.path = path
+
+    def temporary_file_path(self):
+        return self.path
+
+
+class Command(BaseCommand):
+    help = (
+        "Move files stored under their upload paths into content-addressed "
+        "blobs, rewriting the FileField values that name them."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--dry-run",
+            action="store_true",
+            help="Count the files that would be migrated.",
+        )
+
+    def handle(self, *args, **options):
+        storage = default_storage
+        if not isinstance(storage, ContentAddressedStorage):
+            raise CommandError("The default storage is not content-addressed.")
+
+        migrated, missing, moved = 0, 0, {}
+        for model, field in blob_fields():
+            legacy = (
+                model.objects.exclude(**{f"{field}__startswith": BLOB_PREFIX})
+                .exclude(**{field: ""})
+                .only("pk", field)
+                .order_by("pk")
+            )
+            if options["dry_run"]:
+                migrated += legacy.count()
+                continue
+            # bulk_update skips auto_now; bump it so sync clients refetch URLs.
+            fields = [field]
+            if any(f.name == "updated_at" for f in model._meta.concrete_fields):
+                fields.append("updated_at")
+            batch = []
+            for obj in legacy.iterator(chunk_size=BATCH_SIZE):
+                old = getattr(obj, field).name
+                if old not in moved:
+                    if not storage.exists(old):
+                        missing += 1
+                        continue
+                    with LegacyFile(storage.path(old), old) as content:
+                        moved[old] = storage.save(old, content)
+                setattr(obj, field, moved[old])
+                obj.updated_at = timezone.now()
+                batch.append(obj)
+                if len(batch) == BATCH_SIZE:
+                    model.objects.bulk_update(batch, fields)
+                    migrated += len(batch)
+                    batch = []
+            model.objects.bulk_update(batch, fields)
+            migrated += len(batch)
+            bump_versions(model._meta.label_lower)
+
+        if options["dry_run"]:
+            self.stdout.write(f"{migrated} files would be migrated.")
+            return
+        # Duplicates were not moved; their old copies are no longer needed.
+        for old in moved:
+            if storage.exists(old):
+                storage.delete(old)
+        recount_blobs()
+        self.stdout.write(
+            self.style.SUCCESS(
+                f"Migrated {migrated} files into {len(set(moved.values()))} "
+                f"blobs; {missing} files were missing."
+            )
+        )
@@ -0,0 +1,24 @@
+import datetime
+
+from django.conf import settings
+from django.core.management.base import BaseCommand
+from fyps.uploads import prune_uploads
+
+
+class Command(BaseCommand):
+    help = (
+        "Delete resumable upload sessions, and their partial files, that saw "
+        "no chunk for CHUNKED_UPLOAD_EXPIRY_HOURS."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--hours",
+            type=float,
+            default=settings.CHUNKED_UPLOAD_EXPIRY_HOURS,
+            help="Idle time after which a session is abandoned.",
+        )
+
+    def handle(self, *args, **options):
+        pruned = prune_uploads(datetime.timedelta(hours=options["hours"]))
+        self.stdout.write(self.style.SUCCESS(f"Deleted {pruned} stale uploads."))
@@ -0,0 +1,19 @@
+from django.core.management.base import BaseCommand
+from fyps.analytics import rebuild_snapshot
+
+
+class Command(BaseCommand):
+    help = "Rebuild the admin analytics snapshot from the source tables."
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--history",
+            action="store_true",
+            help="Also rebuild the daily history buckets.",
+        )
+
+    def handle(self, *args, **options):
+        counters = rebuild_snapshot(history=options["history"])
+        self.stdout.write(
+            self.style.SUCCESS(f"Rebuilt {len(counters)} analytics counters.")
+        )
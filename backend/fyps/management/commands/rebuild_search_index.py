@@ -0,0 +1,13 @@
+from django.core.management.base import BaseCommand
+from fyps.search import rebuild_index
+
+
+class Command(BaseCommand):
+    help = (
+        "Reindex every proposal, project, document and feedback message for "
+        "/api/search/; saves keep the index current afterwards."
+    )
+
+    def handle(self, *args, **options):
+        indexed = rebuild_index()
+        self.stdout.write(self.style.SUCCESS(f"Indexed {indexed} rows."))
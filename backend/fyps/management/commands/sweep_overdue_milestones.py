@@ -0,0 +1,43 @@
+import time
+
+from django.core.management.base import BaseCommand
+from fyps.overdue import sweep_overdue_milestones
+
+
+class Command(BaseCommand):
+    help = (
+        "Mark pending milestones past their due date overdue and notify the "
+        "students and supervisors of their projects."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--loop",
+            action="store_true",
+            help="Keep running and sweep every --interval seconds.",
+        )
+        parser.add_argument(
+            "--interval",
+            type=float,
+            default=3600,
+            help="Seconds to sleep between sweeps with --loop.",
+        )
+        parser.add_argument(
+            "--no-notify",
+            action="store_true",
+            help="Update the milestones without sending notifications.",
+        )
+
+    def handle(self, *args, **options):
+        while True:
+            started = time.perf_counter()
+            updated, notified = sweep_overdue_milestones(
+                notify=not options["no_notify"]
+            )
+            self.stdout.write(
+                f"Marked {updated} milestones overdue, sent {notified} "
+                f"notifications in {time.perf_counter() - started:.3f}s."
+            )
+            if not options["loop"]:
+                break
+            time.sleep(options["interval"])
@@ -0,0 +1,27 @@
+# Generated by Django 5.1.15 on 2026-10-18 06:44
+
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('fyps', '0005_analyticscounter_analyticsdailycount'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='document',
+            index=models.Index(fields=['uploaded_at', 'id'], name='document_uploaded_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='milestone',
+            index=models.Index(fields=['due_date', 'id'], name='milestone_due_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='projectproposal',
+            index=models.Index(fields=['submitted_at', 'id'], name='proposal_submitted_idx'),
+        ),
+    ]
@@ -0,0 +1,31 @@
+# Generated by Django 5.1.15 on 2026-10-18 06:45
+
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('fyps', '0006_document_document_uploaded_idx_and_more'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='document',
+            index=models.Index(fields=['project', 'uploaded_at', 'id'], name='document_project_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='milestone',
+            index=models.Index(fields=['project', 'due_date', 'id'], name='milestone_project_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='projectproposal',
+            index=models.Index(fields=['student', 'submitted_at', 'id'], name='proposal_student_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='projectproposal',
+            index=models.Index(fields=['supervisor', 'submitted_at', 'id'], name='proposal_supervisor_idx'),
+        ),
+    ]
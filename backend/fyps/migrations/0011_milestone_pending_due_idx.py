@@ -0,0 +1,17 @@
+# Generated by Django 5.1.15 on 2026-10-18 07:11
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('fyps', '0010_tombstone_updated_at'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='milestone',
+            index=models.Index(condition=models.Q(('status', 'pending')), fields=['due_date'], name='milestone_pending_due_idx'),
+        ),
+    ]
@@ -0,0 +1,99 @@
+# Generated by Django 5.1.15 on 2026-10-18 07:12
+
+from django.db import migrations, models
+
+SQLITE_FORWARDS = [
+    """
+    CREATE VIRTUAL TABLE fyps_searchdocument_fts USING fts5(
+        title, body,
+        content='fyps_searchdocument', content_rowid='id',
+        tokenize='porter unicode61'
+    )
+    """,
+    """
+    CREATE TRIGGER fyps_searchdocument_ai AFTER INSERT ON fyps_searchdocument
+    BEGIN
+        INSERT INTO fyps_searchdocument_fts(rowid, title, body)
+        VALUES (new.id, new.title, new.body);
+    END
+    """,
+    """
+    CREATE TRIGGER fyps_searchdocument_ad AFTER DELETE ON fyps_searchdocument
+    BEGIN
+        INSERT INTO fyps_searchdocument_fts(fyps_searchdocument_fts, rowid, title, body)
+        VALUES ('delete', old.id, old.title, old.body);
+    END
+    """,
+    """
+    CREATE TRIGGER fyps_searchdocument_au AFTER UPDATE ON fyps_searchdocument
+    BEGIN
+        INSERT INTO fyps_searchdocument_fts(fyps_searchdocument_fts, rowid, title, body)
+        VALUES ('delete', old.id, old.title, old.body);
+        INSERT INTO fyps_searchdocument_fts(rowid, title, body)
+        VALUES (new.id, new.title, new.body);
+    END
+    """,
+]
+SQLITE_BACKWARDS = [
+    "DROP TRIGGER IF EXISTS fyps_searchdocument_au",
+    "DROP TRIGGER IF EXISTS fyps_searchdocument_ad",
+    "DROP TRIGGER IF EXISTS fyps_searchdocument_ai",
+    "DROP TABLE IF EXISTS fyps_searchdocument_fts",
+]
+POSTGRES_FORWARDS = [
+    """
+    ALTER TABLE fyps_searchdocument ADD COLUMN search_vector tsvector
+    GENERATED ALWAYS AS (
+        setweight(to_tsvector('english', coalesce(title, '')), 'A')
+        || setweight(to_tsvector('english', coalesce(body, '')), 'B')
+    ) STORED
+    """,
+    """
+    CREATE INDEX fyps_searchdocument_vector_idx
+    ON fyps_searchdocument USING GIN (search_vector)
+    """,
+]
+POSTGRES_BACKWARDS = [
+    "DROP INDEX IF EXISTS fyps_searchdocument_vector_idx",
+    "ALTER TABLE fyps_searchdocument DROP COLUMN IF EXISTS search_vector",
+]
+
+
+def _run(statements):
+    def run(apps, schema_editor):
+        for statement in statements.get(schema_editor.connection.vendor, []):
+            schema_editor.execute(statement)
+
+    return run
+
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('fyps', '0011_milestone_pending_due_idx'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='SearchDocument',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('kind', models.CharField(choices=[('proposal', 'Proposal'), ('project', 'Project'), ('document', 'Document'), ('feedback', 'Feedback')], max_length=20)),
+                ('object_id', models.BigIntegerField()),
+                ('title', models.CharField(blank=True, max_length=255)),
+                ('body', models.TextField(blank=True)),
+                ('project_id', models.BigIntegerField(blank=True, null=True)),
+                ('user_id', models.BigIntegerField(blank=True, null=True)),
+                ('supervisor_id', models.BigIntegerField(blank=True, null=True)),
+                ('updated_at', models.DateTimeField(auto_now=True)),
+            ],
+            options={
+                'unique_together': {('kind', 'object_id')},
+            },
+        ),
+        migrations.RunPython(
+            _run({"sqlite": SQLITE_FORWARDS, "postgresql": POSTGRES_FORWARDS}),
+            _run({"sqlite": SQLITE_BACKWARDS, "postgresql": POSTGRES_BACKWARDS}),
+        ),
+    ]
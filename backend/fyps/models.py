@@ -1,4 +1,7 @@
+import uuid
+
 from django.db import models
+from django.utils import timezone
 from users.models import User
 
 
@@ -25,6 +28,18 @@ class ProjectProposal(models.Model):
     feedback = models.TextField(blank=True)
     submitted_at = models.DateTimeField(auto_now_add=True)
 
+    class Meta:
+        indexes = [
+            models.Index(fields=["submitted_at", "id"], name="proposal_submitted_idx"),
+            models.Index(
+                fields=["student", "submitted_at", "id"], name="proposal_student_idx"
+            ),
+            models.Index(
+                fields=["supervisor", "submitted_at", "id"],
+                name="proposal_supervisor_idx",
+            ),
+        ]
+
     def __str__(self):
         return f"{self.title} ({self.student.email})"
 
@@ -47,6 +62,12 @@ class Project(models.Model):
     status = models.CharField(max_length=20, choices=STATUS_CHOICES, default="active")
     start_date = models.DateField(null=True, blank=True)
     end_date = models.DateField(null=True, blank=True)
+    updated_at = models.DateTimeField(auto_now=True)
+
+    class Meta:
+        indexes = [
+            models.Index(fields=["updated_at", "id"], name="project_updated_idx"),
+        ]
 
     def __str__(self):
         return self.title
@@ -66,6 +87,21 @@ class Milestone(models.Model):
     due_date = models.DateField()
     status = models.CharField(max_length=20, choices=STATUS_CHOICES, default="pending")
     completion_date = models.DateField(null=True, blank=True)
+    updated_at = models.DateTimeField(auto_now=True)
+
+    class Meta:
+        indexes = [
+            models.Index(fields=["due_date", "id"], name="milestone_due_idx"),
+            models.Index(fields=["updated_at", "id"], name="milestone_updated_idx"),
+            models.Index(
+                fields=["due_date"],
+                condition=models.Q(status="pending"),
+                name="milestone_pending_due_idx",
+            ),
+            models.Index(
+                fields=["project", "due_date", "id"], name="milestone_project_idx"
+            ),
+        ]
 
     def __str__(self):
         return f"{self.title} ({self.project.title})"
@@ -88,10 +124,175 @@ class Document(models.Model):
     uploaded_by = models.ForeignKey(User, on_delete=models.SET_NULL, null=True)
     uploaded_at = models.DateTimeField(auto_now_add=True)
     description = models.TextField(blank=True)
+    updated_at = models.DateTimeField(auto_now=True)
 
     class Meta:
         unique_together = ("project", "name", "version")
         ordering = ["-uploaded_at"]
+        indexes = [
+            models.Index(fields=["updated_at", "id"], name="document_updated_idx"),
+            models.Index(fields=["uploaded_at", "id"], name="document_uploaded_idx"),
+            models.Index(
+                fields=["project", "uploaded_at", "id"], name="document_project_idx"
+            ),
+        ]
 
     def __str__(self):
         return f"{self.name} v{self.version} ({self.project.title})"
+
+
+class AnalyticsCounter(models.Model):
+    """One persisted counter of the admin analytics snapshot.
+
+    ``key`` is ``"<breakdown>.<choice>"`` (e.g. ``"project_counts.active"``) or a
+    bare total such as ``"total_submissions"``. ``total`` carries a running sum
+    for counters that need one (the evaluation score average).
+    """
+
+    key = models.CharField(max_length=100, unique=True)
+    count = models.BigIntegerField(default=0)
+    total = models.FloatField(default=0)
+    rebuilt_at = models.DateTimeField()
+    updated_at = models.DateTimeField()
+
+    def __str__(self):
+        return f"{self.key}: {self.count}"
+
+
+class AnalyticsDailyCount(models.Model):
+    key = models.CharField(max_length=100)
+    date = models.DateField()
+    count = models.PositiveIntegerField(default=0)
+
+    class Meta:
+        unique_together = ("key", "date")
+        ordering = ["date"]
+
+    def __str__(self):
+        return f"{self.key} on {self.date}: {self.count}"
+
+
+class ChunkedUpload(models.Model):
+    """An in-progress resumable upload; its bytes live in CHUNKED_UPLOAD_DIR."""
+
+    id = models.UUIDField(primary_key=True, default=uuid.uuid4, editable=False)
+    user = models.ForeignKey(
+        User, on_delete=models.CASCADE, related_name="chunked_uploads"
+    )
+    target = models.CharField(max_length=50)
+    filename = models.CharField(max_length=255)
+    size = models.BigIntegerField()
+    offset = models.BigIntegerField(default=0)
+    created_at = models.DateTimeField(auto_now_add=True)
+    updated_at = models.DateTimeField(auto_now=True)
+
+    def __str__(self):
+        return f"{self.filename} ({self.offset}/{self.size})"
+
+
+class Blob(models.Model):
+    """A stored file body, addressed by the SHA-256 of its content.
+
+    ``refcount`` counts the FileField values naming this blob; blobs that drop
+    to zero are removed by the ``collect_blobs`` command.
+    """
+
+    sha256 = models.CharField(max_length=64, primary_key=True)
+    size = models.BigIntegerField()
+    refcount = models.PositiveIntegerField(default=0)
+    created_at = models.DateTimeField(auto_now_add=True)
+    last_used_at = models.DateTimeField(default=timezone.now)
+
+    class Meta:
+        indexes = [
+            models.Index(fields=["refcount", "last_used_at"], name="blob_unused_idx")
+        ]
+
+    def __str__(self):
+        return self.sha256
+
+
+class Tombstone(models.Model):
+    """Records a deleted row so ``/api/sync/`` clients can drop their copy.
+
+    ``project_id`` and ``user_id`` are captured at deletion time (the row they
+    came from is gone) and decide who is told about the deletion.
+    """
+
+    model = models.CharField(max_length=100)
+    object_id = models.BigIntegerField()
+    project_id = models.BigIntegerField(null=True, blank=True)
+    user_id = models.BigIntegerField(null=True, blank=True)
+    deleted_at = models.DateTimeField(auto_now_add=True)
+
+    class Meta:
+        indexes = [
+            models.Index(fields=["deleted_at", "id"], name="tombstone_deleted_idx"),
+        ]
+
+    def __str__(self):
+        return f"{self.model} #{self.object_id}"
+
+
+class SearchDocument(models.Model):
+    """One searchable row, mirrored from its source model by fyps.search.
+
+    The full-text index over ``title`` and ``body`` is not a Django field: an
+    FTS5 table kept in step by triggers on SQLite, a generated ``tsvector``
+    column with a GIN index on PostgreSQL (see migration 0012). The ``*_id``
+    columns copy the source's scoping so searches filter without joins.
+    """
+
+    KINDS = [
+        ("proposal", "Proposal"),
+        ("project", "Project"),
+        ("document", "Document"),
+        ("feedback", "Feedback"),
+    ]
+
+    kind = models.CharField(max_length=20, choices=KINDS)
+    object_id = models.BigIntegerField()
+    title = models.CharField(max_length=255, blank=True)
+    body = models.TextField(blank=True)
+    project_id = models.BigIntegerField(null=True, blank=True)
+    user_id = models.BigIntegerField(null=True, blank=True)
+    supervisor_id = models.BigIntegerField(null=True, blank=True)
+    updated_at = models.DateTimeField(auto_now=True)
+
+    class Meta:
+        unique_together = ("kind", "object_id")
+
+    def __str__(self):
+        return f"{self.kind} #{self.object_id}"
+
+
+class ProposalSignature(models.Model):
+    """MinHash signature of a proposal's text, for fyps.similarity.
+
+    ``signature`` holds the packed ``array("Q")`` of per-permutation minima;
+    the LSH buckets derived from it are the proposal's ``ProposalBand`` rows.
+    """
+
+    proposal = models.OneToOneField(
+        ProjectProposal,
+        on_delete=models.CASCADE,
+        primary_key=True,
+        related_name="signature",
+    )
+    signature = models.BinaryField()
+    indexed_at = models.DateTimeField(auto_now=True)
+
+    def __str__(self):
+        return f"Signature of proposal #{self.proposal_id}"
+
+
+class ProposalBand(models.Model):
+    """One LSH bucket a proposal falls into; shared buckets mark candidates."""
+
+    proposal = models.ForeignKey(
+        ProjectProposal, on_delete=models.CASCADE, related_name="bands"
+    )
+    bucket = models.BigIntegerField(db_index=True)
+
+    def __str__(self):
+        return f"{self.bucket} (proposal #{self.proposal_id})"
@@ -0,0 +1,138 @@
+import logging
+import threading
+
+from django.conf import settings
+from django.db import close_old_connections, transaction
+from django.utils import timezone
+from announcements.broadcast import BATCH_SIZE, create_notifications
+from announcements.models import Notification
+from core.caching import bump_versions
+from .analytics import bump_counter
+from .models import Milestone, Project
+
+logger = logging.getLogger(__name__)
+
+MAX_LISTED_TITLES = 3
+
+
+def _message(project_title, titles):
+    if len(titles) == 1:
+        return f'Milestone "{titles[0]}" on "{project_title}" is overdue.'
+    listed = ", ".join(titles[:MAX_LISTED_TITLES])
+    if len(titles) > MAX_LISTED_TITLES:
+        listed += f" and {len(titles) - MAX_LISTED_TITLES} more"
+    return f'{len(titles)} milestones on "{project_title}" are overdue: {listed}.'
+
+
+def _recipients(projects):
+    """Map project ids to ``{user id: email}`` of their active members."""
+    members = {}
+    students = Project.students.through.objects.filter(
+        project__in=projects, user__is_active=True
+    ).values_list("project_id", "user_id", "user__email")
+    supervisors = projects.filter(supervisor__is_active=True).values_list(
+        "id", "supervisor_id", "supervisor__email"
+    )
+    for rows in (students, supervisors):
+        for project_id, user_id, email in rows.iterator(chunk_size=BATCH_SIZE):
+            members.setdefault(project_id, {})[user_id] = email
+    return members
+
+
+def _notify(overdue):
+    """One warning per member of each project with newly overdue milestones."""
+    titles = {}
+    rows = overdue.order_by("project_id", "due_date", "id").values_list(
+        "project_id", "project__title", "title"
+    )
+    for project_id, project_title, title in rows.iterator(chunk_size=BATCH_SIZE):
+        titles.setdefault(project_id, (project_title, []))[1].append(title)
+
+    members = _recipients(Project.objects.filter(id__in=overdue.values("project_id")))
+    notifications, emails, created = [], {}, 0
+    for project_id, (project_title, project_titles) in titles.items():
+        message = _message(project_title, project_titles)
+        for user_id, email in members.get(project_id, {}).items():
+            notifications.append(
+                Notification(recipient_id=user_id, message=message, type="warning")
+            )
+            emails[user_id] = email
+            if len(notifications) == BATCH_SIZE:
+                created += create_notifications(notifications, emails)
+                notifications = []
+    if notifications:
+        created += create_notifications(notifications, emails)
+    return created
+
+
+@transaction.atomic
+def sweep_overdue_milestones(today=None, notify=True):
+    """Mark pending milestones due before ``today`` overdue; returns counts.
+
+    A single ``UPDATE`` over the ``milestone_pending_due_idx`` partial index
+    flips every row and stamps it with one ``updated_at``, which then picks
+    out exactly this sweep's rows for the notifications. ``update()`` sends no
+    signals, so the analytics counters and cache stamps are adjusted here.
+    """
+    today = today or timezone.localdate()
+    now = timezone.now()
+    updated = Milestone.objects.filter(status="pending", due_date__lt=today).update(
+        status="overdue", updated_at=now
+    )
+    notified = 0
+    if updated:
+        bump_counter("milestone_counts.pending", count=-updated)
+        bump_counter("milestone_counts.overdue", count=updated)
+        bump_versions(Milestone._meta.label_lower)
+        if notify:
+            notified = _notify(
+                Milestone.objects.filter(status="overdue", updated_at=now)
+            )
+    return updated, notified
+
+
+def run_overdue_sweeper(interval, stop=None):
+    """Sweep every ``interval`` seconds until ``stop`` (an Event) is set."""
+    stop = stop or threading.Event()
+    while not stop.wait(interval):
+        close_old_connections()
+        try:
+            updated, notified = sweep_overdue_milestones()
+            if updated:
+                logger.info(
+                    "Marked %d milestones overdue, sent %d notifications.",
+                    updated,
+                    notified,
+                )
+        except Exception:
+            logger.exception("Overdue milestone sweep failed.")
+        finally:
+            close_old_connections()
+
+
+def start_overdue_sweeper(interval):
+    """Run the sweeper on a daemon thread of the current process.
+
+    Meant for single-process deployments without a scheduler; sweeps from
+    several processes are safe, as each only updates rows still pending.
+    """
+    thread = threading.Thread(
+        target=run_overdue_sweeper,
+        args=(interval,),
+        name="overdue-milestone-sweeper",
+        daemon=True,
+    )
+    thread.start()
+    return thread
+
+
+def start_configured_sweeper():
+    """Start the sweeper when ``MILESTONE_SWEEP_INTERVAL`` is positive.
+
+    Called from the WSGI/ASGI entrypoints rather than ``AppConfig.ready`` so
+    that only serving processes sweep; ``migrate``, ``shell``, tests, other
+    commands and the runserver autoreloader parent never load them.
+    """
+    if settings.MILESTONE_SWEEP_INTERVAL > 0:
+        return start_overdue_sweeper(settings.MILESTONE_SWEEP_INTERVAL)
+    return None
@@ -0,0 +1,248 @@
+import re
+
+from django.db import connection
+from rest_framework import permissions
+from rest_framework.exceptions import ValidationError
+from rest_framework.response import Response
+from rest_framework.views import APIView
+from submissions.models import FeedbackMessage
+from .access import accessible_project_ids
+from .models import Document, Project, ProjectProposal, SearchDocument
+
+BATCH_SIZE = 1000
+MAX_TERMS = 8
+DEFAULT_LIMIT = 20
+MAX_LIMIT = 100
+HIGHLIGHT = "**"
+
+
+def _proposal(proposal):
+    return {
+        "title": proposal.title,
+        "body": proposal.description,
+        "user_id": proposal.student_id,
+        "supervisor_id": proposal.supervisor_id,
+    }
+
+
+def _project(project):
+    return {
+        "title": project.title,
+        "body": project.description,
+        "project_id": project.id,
+        "supervisor_id": project.supervisor_id,
+    }
+
+
+def _document(document):
+    return {
+        "title": document.name,
+        "body": document.description,
+        "project_id": document.project_id,
+    }
+
+
+def _feedback(message):
+    submission = message.thread.submission
+    return {
+        "title": submission.title,
+        "body": message.message,
+        "project_id": submission.project_id,
+        # Students only see feedback on their own submissions.
+        "user_id": submission.student_id,
+    }
+
+
+# Source model -> (kind, entry builder, queryset the rebuild reads).
+SOURCES = {
+    ProjectProposal: ("proposal", _proposal, ProjectProposal.objects.all()),
+    Project: ("project", _project, Project.objects.all()),
+    Document: ("document", _document, Document.objects.all()),
+    FeedbackMessage: (
+        "feedback",
+        _feedback,
+        FeedbackMessage.objects.select_related("thread__submission"),
+    ),
+}
+ENTRY_FIELDS = ["title", "body", "project_id", "user_id", "supervisor_id"]
+
+
+def index_objects(objects):
+    """Upsert the search rows of ``objects`` (all of one source model).
+
+    One ``INSERT ... ON CONFLICT DO UPDATE`` per batch; the full-text index
+    follows through the triggers or the generated column.
+    """
+    if not objects:
+        return
+    kind, build, _ = SOURCES[type(objects[0])]
+    SearchDocument.objects.bulk_create(
+        [
+            SearchDocument(
+                kind=kind,
+                object_id=obj.pk,
+                **{**dict.fromkeys(ENTRY_FIELDS), **build(obj)},
+            )
+            for obj in objects
+        ],
+        batch_size=BATCH_SIZE,
+        update_conflicts=True,
+        unique_fields=["kind", "object_id"],
+        update_fields=[*ENTRY_FIELDS, "updated_at"],
+    )
+
+
+def unindex_object(model, object_id):
+    SearchDocument.objects.filter(kind=SOURCES[model][0], object_id=object_id).delete()
+
+
+def rebuild_index():
+    """Reindex every source row and drop entries whose source is gone."""
+    indexed = 0
+    for model, (kind, _, queryset) in SOURCES.items():
+        batch = []
+        for obj in queryset.order_by("pk").iterator(chunk_size=BATCH_SIZE):
+            batch.append(obj)
+            if len(batch) == BATCH_SIZE:
+                index_objects(batch)
+                indexed += len(batch)
+                batch = []
+        index_objects(batch)
+        indexed += len(batch)
+        SearchDocument.objects.filter(kind=kind).exclude(
+            object_id__in=model.objects.values("pk")
+        ).delete()
+    return indexed
+
+
+def _terms(query):
+    terms = re.findall(r"\w+", query.lower())[:MAX_TERMS]
+    if not terms:
+        raise ValidationError({"q": ["Enter at least one word to search for."]})
+    return terms
+
+
+def _scope(user):
+    """SQL restricting ``d`` to the rows ``user``'s list endpoints show."""
+    if user.role not in ("student", "supervisor"):
+        return "", []
+    project_ids = sorted(accessible_project_ids(user))
+    in_projects = "d.project_id IN (%s)" % ", ".join(["%s"] * len(project_ids))
+    if user.role == "student":
+        if not project_ids:
+            return "AND d.user_id = %s", [user.pk]
+        return (
+            f"AND (d.user_id = %s OR (d.user_id IS NULL AND {in_projects}))",
+            [user.pk, *project_ids],
+        )
+    if not project_ids:
+        return "AND d.supervisor_id = %s", [user.pk]
+    return f"AND (d.supervisor_id = %s OR {in_projects})", [user.pk, *project_ids]
+
+
+def _sqlite_search(terms, where, params, limit, offset):
+    match = " ".join(f'"{term}"' for term in terms[:-1])
+    match += f' "{terms[-1]}"*'
+    sql = f"""
+        SELECT d.kind, d.object_id, d.project_id, d.title,
+               snippet(fyps_searchdocument_fts, 1, %s, %s, '…', 16),
+               bm25(fyps_searchdocument_fts, 4.0, 1.0) AS score
+        FROM fyps_searchdocument_fts
+        JOIN fyps_searchdocument d ON d.id = fyps_searchdocument_fts.rowid
+        WHERE fyps_searchdocument_fts MATCH %s {where}
+        ORDER BY score
+        LIMIT %s OFFSET %s
+    """
+    with connection.cursor() as cursor:
+        cursor.execute(sql, [HIGHLIGHT, HIGHLIGHT, match, *params, limit, offset])
+        # bm25 is lower-is-better; flip it so scores grow with relevance.
+        return [(*row[:5], -row[5]) for row in cursor.fetchall()]
+
+
+def _postgres_search(terms, where, params, limit, offset):
+    query = " & ".join([*terms[:-1], f"{terms[-1]}:*"])
+    # Headlines are costly, so only the page of ranked rows gets them.
+    sql = f"""
+        SELECT kind, object_id, project_id, title,
+               ts_headline('english', body, to_tsquery('english', %s),
+                           'StartSel=' || %s || ', StopSel=' || %s
+                           || ', MaxWords=30, MinWords=10'),
+               rank
+        FROM (
+            SELECT d.kind, d.object_id, d.project_id, d.title, d.body,
+                   ts_rank_cd(d.search_vector, q) AS rank
+            FROM fyps_searchdocument d, to_tsquery('english', %s) q
+            WHERE d.search_vector @@ q {where}
+            ORDER BY rank DESC
+            LIMIT %s OFFSET %s
+        ) ranked
+        ORDER BY rank DESC
+    """
+    with connection.cursor() as cursor:
+        cursor.execute(
+            sql, [query, HIGHLIGHT, HIGHLIGHT, query, *params, limit, offset]
+        )
+        return cursor.fetchall()
+
+
+def search(user, query, kinds=None, limit=DEFAULT_LIMIT, offset=0):
+    """Rank the search rows ``user`` may see against ``query``.
+
+    Every word must match; the last one also matches as a prefix, so results
+    appear while typing. Titles weigh more than bodies.
+    """
+    terms = _terms(query)
+    where, params = _scope(user)
+    if kinds:
+        where += " AND d.kind IN (%s)" % ", ".join(["%s"] * len(kinds))
+        params += list(kinds)
+    if connection.vendor == "postgresql":
+        rows = _postgres_search(terms, where, params, limit, offset)
+    else:
+        rows = _sqlite_search(terms, where, params, limit, offset)
+    return [
+        {
+            "kind": kind,
+            "id": object_id,
+            "project": project_id,
+            "title": title,
+            "snippet": snippet,
+            "score": round(score, 4),
+        }
+        for kind, object_id, project_id, title, snippet, score in rows
+    ]
+
+
+def _int_param(request, name, default, maximum=None):
+    try:
+        value = int(request.query_params.get(name, default))
+    except ValueError:
+        raise ValidationError({name: ["A whole number is required."]})
+    if value < 0:
+        raise ValidationError({name: ["Must not be negative."]})
+    return min(value, maximum) if maximum else value
+
+
+class SearchView(APIView):
+    """Full-text search over proposals, projects, documents and feedback.
+
+    ``?q=`` is required; ``kind`` narrows to a comma-separated list of
+    ``proposal``, ``project``, ``document`` and ``feedback``; ``limit`` and
+    ``offset`` page through the ranked results. Matched words are wrapped in
+    ``**`` in the snippets.
+    """
+
+    permission_classes = [permissions.IsAuthenticated]
+
+    def get(self, request):
+        kinds = request.query_params.get("kind", "")
+        kinds = [kind for kind in kinds.split(",") if kind]
+        valid = {kind for kind, _ in SearchDocument.KINDS}
+        if not set(kinds) <= valid:
+            choices = ", ".join(sorted(valid))
+            raise ValidationError({"kind": [f"Choose from {choices}."]})
+        limit = _int_param(request, "limit", DEFAULT_LIMIT, MAX_LIMIT)
+        offset = _int_param(request, "offset", 0)
+        query = request.query_params.get("q", "")
+        results = search(request.user, query, kinds, limit or DEFAULT_LIMIT, offset)
+        return Response({"query": query, "results": results})
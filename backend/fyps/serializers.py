@@ -1,5 +1,6 @@
 from rest_framework import serializers
 from .models import ProjectProposal, Project, Milestone, Document
+from .storage import blob_sha256, content_sha256
 
 
 class ProjectProposalSerializer(serializers.ModelSerializer):
@@ -67,3 +68,23 @@ class DocumentSerializer(serializers.ModelSerializer):
             "description",
         ]
         read_only_fields = ["uploaded_by", "uploaded_by_email", "uploaded_at"]
+
+    def validate(self, attrs):
+        # Compare content hashes with the latest version of the same document;
+        # the stored name encodes the hash, so no bytes are re-read.
+        file = attrs.get("file")
+        project = attrs.get("project", getattr(self.instance, "project", None))
+        name = attrs.get("name", getattr(self.instance, "name", None))
+        if file is not None and project is not None:
+            latest = (
+                Document.objects.filter(project=project, name=name)
+                .exclude(pk=getattr(self.instance, "pk", None))
+                .order_by("-version")
+                .values_list("version", "file")
+                .first()
+            )
+            if latest and blob_sha256(latest[1]) == content_sha256(file):
+                raise serializers.ValidationError(
+                    {"file": [f"Identical to version {latest[0]}."]}
+                )
+        return attrs
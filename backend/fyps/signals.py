@@ -0,0 +1,249 @@
+from django.db.models.signals import (
+    m2m_changed,
+    post_delete,
+    post_init,
+    post_save,
+    pre_delete,
+)
+from django.db import transaction
+from django.utils import timezone
+from announcements.models import Notification
+from core.caching import bump_versions, track_versions
+from evaluations.models import Evaluation
+from submissions.models import FeedbackMessage, FeedbackThread, Submission
+from .access import forget_project_access
+from .analytics import TRACKED, HISTORY, counter_entry, bump_counter, bump_daily
+from .models import Document, Milestone, Project, ProjectProposal, Tombstone
+from .search import SOURCES, index_objects, unindex_object
+from .similarity import unindex_proposal
+from .storage import blob_fields, blob_sha256
+
+_MISSING = object()
+HISTORY_FIELDS = {model: (key, field) for key, model, field in HISTORY}
+
+
+def _after_commit(function, *args, **kwargs):
+    # Counter deltas apply once the row change commits: a long transaction
+    # does not hold the shared counter rows locked, and a rolled-back save
+    # never touches them. In autocommit mode they apply at once.
+    transaction.on_commit(lambda: function(*args, **kwargs))
+
+
+def _tracked_value(instance):
+    _, field, _ = TRACKED[type(instance)]
+    if field is None:
+        return None
+    # Read from __dict__ so a deferred field never triggers a query.
+    return instance.__dict__.get(field, _MISSING)
+
+
+def remember_analytics_value(sender, instance, **kwargs):
+    instance._analytics_value = _tracked_value(instance)
+
+
+def update_analytics_on_save(sender, instance, created, update_fields=None, **kwargs):
+    value = _tracked_value(instance)
+    if created:
+        key, total = counter_entry(sender, value)
+        _after_commit(bump_counter, key, count=1, total=total)
+        if sender in HISTORY_FIELDS:
+            key, field = HISTORY_FIELDS[sender]
+            _after_commit(bump_daily, key, timezone.localdate(getattr(instance, field)))
+    else:
+        _, field, _ = TRACKED[sender]
+        previous = getattr(instance, "_analytics_value", _MISSING)
+        if (
+            field is not None
+            and previous is not _MISSING
+            and previous != value
+            and (update_fields is None or field in update_fields)
+        ):
+            old_key, old_total = counter_entry(sender, previous)
+            new_key, new_total = counter_entry(sender, value)
+            if old_key == new_key:
+                _after_commit(bump_counter, new_key, total=new_total - old_total)
+            else:
+                _after_commit(bump_counter, old_key, count=-1, total=-old_total)
+                _after_commit(bump_counter, new_key, count=1, total=new_total)
+    instance._analytics_value = value
+
+
+def update_analytics_on_delete(sender, instance, **kwargs):
+    value = getattr(instance, "_analytics_value", _MISSING)
+    if value is _MISSING:
+        value = _tracked_value(instance)
+    if value is not _MISSING:
+        key, total = counter_entry(sender, value)
+        _after_commit(bump_counter, key, count=-1, total=-total)
+
+
+for model in TRACKED:
+    post_init.connect(remember_analytics_value, sender=model)
+    post_save.connect(update_analytics_on_save, sender=model)
+    post_delete.connect(update_analytics_on_delete, sender=model)
+
+
+def release_blobs(sender, instance, **kwargs):
+    for field in BLOB_FIELDS[sender]:
+        file = getattr(instance, field)
+        if file.name:
+            file.storage.delete(file.name)
+
+
+def _stored_names(sender, instance):
+    # Deferred fields are absent from __dict__ and left out.
+    names = {}
+    for field in BLOB_FIELDS[sender]:
+        if field in instance.__dict__:
+            value = instance.__dict__[field]
+            names[field] = getattr(value, "name", value) or ""
+    return names
+
+
+def remember_blobs(sender, instance, **kwargs):
+    instance._blob_names = _stored_names(sender, instance)
+
+
+def release_replaced_blobs(sender, instance, **kwargs):
+    # Saving a new file took a reference on its blob; release the old one's.
+    previous = getattr(instance, "_blob_names", {})
+    current = _stored_names(sender, instance)
+    for field, name in current.items():
+        old = previous.get(field)
+        if old and old != name and blob_sha256(old):
+            getattr(instance, field).storage.delete(old)
+    instance._blob_names = {**previous, **current}
+
+
+BLOB_FIELDS = {}
+for model, field in blob_fields():
+    BLOB_FIELDS.setdefault(model, []).append(field)
+for model in BLOB_FIELDS:
+    post_init.connect(remember_blobs, sender=model)
+    post_save.connect(release_replaced_blobs, sender=model)
+    post_delete.connect(release_blobs, sender=model)
+
+
+def remember_project_supervisor(sender, instance, **kwargs):
+    instance._access_supervisor_id = instance.__dict__.get("supervisor_id")
+
+
+def forget_supervisor_access(sender, instance, created, **kwargs):
+    previous = getattr(instance, "_access_supervisor_id", None)
+    if created or instance.supervisor_id != previous:
+        forget_project_access([previous, instance.supervisor_id])
+    instance._access_supervisor_id = instance.supervisor_id
+
+
+def remember_project_students(sender, instance, **kwargs):
+    # Cascade deletes of membership rows send no m2m_changed.
+    instance._access_student_ids = list(
+        instance.students.values_list("id", flat=True)
+    )
+
+
+def forget_deleted_project_access(sender, instance, **kwargs):
+    student_ids = getattr(instance, "_access_student_ids", [])
+    forget_project_access([instance.supervisor_id, *student_ids])
+
+
+def forget_member_access(sender, instance, action, reverse, pk_set, **kwargs):
+    if action.startswith("post_"):
+        bump_versions(Project._meta.label_lower)
+    if action == "pre_clear" and not reverse:
+        instance._access_student_ids = list(
+            instance.students.values_list("id", flat=True)
+        )
+    elif action == "post_clear" and not reverse:
+        forget_project_access(getattr(instance, "_access_student_ids", []))
+    elif action in ("post_add", "post_remove", "post_clear"):
+        # Reverse side (user.assigned_projects_as_student): one user changed.
+        forget_project_access([instance.pk] if reverse else pk_set or [])
+
+
+post_init.connect(remember_project_supervisor, sender=Project)
+post_save.connect(forget_supervisor_access, sender=Project)
+pre_delete.connect(remember_project_students, sender=Project)
+post_delete.connect(forget_deleted_project_access, sender=Project)
+m2m_changed.connect(forget_member_access, sender=Project.students.through)
+
+for model in (Project, ProjectProposal, Milestone, Document):
+    track_versions(model)
+
+
+# (project id attribute, user id attribute) recorded on each synced model's
+# tombstone; see fyps.sync for who is shown which.
+TOMBSTONE_SCOPES = {
+    Project: ("id", None),
+    Milestone: ("project_id", None),
+    Document: ("project_id", None),
+    Submission: ("project_id", "student_id"),
+    Evaluation: ("project_id", "evaluator_id"),
+    Notification: (None, "recipient_id"),
+}
+
+
+def record_tombstone(sender, instance, **kwargs):
+    project_field, user_field = TOMBSTONE_SCOPES[sender]
+    Tombstone.objects.create(
+        model=sender._meta.label_lower,
+        object_id=instance.pk,
+        project_id=getattr(instance, project_field) if project_field else None,
+        user_id=getattr(instance, user_field) if user_field else None,
+    )
+
+
+def record_feedback_message_tombstone(sender, instance, **kwargs):
+    # Cascades delete messages before their thread and submission, so the
+    # submission is still there to scope the tombstone by.
+    scope = (
+        FeedbackThread.objects.filter(pk=instance.thread_id)
+        .values_list("submission__project_id", "submission__student_id")
+        .first()
+    )
+    project_id, user_id = scope or (None, None)
+    Tombstone.objects.create(
+        model=sender._meta.label_lower,
+        object_id=instance.pk,
+        project_id=project_id,
+        user_id=user_id,
+    )
+
+
+for model in TOMBSTONE_SCOPES:
+    post_delete.connect(record_tombstone, sender=model)
+post_delete.connect(record_feedback_message_tombstone, sender=FeedbackMessage)
+
+
+def index_for_search(sender, instance, **kwargs):
+    index_objects([instance])
+
+
+def unindex_for_search(sender, instance, **kwargs):
+    unindex_object(sender, instance.pk)
+
+
+for model in SOURCES:
+    post_save.connect(index_for_search, sender=model)
+    post_delete.connect(unindex_for_search, sender=model)
+
+
+def _similarity_text(proposal):
+    fields = ("title", "description", "document")
+    return tuple(proposal.__dict__.get(field) for field in fields)
+
+
+def remember_similarity_text(sender, instance, **kwargs):
+    instance._similarity_text = _similarity_text(instance)
+
+
+def index_similarity(sender, instance, created, **kwargs):
+    # New text queues the proposal for the index_proposals worker; status
+    # changes and reviews leave the signature as it is.
+    if not created and instance._similarity_text != _similarity_text(instance):
+        unindex_proposal(instance.pk)
+    instance._similarity_text = _similarity_text(instance)
+
+
+post_init.connect(remember_similarity_text, sender=ProjectProposal)
+post_save.connect(index_similarity, sender=ProjectProposal)
@@ -0,0 +1,263 @@
+import array
+import contextlib
+import hashlib
+import heapq
+import os
+import random
+import re
+from concurrent.futures import ProcessPoolExecutor
+
+from django.db import transaction
+from django.db.models import Count
+from .models import ProjectProposal, ProposalBand, ProposalSignature
+
+NUM_PERMUTATIONS = 128
+BANDS = 32  # of NUM_PERMUTATIONS // BANDS rows: ~0.42 Jaccard to become likely
+ROWS = NUM_PERMUTATIONS // BANDS
+MAX_CANDIDATES = 200
+MAX_DOCUMENT_CHARS = 200_000
+# Signatures are built from the smallest shingle hashes only: a consistent
+# sample (the same shingles are kept in every document containing them) that
+# bounds MinHash to NUM_PERMUTATIONS * MAX_SHINGLES modular products.
+MAX_SHINGLES = 2000
+MAX_PDF_PAGES = 50
+BATCH_SIZE = 200
+
+_PRIME = (1 << 61) - 1
+_random = random.Random(20240601)  # fixed: signatures must match across runs
+_PERMUTATIONS = [
+    (_random.randrange(1, _PRIME), _random.randrange(0, _PRIME))
+    for _ in range(NUM_PERMUTATIONS)
+]
+STOPWORDS = frozenset(
+    """a an and are as at be by for from has have in into is it its of on or
+    our that the their this to using was we will with which""".split()
+)
+
+
+def _hash64(data):
+    return int.from_bytes(hashlib.blake2b(data, digest_size=8).digest(), "little")
+
+
+def shingles(text):
+    """Hashed word unigrams and bigrams of ``text``, minus stopwords.
+
+    Long texts keep only their ``MAX_SHINGLES`` smallest hashes.
+    """
+    words = [
+        word
+        for word in re.findall(r"\w+", text.lower())
+        if word not in STOPWORDS and len(word) > 1
+    ]
+    grams = set(words)
+    grams.update(f"{first} {second}" for first, second in zip(words, words[1:]))
+    hashes = {_hash64(gram.encode()) for gram in grams}
+    if len(hashes) > MAX_SHINGLES:
+        hashes = set(heapq.nsmallest(MAX_SHINGLES, hashes))
+    return hashes
+
+
+def minhash(hashes):
+    """The MinHash signature of a set of 64-bit hashes as ``array("Q")``.
+
+    Each permutation is the universal hash ``(a * x + b) mod (2**61 - 1)``;
+    an empty set gets all-maximum minima, which match nothing else.
+    """
+    if not hashes:
+        return array.array("Q", [_PRIME] * NUM_PERMUTATIONS)
+    return array.array(
+        "Q", [min((a * x + b) % _PRIME for x in hashes) for a, b in _PERMUTATIONS]
+    )
+
+
+def buckets(signature):
+    """LSH bucket ids, one per band; the band number is part of the hash."""
+    return [
+        _hash64(bytes([band]) + signature[band * ROWS : (band + 1) * ROWS].tobytes())
+        >> 1  # fit a signed BIGINT
+        for band in range(BANDS)
+    ]
+
+
+def similarity(first, second):
+    """Estimated Jaccard similarity: the share of equal minima."""
+    return sum(a == b for a, b in zip(first, second)) / NUM_PERMUTATIONS
+
+
+def extract_text(file):
+    """Best-effort plain text of an uploaded document; "" when not extractable.
+
+    PDFs need the optional ``pypdf`` package; other formats than PDF and plain
+    text are skipped.
+    """
+    if not file or not file.name:
+        return ""
+    extension = os.path.splitext(file.name)[1].lower()
+    try:
+        if extension in (".txt", ".md", ".tex"):
+            with file.open("rb") as handle:
+                return handle.read(MAX_DOCUMENT_CHARS).decode("utf-8", "ignore")
+        if extension == ".pdf":
+            try:
+                from pypdf import PdfReader
+            except ImportError:
+                return ""
+            with file.open("rb") as handle:
+                pages = PdfReader(handle).pages[:MAX_PDF_PAGES]
+                text = "\n".join(page.extract_text() or "" for page in pages)
+            return text[:MAX_DOCUMENT_CHARS]
+    except Exception:
+        # Corrupt or missing files must not block indexing the proposal.
+        return ""
+    return ""
+
+
+def proposal_signature(title, description, document):
+    text = "\n".join([title, description, extract_text(document)])
+    return minhash(shingles(text))
+
+
+TEXT_FIELDS = ("title", "description", "document")
+
+
+def _signature_for_row(row):
+    # Process-pool worker: rebuild the model instance's file from its name.
+    proposal_id, title, description, document = row
+    file = ProjectProposal(document=document).document
+    signature = proposal_signature(title, description, file).tobytes()
+    return proposal_id, signature, (title, description, document)
+
+
+def save_signatures(signatures, texts=None):
+    """Store ``{proposal id: signature bytes}`` and replace their buckets.
+
+    With ``texts`` (``{proposal id: (title, description, document)}`` the
+    signatures were computed from), proposals whose text has changed since
+    are skipped and stay pending; their rows are locked while checking, so a
+    concurrent edit commits either before the check or after the write.
+    Returns how many were stored.
+    """
+    with transaction.atomic():
+        if texts is not None:
+            current = (
+                ProjectProposal.objects.select_for_update()
+                .filter(pk__in=list(signatures))
+                .values_list("pk", *TEXT_FIELDS)
+            )
+            unchanged = {pk for pk, *text in current if tuple(text) == texts[pk]}
+            signatures = {
+                pk: signature
+                for pk, signature in signatures.items()
+                if pk in unchanged
+            }
+        ProposalSignature.objects.bulk_create(
+            [
+                ProposalSignature(proposal_id=proposal_id, signature=signature)
+                for proposal_id, signature in signatures.items()
+            ],
+            update_conflicts=True,
+            unique_fields=["proposal"],
+            update_fields=["signature", "indexed_at"],
+        )
+        ProposalBand.objects.filter(proposal_id__in=list(signatures)).delete()
+        ProposalBand.objects.bulk_create(
+            [
+                ProposalBand(proposal_id=proposal_id, bucket=bucket)
+                for proposal_id, signature in signatures.items()
+                for bucket in buckets(array.array("Q", signature))
+            ],
+            batch_size=1000,
+        )
+    return len(signatures)
+
+
+def index_proposal(proposal):
+    signature = proposal_signature(
+        proposal.title, proposal.description, proposal.document
+    )
+    save_signatures({proposal.pk: signature.tobytes()})
+    return signature
+
+
+def unindex_proposal(proposal_id):
+    """Drop a proposal's signature, queueing it for ``index_proposals``.
+
+    Extraction and MinHashing are too slow for a request; saves that change
+    a proposal's text only mark it pending and the worker re-indexes it.
+    """
+    ProposalSignature.objects.filter(proposal_id=proposal_id).delete()
+    ProposalBand.objects.filter(proposal_id=proposal_id).delete()
+
+
+def _init_worker():
+    import django
+
+    django.setup()
+
+
+def reindex_proposals(workers=None, batch_size=BATCH_SIZE, pending_only=False):
+    """Recompute proposal signatures across a process pool.
+
+    Text extraction and MinHashing are CPU-bound, so each proposal is handled
+    by a worker process; the parent only reads rows and writes batches.
+    ``pending_only`` limits it to proposals without a signature, i.e. new or
+    edited since they were last indexed. Returns the number indexed.
+    """
+    workers = workers or os.cpu_count() or 1
+    proposals = ProjectProposal.objects.order_by("pk")
+    if pending_only:
+        proposals = proposals.filter(signature__isnull=True)
+    rows = proposals.values_list("pk", *TEXT_FIELDS).iterator(chunk_size=batch_size)
+    indexed = 0
+    pending, texts = {}, {}
+
+    def flush():
+        nonlocal indexed
+        if pending:
+            indexed += save_signatures(pending, texts)
+        pending.clear()
+        texts.clear()
+
+    with contextlib.ExitStack() as stack:
+        if workers == 1:
+            results = map(_signature_for_row, rows)
+        else:
+            pool = stack.enter_context(
+                ProcessPoolExecutor(max_workers=workers, initializer=_init_worker)
+            )
+            results = pool.map(_signature_for_row, rows, chunksize=16)
+        for proposal_id, signature, text in results:
+            pending[proposal_id], texts[proposal_id] = signature, text
+            if len(pending) == batch_size:
+                flush()
+    flush()
+    return indexed
+
+
+def similar_proposals(proposal, k=5):
+    """The ``k`` proposals most similar to ``proposal`` with their scores.
+
+    Only proposals sharing at least one LSH bucket are compared, so the cost
+    follows the number of near matches rather than the archive size. Returns
+    None while ``proposal`` is waiting to be indexed.
+    """
+    stored = ProposalSignature.objects.filter(proposal=proposal).first()
+    if stored is None:
+        return None
+    signature = array.array("Q", bytes(stored.signature))
+    candidates = (
+        ProposalBand.objects.filter(bucket__in=buckets(signature))
+        .exclude(proposal=proposal)
+        .values("proposal_id")
+        .annotate(shared=Count("pk"))
+        .order_by("-shared", "proposal_id")
+        .values_list("proposal_id", flat=True)[:MAX_CANDIDATES]
+    )
+    scored = [
+        (similarity(signature, array.array("Q", bytes(other))), proposal_id)
+        for proposal_id, other in ProposalSignature.objects.filter(
+            proposal_id__in=list(candidates)
+        ).values_list("proposal_id", "signature")
+    ]
+    scored.sort(key=lambda item: (-item[0], item[1]))
+    return scored[:k]
@@ -0,0 +1,208 @@
+import datetime
+import hashlib
+import os
+import re
+import tempfile
+from collections import Counter
+
+from django.apps import apps
+from django.core.files.move import file_move_safe
+from django.core.files.storage import FileSystemStorage, default_storage
+from django.db import IntegrityError, models, transaction
+from django.db.models import Count, F
+from django.utils import timezone
+
+BLOB_PREFIX = "blobs/"
+BLOB_NAME = re.compile(r"^blobs/[0-9a-f]{2}/([0-9a-f]{64})")
+MAX_EXTENSION = 16
+
+
+def content_sha256(content):
+    """Return the SHA-256 of an uploaded file, hashing it at most once.
+
+    The digest is cached on the file object, so validation and the storage
+    backend share a single read; chunked uploads arrive with it precomputed.
+    """
+    digest = getattr(content, "sha256", None)
+    if digest is None:
+        hasher = hashlib.sha256()
+        for chunk in content.chunks():
+            hasher.update(chunk)
+        digest = content.sha256 = hasher.hexdigest()
+    return digest
+
+
+def blob_sha256(name):
+    """The content hash encoded in a blob name, or None for a legacy path."""
+    match = BLOB_NAME.match(name or "")
+    return match.group(1) if match else None
+
+
+def blob_name(sha256, filename):
+    extension = os.path.splitext(filename)[1].lower()
+    if len(extension) > MAX_EXTENSION:
+        extension = ""
+    return f"{BLOB_PREFIX}{sha256[:2]}/{sha256}{extension}"
+
+
+def blob_fields():
+    """Every ``(model, field name)`` whose FileField stores blobs."""
+    return [
+        (model, field.name)
+        for model in apps.get_models()
+        for field in model._meta.get_fields()
+        if isinstance(field, models.FileField)
+        and isinstance(field.storage, ContentAddressedStorage)
+    ]
+
+
+class ContentAddressedStorage(FileSystemStorage):
+    """Store each distinct file body once, named by its SHA-256.
+
+    The ``upload_to`` directory and original filename are dropped; only the
+    extension is kept so served files retain their content type. Saving
+    content that is already stored writes nothing and bumps the blob's
+    refcount. ``delete`` only releases a reference: the bytes are removed by
+    the ``collect_blobs`` command once nothing points at them.
+    """
+
+    def save(self, name, content, max_length=None):
+        from .models import Blob
+
+        if name is None:
+            name = content.name
+        sha256 = content_sha256(content)
+        name = blob_name(sha256, name)
+        now = timezone.now()
+        with transaction.atomic():
+            blob = Blob.objects.select_for_update().filter(sha256=sha256).first()
+            if blob is None:
+                self._write(name, content)
+                try:
+                    with transaction.atomic():
+                        Blob.objects.create(
+                            sha256=sha256, size=content.size, refcount=1
+                        )
+                    return name
+                except IntegrityError:
+                    # Another upload of the same content won the insert.
+                    pass
+            elif not self.exists(name):
+                self._link_or_write(name, sha256, content)
+            Blob.objects.filter(sha256=sha256).update(
+                refcount=F("refcount") + 1, last_used_at=now
+            )
+        return name
+
+    def _write(self, name, content):
+        path = self.path(name)
+        directory = os.path.dirname(path)
+        os.makedirs(directory, exist_ok=True)
+        if hasattr(content, "temporary_file_path"):
+            file_move_safe(content.temporary_file_path(), path, allow_overwrite=True)
+        else:
+            # Write beside the target and rename, so a concurrent writer of the
+            # same content never observes a partial file.
+            fd, temporary = tempfile.mkstemp(dir=directory)
+            with os.fdopen(fd, "wb") as output:
+                for chunk in content.chunks():
+                    output.write(chunk)
+            os.replace(temporary, path)
+        if self.file_permissions_mode is not None:
+            os.chmod(path, self.file_permissions_mode)
+
+    def blob_files(self, sha256):
+        """Names under which the blob is stored, one per file extension."""
+        directory = f"{BLOB_PREFIX}{sha256[:2]}"
+        if not self.exists(directory):
+            return []
+        return [
+            f"{directory}/{filename}"
+            for filename in self.listdir(directory)[1]
+            if filename.startswith(sha256)
+        ]
+
+    def _link_or_write(self, name, sha256, content):
+        # The same bytes uploaded with another extension: link, don't copy.
+        for existing in self.blob_files(sha256):
+            try:
+                os.link(self.path(existing), self.path(name))
+                return
+            except OSError:
+                break
+        self._write(name, content)
+
+    def delete(self, name):
+        from .models import Blob
+
+        sha256 = blob_sha256(name)
+        if sha256 is None:
+            return super().delete(name)
+        Blob.objects.filter(sha256=sha256, refcount__gt=0).update(
+            refcount=F("refcount") - 1
+        )
+
+    def purge(self, sha256):
+        """Remove the stored bytes; only ``collect_blobs`` should call this."""
+        for name in self.blob_files(sha256):
+            super().delete(name)
+
+
+def count_references():
+    """Map each referenced blob's hash to the number of values naming it."""
+    references = Counter()
+    for model, field in blob_fields():
+        rows = (
+            model.objects.filter(**{f"{field}__startswith": BLOB_PREFIX})
+            .values_list(field)
+            .annotate(count=Count("pk"))
+            .order_by()
+        )
+        for name, count in rows:
+            references[blob_sha256(name)] += count
+    return references
+
+
+def recount_blobs():
+    """Reset every refcount from the actual references; returns rows fixed.
+
+    Refcounts drift when a save fails after the blob was stored or rows are
+    changed by raw bulk writes; this brings them back in line.
+    """
+    from .models import Blob
+
+    references = count_references()
+    stale = []
+    for blob in Blob.objects.only("sha256", "refcount").iterator(chunk_size=2000):
+        actual = references.get(blob.sha256, 0)
+        if blob.refcount != actual:
+            blob.refcount = actual
+            stale.append(blob)
+    Blob.objects.bulk_update(stale, ["refcount"], batch_size=500)
+    return len(stale)
+
+
+def collect_blobs(grace=datetime.timedelta(hours=24), dry_run=False):
+    """Delete blobs nothing has referenced for ``grace``; returns (count, bytes).
+
+    The grace period covers uploads whose row is not committed yet.
+    """
+    from .models import Blob
+
+    storage = default_storage
+    cutoff = timezone.now() - grace
+    with transaction.atomic():
+        unused = list(
+            Blob.objects.select_for_update()
+            .filter(refcount=0, last_used_at__lt=cutoff)
+            .values_list("sha256", "size")
+        )
+        if not dry_run:
+            for sha256, _ in unused:
+                storage.purge(sha256)
+            hashes = [sha256 for sha256, _ in unused]
+            for start in range(0, len(hashes), 500):
+                Blob.objects.filter(
+                    sha256__in=hashes[start : start + 500], refcount=0
+                ).delete()
+    return len(unused), sum(size for _, size in unused)
@@ -0,0 +1,237 @@
+import datetime
+import hashlib
+
+from django.conf import settings
+from django.db.models import Q
+from django.utils import timezone
+from rest_framework import permissions
+from rest_framework.exceptions import ValidationError
+from rest_framework.response import Response
+from rest_framework.views import APIView
+from announcements.views import NotificationViewSet
+from core.querysets import eager_load, list_queryset
+from evaluations.views import EvaluationViewSet
+from submissions.views import FeedbackMessageViewSet, SubmissionViewSet
+from .access import accessible_project_ids
+from .models import Tombstone
+from .views import DocumentViewSet, MilestoneViewSet, ProjectViewSet
+
+# Response key -> the viewset whose list endpoint scopes and serializes it.
+SYNCED = {
+    "projects": ProjectViewSet,
+    "milestones": MilestoneViewSet,
+    "documents": DocumentViewSet,
+    "submissions": SubmissionViewSet,
+    "feedback_messages": FeedbackMessageViewSet,
+    "evaluations": EvaluationViewSet,
+    "notifications": NotificationViewSet,
+}
+SYNCED_LABELS = {
+    viewset.queryset.model._meta.label_lower: key for key, viewset in SYNCED.items()
+}
+
+
+def _is_admin(user):
+    return user.role not in ("student", "supervisor")
+
+
+def scope_fingerprint(user):
+    """Identify the rows ``user`` can see, up to which projects they are on.
+
+    A token only yields a delta while this is unchanged: joining a project
+    makes its older rows visible, which no ``updated_at`` filter would find.
+    """
+    parts = [user.pk, user.role, user.is_superuser]
+    if not _is_admin(user):
+        parts += sorted(accessible_project_ids(user))
+    return hashlib.sha256(repr(parts).encode()).hexdigest()[:16]
+
+
+EPOCH = datetime.datetime(1970, 1, 1, tzinfo=datetime.timezone.utc)
+MICROSECOND = datetime.timedelta(microseconds=1)
+
+
+# Exact integer arithmetic: cursors compare updated_at for equality.
+def _micros(moment):
+    return (moment - EPOCH) // MICROSECOND
+
+
+def _moment(micros):
+    return EPOCH + int(micros) * MICROSECOND
+
+
+def make_token(moment, fingerprint):
+    return f"{_micros(moment)}-{fingerprint}"
+
+
+def parse_token(token):
+    """Return ``(moment, fingerprint)`` for a token from ``make_token``."""
+    try:
+        micros, fingerprint = token.split("-", 1)
+        moment = _moment(micros)
+    except (ValueError, OverflowError, OSError):
+        raise ValidationError({"since": ["Invalid sync token."]})
+    return moment, fingerprint
+
+
+def make_cursor(started, since, position, fingerprint):
+    """Encode where the next page of a sync that began at ``started`` resumes.
+
+    ``position`` is the ``(model index, updated_at, id)`` from
+    ``changes_since``; ``since`` and ``updated_at`` may be None.
+    """
+    index, updated_at, last_id = position
+    parts = [
+        _micros(started),
+        _micros(since) if since else "",
+        index,
+        _micros(updated_at) if updated_at else "",
+        last_id or "",
+        fingerprint,
+    ]
+    return "-".join(str(part) for part in parts)
+
+
+def parse_cursor(cursor):
+    """Return ``(started, since, position, fingerprint)`` for a cursor."""
+    try:
+        started, since, index, updated_at, last_id, fingerprint = cursor.split("-")
+        started = _moment(started)
+        since = _moment(since) if since else None
+        index = int(index)
+        if not 0 <= index < len(SYNCED):
+            raise ValueError(index)
+        if updated_at:
+            position = (index, _moment(updated_at), int(last_id))
+        else:
+            position = (index, None, None)
+    except (ValueError, OverflowError, OSError):
+        raise ValidationError({"cursor": ["Invalid sync cursor."]})
+    return started, since, position, fingerprint
+
+
+def deleted_since(user, since):
+    """Ids of synced rows ``user`` could see that were deleted after ``since``."""
+    deleted = {key: [] for key in SYNCED}
+    tombstones = Tombstone.objects.filter(deleted_at__gt=since)
+    if not _is_admin(user):
+        tombstones = tombstones.filter(
+            Q(user_id=user.pk) | Q(project_id__in=accessible_project_ids(user))
+        )
+    elif not user.is_superuser:
+        # Only superusers list every user's notifications.
+        tombstones = tombstones.exclude(
+            Q(model="announcements.notification") & ~Q(user_id=user.pk)
+        )
+    rows = tombstones.order_by("deleted_at", "id").values_list("model", "object_id")
+    for label, object_id in rows:
+        if label in SYNCED_LABELS:
+            deleted[SYNCED_LABELS[label]].append(object_id)
+    return deleted
+
+
+def changes_since(request, since=None, after=None, limit=None):
+    """One page of the rows of every synced model changed after ``since``.
+
+    ``since=None`` pages through everything the user can see. Each model is
+    scoped by its own list endpoint's ``get_queryset``, so a client's cache
+    never holds a row the API would not list for it. Rows come model by model
+    in ``(updated_at, id)`` order, at most ``limit`` (``SYNC_PAGE_SIZE``) per
+    page; ``after`` is the position the previous page returned.
+
+    Returns ``(changed, deleted, position)``, where ``position`` is None on
+    the last page. Deletions are listed on the first page only.
+    """
+    limit = limit or settings.SYNC_PAGE_SIZE
+    changed = {key: [] for key in SYNCED}
+    if since is not None and after is None:
+        deleted = deleted_since(request.user, since)
+    else:
+        deleted = {key: [] for key in SYNCED}
+
+    remaining = limit
+    first = after[0] if after else 0
+    for index, (key, viewset_class) in enumerate(SYNCED.items()):
+        if index < first:
+            continue
+        if not remaining:
+            return changed, deleted, (index, None, None)
+        view, queryset = list_queryset(viewset_class, request)
+        if since is not None:
+            queryset = queryset.filter(updated_at__gt=since)
+        if after and index == after[0] and after[1] is not None:
+            _, updated_at, last_id = after
+            queryset = queryset.filter(
+                Q(updated_at__gt=updated_at) | Q(updated_at=updated_at, id__gt=last_id)
+            )
+        serializer_class = view.get_serializer_class()
+        queryset = eager_load(queryset.order_by("updated_at", "id"), serializer_class)
+        rows = list(queryset[: remaining + 1])
+        more = len(rows) > remaining
+        rows = rows[:remaining]
+        changed[key] = serializer_class(
+            rows, many=True, context=view.get_serializer_context()
+        ).data
+        if more:
+            return changed, deleted, (index, rows[-1].updated_at, rows[-1].pk)
+        remaining -= len(rows)
+    return changed, deleted, None
+
+
+class SyncView(APIView):
+    """Return what changed for the current user since a previous sync.
+
+    Clients keep a local copy of every synced collection and pass the last
+    response's ``token`` as ``?since=``; the response holds only the rows
+    changed since then and the ids deleted since. Without a token, or when it
+    can no longer be honoured (membership changed, tombstones pruned), the
+    response is a full snapshot marked ``"full": true`` that replaces the
+    client's copy.
+
+    Either is split into pages of ``SYNC_PAGE_SIZE`` rows: while ``next`` is
+    set, fetch ``?cursor=<next>`` and apply that page too. Only the last page
+    carries the ``token`` for the following sync.
+    """
+
+    permission_classes = [permissions.IsAuthenticated]
+
+    def get(self, request):
+        user = request.user
+        fingerprint = scope_fingerprint(user)
+        cursor = request.query_params.get("cursor")
+        if cursor:
+            started, since, after, cursor_fingerprint = parse_cursor(cursor)
+            if cursor_fingerprint != fingerprint:
+                # Rows already sent may now be out of scope, or missing.
+                raise ValidationError(
+                    {"cursor": ["Your projects changed during the sync; start again."]}
+                )
+        else:
+            started, since, after = timezone.now(), None, None
+            token = request.query_params.get("since")
+            if token:
+                moment, token_fingerprint = parse_token(token)
+                retention = datetime.timedelta(
+                    days=settings.SYNC_TOMBSTONE_RETENTION_DAYS
+                )
+                if token_fingerprint == fingerprint and moment > started - retention:
+                    since = moment
+        changed, deleted, position = changes_since(request, since, after)
+        if position is None:
+            # Step back so rows committed by transactions still running when
+            # the sync started are picked up next time; clients apply
+            # repeated rows idempotently.
+            overlap = datetime.timedelta(seconds=settings.SYNC_TOKEN_OVERLAP)
+            token, next_cursor = make_token(started - overlap, fingerprint), None
+        else:
+            token = None
+            next_cursor = make_cursor(started, since, position, fingerprint)
+        return Response(
+            {
+                "token": token,
+                "next": next_cursor,
+                "full": since is None,
+                "changed": changed,
+                "deleted": deleted,
+            }
+        )
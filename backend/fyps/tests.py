@@ -0,0 +1,1181 @@
+import datetime
+import hashlib
+import io
+import json
+import os
+import shutil
+import tempfile
+import zipfile
+from unittest import mock
+
+from django.apps import apps
+from django.conf import settings
+from django.core.cache import cache
+from django.core.files.base import ContentFile
+from django.core.files.uploadedfile import SimpleUploadedFile
+from django.core.management import CommandError, call_command
+from django.db import transaction
+from django.test import TestCase, override_settings
+from django.urls import reverse
+from django.utils import timezone
+from rest_framework.test import APIClient
+from rest_framework_simplejwt.tokens import AccessToken
+from users.models import User
+from announcements.models import Notification
+from submissions.models import FeedbackMessage, FeedbackThread, Submission
+from evaluations.models import Evaluation
+from fyps.models import (
+    ProjectProposal,
+    Project,
+    Milestone,
+    Document,
+    AnalyticsDailyCount,
+    Blob,
+    ChunkedUpload,
+    ProposalBand,
+    ProposalSignature,
+    SearchDocument,
+    Tombstone,
+)
+from fyps.access import accessible_project_ids
+from fyps.analytics import compute_counters, read_snapshot, rebuild_snapshot
+from fyps.overdue import start_configured_sweeper, sweep_overdue_milestones
+from fyps.similarity import MAX_SHINGLES, _signature_for_row, save_signatures, shingles
+from fyps.storage import collect_blobs
+from fyps.uploads import ChunkedUploadedFile, upload_path
+
+
+class AdminAnalyticsViewTests(TestCase):
+    def setUp(self):
+        self.admin = User.objects.create_user(
+            email="admin@example.com", role="admin", is_staff=True
+        )
+        self.supervisor = User.objects.create_user(
+            email="supervisor@example.com", role="supervisor"
+        )
+        self.client = APIClient()
+        self.client.force_authenticate(self.admin)
+
+    def make_project(self, index):
+        student = User.objects.create_user(email=f"student{index}@example.com")
+        proposal = ProjectProposal.objects.create(
+            title=f"Proposal {index}",
+            description="",
+            document="proposals/p.pdf",
+            status="approved",
+            student=student,
+            supervisor=self.supervisor,
+        )
+        project = Project.objects.create(
+            proposal=proposal,
+            title=f"Project {index}",
+            description="",
+            supervisor=self.supervisor,
+        )
+        project.students.add(student)
+        Milestone.objects.create(
+            project=project, title="Draft", due_date=datetime.date.today()
+        )
+        Milestone.objects.create(
+            project=project,
+            title="Final",
+            due_date=datetime.date.today(),
+            status="overdue",
+        )
+        Document.objects.create(
+            project=project, file="documents/d.pdf", name="Report", type="report"
+        )
+        Submission.objects.create(
+            title="Code", file="submissions/s.zip", student=student, project=project
+        )
+        Evaluation.objects.create(
+            project=project,
+            evaluator=self.supervisor,
+            scores=[],
+            total_score=index * 10,
+        )
+        return project
+
+    def test_payload(self):
+        self.make_project(1)
+        self.make_project(2)
+        response = self.client.get(reverse("admin-analytics"))
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(
+            response.data["user_counts"], {"student": 2, "supervisor": 1, "admin": 1}
+        )
+        self.assertEqual(
+            response.data["project_counts"], {"active": 2, "completed": 0, "on_hold": 0}
+        )
+        self.assertEqual(
+            response.data["proposal_counts"],
+            {"pending": 0, "approved": 2, "rejected": 0},
+        )
+        self.assertEqual(
+            response.data["milestone_counts"],
+            {"pending": 2, "completed": 0, "overdue": 2},
+        )
+        self.assertEqual(
+            response.data["document_counts"],
+            {"report": 2, "code": 0, "presentation": 0, "other": 0},
+        )
+        self.assertEqual(response.data["total_submissions"], 2)
+        self.assertEqual(response.data["avg_evaluation_score"], 15)
+        self.assertEqual(response.data["overdue_milestones"], 2)
+
+    def test_counters_follow_saves_and_deletes(self):
+        rebuild_snapshot()
+        with self.captureOnCommitCallbacks(execute=True):
+            project = self.make_project(1)
+            self.make_project(2)
+            project.status = "completed"
+            project.save()
+            project.milestones.filter(status="overdue").get().delete()
+            evaluation = project.evaluations.get()
+            evaluation.total_score = 30
+            evaluation.save()
+
+        response = self.client.get(reverse("admin-analytics"))
+        live = compute_counters()
+        self.assertEqual(
+            response.data["project_counts"], {"active": 1, "completed": 1, "on_hold": 0}
+        )
+        self.assertEqual(
+            response.data["milestone_counts"]["overdue"],
+            live["milestone_counts.overdue"][0],
+        )
+        self.assertEqual(response.data["overdue_milestones"], 1)
+        self.assertEqual(response.data["avg_evaluation_score"], 25)
+        self.assertIn("age_seconds", response.data["snapshot"])
+
+    def test_rolled_back_saves_leave_counters_alone(self):
+        project = self.make_project(1)
+        rebuild_snapshot()
+        with self.captureOnCommitCallbacks(execute=True):
+            with self.assertRaises(RuntimeError), transaction.atomic():
+                project.status = "completed"
+                project.save()
+                raise RuntimeError
+        counts = read_snapshot()["project_counts"]
+        self.assertEqual((counts["active"], counts["completed"]), (1, 0))
+
+    def test_rebuild_query_count_does_not_grow(self):
+        # One grouped query each for users, projects, proposals, milestones,
+        # documents, submissions and evaluations.
+        with self.assertNumQueries(7):
+            compute_counters()
+        for index in range(5):
+            self.make_project(index)
+        with self.assertNumQueries(7):
+            compute_counters()
+
+    def test_snapshot_read_is_a_single_query(self):
+        rebuild_snapshot()
+        for index in range(5):
+            self.make_project(index)
+        with self.assertNumQueries(1):
+            self.client.get(reverse("admin-analytics"))
+
+    def test_history(self):
+        with self.captureOnCommitCallbacks(execute=True):
+            self.make_project(1)
+        response = self.client.get(reverse("admin-analytics-history"))
+        self.assertEqual(response.data["submissions"][0]["count"], 1)
+        AnalyticsDailyCount.objects.all().delete()
+        rebuild_snapshot(history=True)
+        response = self.client.get(reverse("admin-analytics-history"))
+        self.assertEqual(response.data["submissions"][0]["count"], 1)
+
+
+class BenchmarkQueriesTests(TestCase):
+    def test_refuses_without_scratch_confirmation(self):
+        with self.assertRaises(CommandError):
+            call_command("benchmark_queries", seed=10, stdout=io.StringIO())
+        self.assertFalse(User.objects.exists())
+
+
+class ChunkedUploadTests(TestCase):
+    def setUp(self):
+        self.media = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, self.media)
+        overrides = override_settings(
+            MEDIA_ROOT=self.media, CHUNKED_UPLOAD_DIR=f"{self.media}/parts"
+        )
+        overrides.enable()
+        self.addCleanup(overrides.disable)
+
+        self.student = User.objects.create_user(email="student@example.com")
+        proposal = ProjectProposal.objects.create(
+            title="P", description="", document="p.pdf", student=self.student
+        )
+        self.project = Project.objects.create(
+            proposal=proposal, title="P", description=""
+        )
+        self.project.students.add(self.student)
+        self.client = APIClient()
+        self.client.force_authenticate(self.student)
+        self.content = bytes(range(256)) * 1000
+
+    def send(self, url, offset, data):
+        return self.client.generic(
+            "PATCH",
+            url,
+            data,
+            content_type="application/offset+octet-stream",
+            HTTP_UPLOAD_OFFSET=str(offset),
+        )
+
+    def test_resumable_upload_creates_submission(self):
+        response = self.client.post(
+            "/api/submissions/submissions/uploads/",
+            {"filename": "final.zip", "size": len(self.content)},
+            format="json",
+        )
+        self.assertEqual(response.status_code, 201)
+        url = f"/api/submissions/submissions/uploads/{response.data['id']}/"
+
+        response = self.send(url, 0, self.content[:100000])
+        self.assertEqual(response["Upload-Offset"], "100000")
+        # A retried chunk at a stale offset is rejected with the current offset.
+        response = self.send(url, 0, self.content[:100000])
+        self.assertEqual(response.status_code, 409)
+        self.assertEqual(response.data["offset"], 100000)
+
+        # After a dropped connection the client asks where to resume.
+        self.assertEqual(self.client.get(url).data["offset"], 100000)
+        response = self.send(url, 100000, self.content[100000:])
+        self.assertEqual(response.data["offset"], len(self.content))
+
+        sha256 = hashlib.sha256(self.content).hexdigest()
+        response = self.client.post(
+            url + "complete/",
+            {"title": "Final", "project": self.project.id, "sha256": sha256},
+            format="json",
+        )
+        self.assertEqual(response.status_code, 201)
+        self.assertEqual(response.data["sha256"], sha256)
+        submission = Submission.objects.get(id=response.data["id"])
+        self.assertEqual(submission.student, self.student)
+        with submission.file.open("rb") as stored:
+            self.assertEqual(stored.read(), self.content)
+        self.assertEqual(self.client.get(url).status_code, 404)
+
+    def test_incomplete_or_corrupt_upload_is_not_accepted(self):
+        response = self.client.post(
+            "/api/fyps/documents/uploads/",
+            {"filename": "report.pdf", "size": 10},
+            format="json",
+        )
+        url = f"/api/fyps/documents/uploads/{response.data['id']}/"
+        fields = {"project": self.project.id, "name": "Report"}
+        response = self.client.post(url + "complete/", fields, format="json")
+        self.assertEqual(response.status_code, 409)
+
+        self.send(url, 0, b"0123456789")
+        response = self.client.post(
+            url + "complete/", dict(fields, sha256="0" * 64), format="json"
+        )
+        self.assertEqual(response.status_code, 400)
+        self.assertFalse(Document.objects.exists())
+
+        response = self.client.post(url + "complete/", fields, format="json")
+        self.assertEqual(response.status_code, 201)
+        self.assertEqual(Document.objects.get().uploaded_by, self.student)
+
+    def test_failed_validation_closes_the_assembled_file(self):
+        response = self.client.post(
+            "/api/fyps/documents/uploads/",
+            {"filename": "report.pdf", "size": 10},
+            format="json",
+        )
+        url = f"/api/fyps/documents/uploads/{response.data['id']}/"
+        self.send(url, 0, b"0123456789")
+        close = ChunkedUploadedFile.close
+        with mock.patch.object(
+            ChunkedUploadedFile, "close", autospec=True, side_effect=close
+        ) as closed:
+            response = self.client.post(
+                url + "complete/", {"project": self.project.id}, format="json"
+            )
+        self.assertEqual(response.status_code, 400)
+        self.assertIn("name", response.data)
+        closed.assert_called_once()
+        self.assertTrue(closed.call_args.args[0].closed)
+        # The part file is kept for a corrected retry.
+        self.assertEqual(self.client.get(url).data["offset"], 10)
+
+    def start(self):
+        response = self.client.post(
+            "/api/submissions/submissions/uploads/",
+            {"filename": "final.zip", "size": 10},
+            format="json",
+        )
+        upload = ChunkedUpload.objects.get(id=response.data["id"])
+        return upload, f"/api/submissions/submissions/uploads/{upload.id}/"
+
+    def test_abandoned_upload_can_be_deleted(self):
+        upload, url = self.start()
+        self.send(url, 0, b"01234")
+        self.assertTrue(os.path.exists(upload_path(upload)))
+        self.assertEqual(self.client.delete(url).status_code, 204)
+        self.assertFalse(ChunkedUpload.objects.exists())
+        self.assertFalse(os.path.exists(upload_path(upload)))
+        self.assertEqual(self.client.delete(url).status_code, 404)
+
+    def test_stale_uploads_are_pruned(self):
+        stale, _ = self.start()
+        fresh, _ = self.start()
+        ChunkedUpload.objects.filter(id=stale.id).update(
+            updated_at=timezone.now() - datetime.timedelta(days=2)
+        )
+        orphan = os.path.join(settings.CHUNKED_UPLOAD_DIR, "orphan.part")
+        open(orphan, "wb").close()
+        os.utime(orphan, (0, 0))
+
+        call_command("prune_chunked_uploads", stdout=io.StringIO())
+        self.assertEqual(list(ChunkedUpload.objects.all()), [fresh])
+        self.assertFalse(os.path.exists(upload_path(stale)))
+        self.assertTrue(os.path.exists(upload_path(fresh)))
+        self.assertFalse(os.path.exists(orphan))
+
+    def test_uploads_are_private_to_their_owner(self):
+        response = self.client.post(
+            "/api/submissions/submissions/uploads/",
+            {"filename": "final.zip", "size": 10},
+            format="json",
+        )
+        other = User.objects.create_user(email="other@example.com")
+        self.client.force_authenticate(other)
+        url = f"/api/submissions/submissions/uploads/{response.data['id']}/"
+        self.assertEqual(self.client.get(url).status_code, 404)
+
+
+class BlobStorageTests(TestCase):
+    def setUp(self):
+        self.media = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, self.media)
+        overrides = override_settings(MEDIA_ROOT=self.media)
+        overrides.enable()
+        self.addCleanup(overrides.disable)
+
+        self.student = User.objects.create_user(email="student@example.com")
+        proposal = ProjectProposal.objects.create(
+            title="P", description="", document="p.pdf", student=self.student
+        )
+        self.project = Project.objects.create(
+            proposal=proposal, title="P", description=""
+        )
+        self.project.students.add(self.student)
+        self.client = APIClient()
+        self.client.force_authenticate(self.student)
+
+    def upload(self, name, content, version=1):
+        return self.client.post(
+            "/api/fyps/documents/",
+            {
+                "project": self.project.id,
+                "name": name,
+                "version": version,
+                "file": SimpleUploadedFile(f"{name}.pdf", content),
+            },
+        )
+
+    def test_identical_content_is_stored_once(self):
+        first = Document.objects.get(id=self.upload("Report", b"same").data["id"])
+        second = Document.objects.get(id=self.upload("Slides", b"same").data["id"])
+        self.assertEqual(first.file.name, second.file.name)
+        sha256 = hashlib.sha256(b"same").hexdigest()
+        self.assertEqual(first.file.name, f"blobs/{sha256[:2]}/{sha256}.pdf")
+        self.assertEqual(Blob.objects.get().refcount, 2)
+        directory = os.path.join(self.media, "blobs", sha256[:2])
+        self.assertEqual(os.listdir(directory), [f"{sha256}.pdf"])
+
+        first.delete()
+        self.assertEqual(Blob.objects.get().refcount, 1)
+        second.delete()
+        self.assertEqual(Blob.objects.get().refcount, 0)
+        self.assertEqual(collect_blobs(), (0, 0))  # still within the grace period
+        self.assertEqual(collect_blobs(datetime.timedelta(0)), (1, 4))
+        self.assertFalse(Blob.objects.exists())
+        self.assertFalse(os.path.exists(os.path.join(self.media, first.file.name)))
+
+    def test_replacing_a_file_releases_the_old_blob(self):
+        document = Document.objects.get(id=self.upload("Report", b"draft").data["id"])
+        response = self.client.patch(
+            f"/api/fyps/documents/{document.id}/",
+            {"file": SimpleUploadedFile("Report.pdf", b"final")},
+        )
+        self.assertEqual(response.status_code, 200)
+        refcounts = dict(Blob.objects.values_list("sha256", "refcount"))
+        self.assertEqual(
+            refcounts,
+            {
+                hashlib.sha256(b"draft").hexdigest(): 0,
+                hashlib.sha256(b"final").hexdigest(): 1,
+            },
+        )
+        # Saves that leave the file alone keep its reference.
+        document.refresh_from_db()
+        document.name = "Renamed"
+        document.save()
+        Document.objects.only("id", "name").get(id=document.id).save()
+        self.assertEqual(Blob.objects.get(refcount=1).refcount, 1)
+
+    def test_identical_version_is_rejected(self):
+        self.upload("Report", b"draft")
+        response = self.upload("Report", b"draft", version=2)
+        self.assertEqual(response.status_code, 400)
+        self.assertIn("Identical to version 1", str(response.data["file"]))
+        self.assertEqual(self.upload("Report", b"final", version=2).status_code, 201)
+
+    def test_existing_files_are_migrated(self):
+        os.makedirs(os.path.join(self.media, "documents"))
+        for name in ["a.pdf", "b.pdf"]:
+            with open(os.path.join(self.media, "documents", name), "wb") as file:
+                file.write(b"legacy")
+        for index, name in enumerate(["a.pdf", "b.pdf", "a.pdf"]):
+            Document.objects.create(
+                project=self.project, name=f"Doc {index}", file=f"documents/{name}"
+            )
+
+        call_command("migrate_to_blobs", stdout=io.StringIO())
+        names = set(Document.objects.values_list("file", flat=True))
+        self.assertEqual(len(names), 1)
+        self.assertTrue(names.pop().startswith("blobs/"))
+        self.assertEqual(Blob.objects.get().refcount, 3)
+        self.assertEqual(os.listdir(os.path.join(self.media, "documents")), [])
+
+
+class FileDownloadTests(TestCase):
+    def setUp(self):
+        self.media = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, self.media)
+        overrides = override_settings(MEDIA_ROOT=self.media)
+        overrides.enable()
+        self.addCleanup(overrides.disable)
+
+        self.student = User.objects.create_user(email="student@example.com")
+        proposal = ProjectProposal.objects.create(
+            title="P", description="", document="p.pdf", student=self.student
+        )
+        project = Project.objects.create(proposal=proposal, title="P", description="")
+        project.students.add(self.student)
+        self.content = b"0123456789"
+        self.document = Document.objects.create(
+            project=project, name="Report", file=ContentFile(self.content, "r.pdf")
+        )
+        self.url = f"/api/fyps/documents/{self.document.id}/download/"
+        self.client = APIClient()
+        self.client.force_authenticate(self.student)
+
+    def body(self, response):
+        return b"".join(response.streaming_content)
+
+    def test_full_download_with_validators(self):
+        response = self.client.get(self.url)
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(self.body(response), self.content)
+        self.assertEqual(response["Content-Length"], "10")
+        self.assertEqual(response["Accept-Ranges"], "bytes")
+        self.assertIn('filename="Report.pdf"', response["Content-Disposition"])
+        sha256 = hashlib.sha256(self.content).hexdigest()
+        self.assertEqual(response["ETag"], f'"{sha256}"')
+
+        response = self.client.get(self.url, HTTP_IF_NONE_MATCH=f'"{sha256}"')
+        self.assertEqual(response.status_code, 304)
+        response = self.client.get(
+            self.url, HTTP_IF_MODIFIED_SINCE=response["Last-Modified"]
+        )
+        self.assertEqual(response.status_code, 304)
+
+    def test_range_requests(self):
+        response = self.client.get(self.url, HTTP_RANGE="bytes=2-5")
+        self.assertEqual(response.status_code, 206)
+        self.assertEqual(self.body(response), b"2345")
+        self.assertEqual(response["Content-Range"], "bytes 2-5/10")
+        self.assertEqual(response["Content-Length"], "4")
+
+        response = self.client.get(self.url, HTTP_RANGE="bytes=-3")
+        self.assertEqual(self.body(response), b"789")
+        response = self.client.get(self.url, HTTP_RANGE="bytes=20-")
+        self.assertEqual(response.status_code, 416)
+        self.assertEqual(response["Content-Range"], "bytes */10")
+        # A partial copy of some other version gets the whole file.
+        response = self.client.get(
+            self.url, HTTP_RANGE="bytes=2-5", HTTP_IF_RANGE='"stale"'
+        )
+        self.assertEqual(response.status_code, 200)
+
+    def test_access_follows_role_scoping(self):
+        outsider = User.objects.create_user(
+            email="supervisor@example.com", role="supervisor"
+        )
+        self.client.force_authenticate(outsider)
+        self.assertEqual(self.client.get(self.url).status_code, 404)
+
+        self.client.force_authenticate(None)
+        self.assertEqual(self.client.get(self.url).status_code, 401)
+
+    def test_signed_links_replace_access_tokens_in_urls(self):
+        # A full-privilege access token is no longer accepted in the URL.
+        token = AccessToken.for_user(self.student)
+        self.client.force_authenticate(None)
+        response = self.client.get(self.url, {"token": str(token)})
+        self.assertEqual(response.status_code, 401)
+
+        self.client.force_authenticate(self.student)
+        response = self.client.post(
+            "/api/download-links/", {"path": self.url}, format="json"
+        )
+        self.assertEqual(response.status_code, 200)
+        link = response.data["url"]
+        self.assertTrue(link.startswith(self.url + "?token="))
+        response = self.client.post(
+            "/api/download-links/", {"path": "/api/users/me/"}, format="json"
+        )
+        self.assertEqual(response.status_code, 400)
+
+        self.client.force_authenticate(None)
+        self.assertEqual(self.client.get(link).status_code, 200)
+        # Bound to the one path it was signed for, and short-lived.
+        other = link.replace(f"/{self.document.id}/", f"/{self.document.id + 1}/")
+        self.assertEqual(self.client.get(other).status_code, 401)
+        with override_settings(DOWNLOAD_LINK_MAX_AGE=-1):
+            self.assertEqual(self.client.get(link).status_code, 401)
+
+    @override_settings(DOWNLOAD_OFFLOAD="x-accel-redirect")
+    def test_offload_to_proxy(self):
+        response = self.client.get(self.url)
+        self.assertEqual(
+            response["X-Accel-Redirect"], f"/protected-media/{self.document.file.name}"
+        )
+        self.assertEqual(response.content, b"")
+
+
+class ProjectExportTests(TestCase):
+    def setUp(self):
+        self.media = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, self.media)
+        overrides = override_settings(MEDIA_ROOT=self.media)
+        overrides.enable()
+        self.addCleanup(overrides.disable)
+
+        self.supervisor = User.objects.create_user(
+            email="supervisor@example.com", role="supervisor"
+        )
+        self.student = User.objects.create_user(email="student@example.com")
+        self.client = APIClient()
+        self.client.force_authenticate(self.supervisor)
+
+    def make_project(self, title, supervisor):
+        proposal = ProjectProposal.objects.create(
+            title=title, description="", document="p.pdf", student=self.student
+        )
+        project = Project.objects.create(
+            proposal=proposal, title=title, description="", supervisor=supervisor
+        )
+        project.students.add(self.student)
+        Submission.objects.create(
+            title="Final",
+            student=self.student,
+            project=project,
+            file=ContentFile(f"{title} code".encode(), "final.zip"),
+        )
+        for version in (1, 2):
+            Document.objects.create(
+                project=project,
+                name="Report",
+                version=version,
+                file=ContentFile(f"{title} v{version}".encode(), "report.pdf"),
+            )
+        return project
+
+    def archive(self, response):
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response["Content-Type"], "application/zip")
+        return zipfile.ZipFile(io.BytesIO(b"".join(response.streaming_content)))
+
+    def test_export_all_supervised_projects(self):
+        first = self.make_project("Alpha", self.supervisor)
+        second = self.make_project("Beta", self.supervisor)
+        self.make_project("Gamma", User.objects.create_user(email="x@example.com"))
+        submission = first.submissions.get()
+
+        response = self.client.get("/api/fyps/projects/export/")
+        with self.assertNumQueries(4):
+            archive = self.archive(response)
+        self.assertEqual(
+            archive.namelist(),
+            [
+                f"{first.id}-Alpha/submissions/{submission.id}-Final.zip",
+                f"{first.id}-Alpha/documents/Report-v2.pdf",
+                f"{second.id}-Beta/submissions/{second.submissions.get().id}-Final.zip",
+                f"{second.id}-Beta/documents/Report-v2.pdf",
+                "manifest.json",
+            ],
+        )
+        self.assertEqual(
+            archive.read(f"{first.id}-Alpha/documents/Report-v2.pdf"), b"Alpha v2"
+        )
+        manifest = json.loads(archive.read("manifest.json"))
+        self.assertEqual([p["title"] for p in manifest["projects"]], ["Alpha", "Beta"])
+        project = manifest["projects"][0]
+        self.assertEqual(project["students"], ["student@example.com"])
+        self.assertEqual(project["submissions"][0]["size"], len(b"Alpha code"))
+        self.assertEqual(project["documents"][0]["version"], 2)
+
+    def test_single_project_export_is_role_scoped(self):
+        project = self.make_project("Alpha", self.supervisor)
+        url = f"/api/fyps/projects/{project.id}/export/"
+        self.assertEqual(len(self.archive(self.client.get(url)).namelist()), 3)
+
+        other = User.objects.create_user(email="other@example.com", role="supervisor")
+        self.client.force_authenticate(other)
+        self.assertEqual(self.client.get(url).status_code, 404)
+        self.client.force_authenticate(self.student)
+        self.assertEqual(self.client.get(url).status_code, 403)
+
+
+class ProjectAccessCacheTests(TestCase):
+    def setUp(self):
+        cache.clear()
+        self.student = User.objects.create_user(email="student@example.com")
+        self.supervisor = User.objects.create_user(
+            email="supervisor@example.com", role="supervisor"
+        )
+        self.first = self.make_project("First")
+        self.second = self.make_project("Second")
+
+    def make_project(self, title):
+        proposal = ProjectProposal.objects.create(
+            title=title, description="", document="p.pdf", student=self.student
+        )
+        return Project.objects.create(
+            proposal=proposal, title=title, description="", supervisor=self.supervisor
+        )
+
+    def test_scope_is_cached(self):
+        self.first.students.add(self.student)
+        self.assertEqual(accessible_project_ids(self.student), {self.first.id})
+        with self.assertNumQueries(0):
+            accessible_project_ids(self.student)
+        self.assertEqual(
+            accessible_project_ids(self.supervisor), {self.first.id, self.second.id}
+        )
+
+    def test_membership_changes_invalidate(self):
+        self.assertEqual(accessible_project_ids(self.student), set())
+        self.first.students.add(self.student)
+        self.assertEqual(accessible_project_ids(self.student), {self.first.id})
+        self.student.assigned_projects_as_student.add(self.second)
+        self.assertEqual(
+            accessible_project_ids(self.student), {self.first.id, self.second.id}
+        )
+        self.second.students.remove(self.student)
+        self.assertEqual(accessible_project_ids(self.student), {self.first.id})
+        self.first.students.clear()
+        self.assertEqual(accessible_project_ids(self.student), set())
+
+        self.first.students.add(self.student)
+        accessible_project_ids(self.student)
+        self.first.delete()
+        self.assertEqual(accessible_project_ids(self.student), set())
+
+    def test_supervisor_change_invalidates_both_supervisors(self):
+        other = User.objects.create_user(email="other@example.com", role="supervisor")
+        self.assertEqual(accessible_project_ids(other), set())
+        accessible_project_ids(self.supervisor)
+
+        self.first.supervisor = other
+        self.first.save()
+        self.assertEqual(accessible_project_ids(other), {self.first.id})
+        self.assertEqual(accessible_project_ids(self.supervisor), {self.second.id})
+
+        client = APIClient()
+        client.force_authenticate(other)
+        response = client.get("/api/fyps/projects/")
+        self.assertEqual([p["id"] for p in response.data["results"]], [self.first.id])
+
+
+@override_settings(SYNC_TOKEN_OVERLAP=0)
+class SyncTests(TestCase):
+    def setUp(self):
+        cache.clear()
+        self.student = User.objects.create_user(email="student@example.com")
+        self.supervisor = User.objects.create_user(
+            email="supervisor@example.com", role="supervisor"
+        )
+        proposal = ProjectProposal.objects.create(
+            title="Mine", description="", document="p.pdf", student=self.student
+        )
+        self.project = Project.objects.create(
+            proposal=proposal, title="Mine", description="", supervisor=self.supervisor
+        )
+        self.project.students.add(self.student)
+        other = ProjectProposal.objects.create(
+            title="Other", description="", document="o.pdf", student=self.student
+        )
+        self.other = Project.objects.create(
+            proposal=other, title="Other", description=""
+        )
+        self.milestone = Milestone.objects.create(
+            project=self.project, title="Draft", due_date=datetime.date(2030, 1, 1)
+        )
+        Milestone.objects.create(
+            project=self.other, title="Hidden", due_date=datetime.date(2030, 1, 1)
+        )
+        self.document = Document.objects.create(
+            project=self.project, file="d.pdf", name="Report"
+        )
+        self.notification = Notification.objects.create(
+            recipient=self.student, message="Hello"
+        )
+        self.client = APIClient()
+        self.client.force_authenticate(self.student)
+
+    def sync(self, token=None):
+        response = self.client.get("/api/sync/", {"since": token} if token else {})
+        self.assertEqual(response.status_code, 200)
+        return response.data
+
+    def ids(self, rows):
+        return [row["id"] for row in rows]
+
+    def test_full_sync_is_scoped(self):
+        data = self.sync()
+        self.assertTrue(data["full"])
+        self.assertEqual(self.ids(data["changed"]["projects"]), [self.project.id])
+        self.assertEqual(self.ids(data["changed"]["milestones"]), [self.milestone.id])
+        self.assertEqual(
+            self.ids(data["changed"]["notifications"]), [self.notification.id]
+        )
+
+    def test_delta_returns_changes_and_deletions(self):
+        token = self.sync()["token"]
+        self.milestone.status = "completed"
+        self.milestone.save()
+        document_id = self.document.id
+        self.document.delete()
+        self.client.post(
+            "/api/announcements/notifications/mark_read/",
+            {"ids": [self.notification.id]},
+            format="json",
+        )
+
+        data = self.sync(token)
+        self.assertFalse(data["full"])
+        self.assertEqual(data["changed"]["projects"], [])
+        self.assertEqual(self.ids(data["changed"]["milestones"]), [self.milestone.id])
+        self.assertEqual(data["deleted"]["documents"], [document_id])
+        self.assertTrue(data["changed"]["notifications"][0]["read"])
+
+        data = self.sync(data["token"])
+        self.assertFalse(any(data["changed"].values()))
+        self.assertFalse(any(data["deleted"].values()))
+
+    def test_patching_a_notification_read_is_synced(self):
+        token = self.sync()["token"]
+        response = self.client.patch(
+            f"/api/announcements/notifications/{self.notification.id}/",
+            {"read": True},
+            format="json",
+        )
+        self.assertEqual(response.status_code, 200)
+        data = self.sync(token)
+        self.assertEqual(
+            self.ids(data["changed"]["notifications"]), [self.notification.id]
+        )
+        self.assertTrue(data["changed"]["notifications"][0]["read"])
+
+    def test_other_users_deletions_are_hidden(self):
+        token = self.sync()["token"]
+        Notification.objects.create(recipient=self.supervisor, message="x").delete()
+        Milestone.objects.filter(project=self.other).delete()
+        self.assertEqual(Tombstone.objects.count(), 2)
+        data = self.sync(token)
+        self.assertFalse(any(data["deleted"].values()))
+
+    def test_membership_change_forces_full_sync(self):
+        token = self.sync()["token"]
+        self.other.students.add(self.student)
+        data = self.sync(token)
+        self.assertTrue(data["full"])
+        self.assertEqual(len(data["changed"]["milestones"]), 2)
+
+    def test_invalid_token(self):
+        response = self.client.get("/api/sync/", {"since": "yesterday"})
+        self.assertEqual(response.status_code, 400)
+        response = self.client.get("/api/sync/", {"cursor": "1-2-99--"})
+        self.assertEqual(response.status_code, 400)
+
+    def sync_pages(self, token=None):
+        pages = [self.sync(token)]
+        while pages[-1]["next"]:
+            response = self.client.get("/api/sync/", {"cursor": pages[-1]["next"]})
+            self.assertEqual(response.status_code, 200)
+            pages.append(response.data)
+        return pages
+
+    @override_settings(SYNC_PAGE_SIZE=2)
+    def test_sync_is_paged(self):
+        extra = [
+            Notification.objects.create(recipient=self.student, message=str(i))
+            for i in range(3)
+        ]
+        pages = self.sync_pages()
+        self.assertGreater(len(pages), 2)
+        self.assertTrue(all(page["full"] for page in pages))
+        self.assertEqual([bool(page["token"]) for page in pages][-2:], [False, True])
+        rows = {}
+        for page in pages:
+            self.assertLessEqual(sum(map(len, page["changed"].values())), 2)
+            for key, changed in page["changed"].items():
+                rows.setdefault(key, []).extend(self.ids(changed))
+        self.assertEqual(rows["projects"], [self.project.id])
+        self.assertEqual(rows["documents"], [self.document.id])
+        self.assertEqual(
+            rows["notifications"], [self.notification.id] + [n.id for n in extra]
+        )
+
+        token = pages[-1]["token"]
+        for notification in extra:
+            notification.read = True
+            notification.save()
+        deleted_id = extra[0].id
+        extra[0].delete()
+        pages = self.sync_pages(token)
+        self.assertFalse(pages[0]["full"])
+        self.assertEqual(pages[0]["deleted"]["notifications"], [deleted_id])
+        changed = [
+            row["id"] for page in pages for row in page["changed"]["notifications"]
+        ]
+        self.assertEqual(changed, [extra[1].id, extra[2].id])
+
+    @override_settings(SYNC_PAGE_SIZE=1)
+    def test_membership_change_restarts_a_paged_sync(self):
+        cursor = self.sync()["next"]
+        self.other.students.add(self.student)
+        response = self.client.get("/api/sync/", {"cursor": cursor})
+        self.assertEqual(response.status_code, 400)
+
+
+class DashboardTests(TestCase):
+    def setUp(self):
+        cache.clear()
+        self.student = User.objects.create_user(email="student@example.com")
+        self.supervisor = User.objects.create_user(
+            email="supervisor@example.com", role="supervisor"
+        )
+        self.project = self.make_project("Mine")
+        self.client = APIClient()
+
+    def make_project(self, title):
+        proposal = ProjectProposal.objects.create(
+            title=title, description="", document="p.pdf", student=self.student
+        )
+        project = Project.objects.create(
+            proposal=proposal, title=title, description="", supervisor=self.supervisor
+        )
+        project.students.add(self.student)
+        for day in (3, 1, 2):
+            Milestone.objects.create(
+                project=project, title=f"M{day}", due_date=datetime.date(2030, 1, day)
+            )
+        Submission.objects.create(
+            title=title, file="s.pdf", student=self.student, project=project
+        )
+        Evaluation.objects.create(
+            project=project, evaluator=self.supervisor, scores=[], total_score=60
+        )
+        Notification.objects.create(recipient=self.student, message=title)
+        return project
+
+    def dashboard(self, user):
+        self.client.force_authenticate(user)
+        response = self.client.get("/api/dashboard/")
+        self.assertEqual(response.status_code, 200)
+        return response.data
+
+    def test_student_summary(self):
+        data = self.dashboard(self.student)
+        self.assertEqual(
+            data["counts"]["projects"],
+            {"total": 1, "active": 1, "completed": 0, "on_hold": 0},
+        )
+        self.assertEqual(data["counts"]["milestones"]["pending"], 3)
+        self.assertEqual(data["counts"]["unread_notifications"], 1)
+        self.assertEqual(
+            [m["title"] for m in data["upcoming_milestones"]], ["M1", "M2", "M3"]
+        )
+        self.assertEqual(data["latest_submissions"][0]["project__title"], "Mine")
+        self.assertEqual(data["average_score"], 60)
+
+    def test_query_count_does_not_grow(self):
+        self.dashboard(self.supervisor)
+        cache.clear()
+        # Scope and unread count are cold here; both are cached afterwards.
+        with self.assertNumQueries(11):
+            self.dashboard(self.supervisor)
+        for title in ("Second", "Third", "Fourth"):
+            self.make_project(title)
+        cache.clear()
+        with self.assertNumQueries(11), mock.patch("fyps.dashboard.LIST_SIZE", 3):
+            data = self.dashboard(self.supervisor)
+        self.assertEqual(data["counts"]["projects"]["total"], 4)
+        self.assertEqual(data["counts"]["evaluations"], 4)
+        self.assertEqual(data["counts"]["evaluated_projects"], 4)
+        # Capped like the other lists.
+        self.assertEqual(len(data["project_scores"]), 3)
+
+
+class OverdueSweepTests(TestCase):
+    def setUp(self):
+        cache.clear()
+        self.student = User.objects.create_user(email="student@example.com")
+        self.supervisor = User.objects.create_user(
+            email="supervisor@example.com", role="supervisor"
+        )
+        proposal = ProjectProposal.objects.create(
+            title="Mine", description="", document="p.pdf", student=self.student
+        )
+        self.project = Project.objects.create(
+            proposal=proposal, title="Mine", description="", supervisor=self.supervisor
+        )
+        self.project.students.add(self.student)
+        self.today = datetime.date(2030, 6, 1)
+        for title, day, status in [
+            ("Late", 1, "pending"),
+            ("Later", 20, "pending"),
+            ("Done", 1, "completed"),
+            ("Future", 30, "pending"),
+        ]:
+            Milestone.objects.create(
+                project=self.project,
+                title=title,
+                due_date=datetime.date(2030, 5, day) if day < 30 else self.today,
+                status=status,
+            )
+        rebuild_snapshot()
+
+    def test_sweep_marks_overdue_and_notifies(self):
+        updated, notified = sweep_overdue_milestones(self.today)
+        self.assertEqual((updated, notified), (2, 2))
+        self.assertEqual(
+            set(
+                Milestone.objects.filter(status="overdue").values_list(
+                    "title", flat=True
+                )
+            ),
+            {"Late", "Later"},
+        )
+        self.assertEqual(read_snapshot()["overdue_milestones"], 2)
+        self.assertEqual(compute_counters()["milestone_counts.pending"][0], 1)
+        notification = Notification.objects.get(recipient=self.student)
+        self.assertEqual(
+            notification.message, '2 milestones on "Mine" are overdue: Late, Later.'
+        )
+        self.assertEqual(notification.type, "warning")
+        self.assertTrue(
+            Notification.objects.filter(recipient=self.supervisor).exists()
+        )
+
+        self.assertEqual(sweep_overdue_milestones(self.today), (0, 0))
+
+    def test_command(self):
+        Milestone.objects.update(due_date=datetime.date(2020, 1, 1))
+        out = io.StringIO()
+        call_command("sweep_overdue_milestones", "--no-notify", stdout=out)
+        self.assertIn("Marked 3 milestones overdue, sent 0", out.getvalue())
+        self.assertFalse(Notification.objects.exists())
+
+    @override_settings(MILESTONE_SWEEP_INTERVAL=60)
+    def test_sweeper_starts_only_from_server_entrypoints(self):
+        with mock.patch("fyps.overdue.start_overdue_sweeper") as start:
+            # Every process loading the app, e.g. migrate or shell, runs ready().
+            apps.get_app_config("fyps").ready()
+            start.assert_not_called()
+            start_configured_sweeper()
+            start.assert_called_once_with(60)
+        with override_settings(MILESTONE_SWEEP_INTERVAL=0):
+            self.assertIsNone(start_configured_sweeper())
+
+
+class SearchTests(TestCase):
+    def setUp(self):
+        cache.clear()
+        self.student = User.objects.create_user(email="student@example.com")
+        self.other = User.objects.create_user(email="other@example.com")
+        self.supervisor = User.objects.create_user(
+            email="supervisor@example.com", role="supervisor"
+        )
+        self.proposal = ProjectProposal.objects.create(
+            title="Solar panel efficiency",
+            description="Predicting output of photovoltaic arrays.",
+            document="p.pdf",
+            student=self.student,
+            supervisor=self.supervisor,
+        )
+        self.project = Project.objects.create(
+            proposal=self.proposal,
+            title="Solar forecasting",
+            description="Machine learning for solar panels.",
+            supervisor=self.supervisor,
+        )
+        self.project.students.add(self.student, self.other)
+        Document.objects.create(
+            project=self.project,
+            file="d.pdf",
+            name="Panels report",
+            description="Measured panel degradation.",
+        )
+        submission = Submission.objects.create(
+            title="Draft", file="s.pdf", student=self.other, project=self.project
+        )
+        thread = FeedbackThread.objects.create(submission=submission)
+        FeedbackMessage.objects.create(
+            thread=thread, sender=self.supervisor, message="Cite more panel studies."
+        )
+        self.client = APIClient()
+
+    def search(self, user, **params):
+        self.client.force_authenticate(user)
+        response = self.client.get("/api/search/", params)
+        self.assertEqual(response.status_code, 200)
+        return [(r["kind"], r["id"]) for r in response.data["results"]]
+
+    def test_ranked_and_scoped(self):
+        results = self.search(self.supervisor, q="solar")
+        # Title matches outrank body-only matches.
+        self.assertEqual(results[0], ("project", self.project.id))
+        self.assertEqual(
+            {kind for kind, _ in self.search(self.supervisor, q="panel")},
+            {"proposal", "project", "document", "feedback"},
+        )
+        # The other student's feedback and proposal stay hidden.
+        self.assertEqual(
+            {kind for kind, _ in self.search(self.other, q="panel")},
+            {"project", "document", "feedback"},
+        )
+        self.assertEqual(
+            {kind for kind, _ in self.search(self.student, q="panel")},
+            {"proposal", "project", "document"},
+        )
+        stranger = User.objects.create_user(email="x@example.com")
+        self.assertEqual(self.search(stranger, q="panel"), [])
+
+    def test_index_follows_saves_and_deletes(self):
+        self.assertEqual(
+            self.search(self.supervisor, q="photovolt"),
+            [("proposal", self.proposal.id)],
+        )
+        self.proposal.description = "Wind turbines instead."
+        self.proposal.save()
+        self.assertEqual(self.search(self.supervisor, q="photovoltaic"), [])
+        self.assertEqual(len(self.search(self.supervisor, q="turbine")), 1)
+
+        self.project.delete()
+        self.assertEqual(
+            list(SearchDocument.objects.values_list("kind", flat=True)), ["proposal"]
+        )
+
+    def test_kind_filter_and_rebuild(self):
+        SearchDocument.objects.all().delete()
+        call_command("rebuild_search_index", stdout=io.StringIO())
+        self.assertEqual(
+            self.search(self.supervisor, q="panel", kind="document"),
+            [("document", Document.objects.get().id)],
+        )
+        self.client.force_authenticate(self.supervisor)
+        self.assertEqual(self.client.get("/api/search/", {"q": "?!"}).status_code, 400)
+
+
+@override_settings(MEDIA_ROOT=tempfile.gettempdir())
+class ProposalSimilarityTests(TestCase):
+    def setUp(self):
+        self.student = User.objects.create_user(email="student@example.com")
+        self.supervisor = User.objects.create_user(
+            email="supervisor@example.com", role="supervisor"
+        )
+        text = (
+            "Forecasting photovoltaic solar panel output from weather data "
+            "with gradient boosted trees and satellite cloud imagery"
+        )
+        self.original = self.make("Solar output forecasting", text)
+        self.near = self.make("Solar panel output forecasting", text + " at scale")
+        self.unrelated = self.make(
+            "Chess engine", "Alpha beta pruning search for a chess playing program"
+        )
+        self.client = APIClient()
+        self.client.force_authenticate(self.supervisor)
+
+    def make(self, title, description):
+        return ProjectProposal.objects.create(
+            title=title,
+            description=description,
+            document="missing.pdf",
+            student=self.student,
+            supervisor=self.supervisor,
+        )
+
+    def index_pending(self):
+        out = io.StringIO()
+        call_command("index_proposals", "--pending", "--workers", "1", stdout=out)
+        return out.getvalue()
+
+    def test_similar_action_ranks_near_duplicates(self):
+        # Saves only queue proposals; the request never computes signatures.
+        response = self.client.get(f"/api/fyps/proposals/{self.original.id}/similar/")
+        self.assertEqual(response.status_code, 503)
+        self.assertFalse(ProposalSignature.objects.exists())
+        self.assertIn("Indexed 3 proposals", self.index_pending())
+
+        response = self.client.get(f"/api/fyps/proposals/{self.original.id}/similar/")
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.data[0]["id"], self.near.id)
+        self.assertGreater(response.data[0]["similarity"], 0.5)
+        self.assertNotIn(self.unrelated.id, [row["id"] for row in response.data])
+
+        self.client.force_authenticate(self.student)
+        response = self.client.get(f"/api/fyps/proposals/{self.original.id}/similar/")
+        self.assertEqual(response.status_code, 403)
+
+    def test_signature_follows_text_changes(self):
+        self.index_pending()
+        stored = ProposalSignature.objects.get(proposal=self.near)
+        signature = bytes(stored.signature)
+        self.near.status = "approved"
+        self.near.save()
+        self.assertEqual(
+            ProposalSignature.objects.get(proposal=self.near).indexed_at,
+            stored.indexed_at,
+        )
+        self.near.description = "Chess engine alpha beta pruning search program"
+        self.near.save()
+        self.assertFalse(ProposalSignature.objects.filter(proposal=self.near).exists())
+        self.assertIn("Indexed 1 proposals", self.index_pending())
+        updated = bytes(ProposalSignature.objects.get(proposal=self.near).signature)
+        self.assertNotEqual(signature, updated)
+        self.assertEqual(ProposalBand.objects.filter(proposal=self.near).count(), 32)
+
+    def test_edits_made_while_indexing_stay_pending(self):
+        row = (self.near.pk, self.near.title, self.near.description, "missing.pdf")
+        proposal_id, signature, text = _signature_for_row(row)
+        ProjectProposal.objects.filter(pk=proposal_id).update(title="Renamed")
+        saved = save_signatures({proposal_id: signature}, {proposal_id: text})
+        self.assertEqual(saved, 0)
+        self.assertFalse(ProposalSignature.objects.filter(proposal=self.near).exists())
+
+    def test_long_documents_are_capped(self):
+        text = " ".join(f"word{i}" for i in range(5000))
+        capped = shingles(text)
+        self.assertEqual(len(capped), MAX_SHINGLES)
+        # The smallest hashes are kept, so texts sharing them keep the same ones.
+        self.assertLessEqual(len(capped - shingles(text + " extra words")), 2)
+
+    def test_reindex_command(self):
+        ProposalSignature.objects.all().delete()
+        ProposalBand.objects.all().delete()
+        out = io.StringIO()
+        call_command("index_proposals", "--workers", "2", stdout=out)
+        self.assertIn("Indexed 3 proposals", out.getvalue())
+        self.assertEqual(ProposalBand.objects.count(), 3 * 32)
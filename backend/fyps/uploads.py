@@ -0,0 +1,269 @@
+import datetime
+import hashlib
+import os
+import threading
+from collections import OrderedDict
+
+from django.conf import settings
+from django.core.exceptions import ValidationError as DjangoValidationError
+from django.core.files.uploadedfile import UploadedFile
+from django.db import transaction
+from django.utils import timezone
+from rest_framework import status
+from rest_framework.decorators import action
+from rest_framework.exceptions import NotFound, ValidationError
+from rest_framework.response import Response
+from .models import ChunkedUpload
+
+UPLOAD_ACTIONS = ("start_upload", "upload_chunk", "complete_upload")
+READ_SIZE = 64 * 1024
+MAX_CACHED_HASHERS = 1000
+
+# Running SHA-256 state per upload, so each chunk is hashed as it streams in.
+# hashlib state cannot be persisted; a worker that lacks it (restart, another
+# process) re-reads the bytes already on disk once.
+_hashers = OrderedDict()
+_hashers_lock = threading.Lock()
+
+
+def upload_path(upload):
+    return os.path.join(settings.CHUNKED_UPLOAD_DIR, f"{upload.id}.part")
+
+
+def _hasher(upload):
+    with _hashers_lock:
+        cached = _hashers.pop(upload.id, None)
+    if cached and cached[0] == upload.offset:
+        return cached[1]
+    hasher = hashlib.sha256()
+    if upload.offset:
+        with open(upload_path(upload), "rb") as part:
+            remaining = upload.offset
+            while remaining:
+                block = part.read(min(READ_SIZE, remaining))
+                if not block:
+                    break
+                hasher.update(block)
+                remaining -= len(block)
+    return hasher
+
+
+def _remember_hasher(upload, hasher):
+    with _hashers_lock:
+        _hashers[upload.id] = (upload.offset, hasher)
+        while len(_hashers) > MAX_CACHED_HASHERS:
+            _hashers.popitem(last=False)
+
+
+def _remove_part(upload_id):
+    # Takes the id: ``Model.delete()`` clears the primary key of the instance.
+    with _hashers_lock:
+        _hashers.pop(upload_id, None)
+    try:
+        os.remove(os.path.join(settings.CHUNKED_UPLOAD_DIR, f"{upload_id}.part"))
+    except FileNotFoundError:
+        pass
+
+
+def prune_uploads(max_age=None):
+    """Delete uploads untouched for ``max_age`` and their partial files.
+
+    Also removes ``.part`` files of that age left without a session, e.g. by
+    a crash between deleting the row and the file. Returns the number of
+    sessions deleted.
+    """
+    if max_age is None:
+        max_age = datetime.timedelta(hours=settings.CHUNKED_UPLOAD_EXPIRY_HOURS)
+    cutoff = timezone.now() - max_age
+    pruned = 0
+    stale = ChunkedUpload.objects.filter(updated_at__lt=cutoff)
+    for upload_id in stale.values_list("id", flat=True).iterator():
+        ChunkedUpload.objects.filter(id=upload_id).delete()
+        _remove_part(upload_id)
+        pruned += 1
+
+    if os.path.isdir(settings.CHUNKED_UPLOAD_DIR):
+        live = {str(pk) for pk in ChunkedUpload.objects.values_list("pk", flat=True)}
+        for entry in os.scandir(settings.CHUNKED_UPLOAD_DIR):
+            name, extension = os.path.splitext(entry.name)
+            if (
+                extension == ".part"
+                and name not in live
+                and entry.stat().st_mtime < cutoff.timestamp()
+            ):
+                os.remove(entry.path)
+    return pruned
+
+
+class ChunkedUploadedFile(UploadedFile):
+    """A completed upload handed to a FileField.
+
+    Exposes ``temporary_file_path`` so ``FileSystemStorage`` moves the file
+    into place instead of copying it, and carries the computed ``sha256``.
+    """
+
+    def __init__(self, path, name, size, sha256):
+        super().__init__(open(path, "rb"), name=name, size=size)
+        self.path = path
+        self.sha256 = sha256
+
+    def temporary_file_path(self):
+        return self.path
+
+    def close(self):
+        try:
+            return self.file.close()
+        except FileNotFoundError:
+            pass
+
+
+def upload_state(upload):
+    return {
+        "id": upload.id,
+        "filename": upload.filename,
+        "size": upload.size,
+        "offset": upload.offset,
+    }
+
+
+class ChunkedUploadMixin:
+    """Resumable chunked uploads for a viewset whose model has a FileField.
+
+    1. ``POST uploads/`` with ``filename`` and ``size`` opens a session.
+    2. ``PATCH uploads/<id>/`` streams raw bytes starting at the
+       ``Upload-Offset`` header; ``GET uploads/<id>/`` reports the offset to
+       resume from after an interruption.
+    3. ``POST uploads/<id>/complete/`` with the remaining model fields creates
+       the object, optionally verifying a client-supplied ``sha256``.
+
+    ``DELETE uploads/<id>/`` abandons a session; sessions left idle are
+    removed by the ``prune_chunked_uploads`` command.
+    """
+
+    chunked_upload_field = "file"
+
+    def get_upload(self, upload_id, lock=False):
+        queryset = ChunkedUpload.objects.filter(
+            user=self.request.user, target=self.basename
+        )
+        if lock:
+            queryset = queryset.select_for_update()
+        try:
+            return queryset.get(id=upload_id)
+        except (ChunkedUpload.DoesNotExist, DjangoValidationError):
+            raise NotFound("Upload not found.")
+
+    @action(detail=False, methods=["post"], url_path="uploads")
+    def start_upload(self, request):
+        filename = os.path.basename(str(request.data.get("filename", "")))
+        try:
+            size = int(request.data.get("size"))
+        except (TypeError, ValueError):
+            size = -1
+        if not filename:
+            raise ValidationError({"filename": ["This field is required."]})
+        if not 0 < size <= settings.CHUNKED_UPLOAD_MAX_SIZE:
+            raise ValidationError({"size": ["Must be a positive byte count."]})
+        upload = ChunkedUpload.objects.create(
+            user=request.user, target=self.basename, filename=filename, size=size
+        )
+        os.makedirs(settings.CHUNKED_UPLOAD_DIR, exist_ok=True)
+        open(upload_path(upload), "wb").close()
+        return Response(upload_state(upload), status=status.HTTP_201_CREATED)
+
+    @action(
+        detail=False,
+        methods=["get", "patch", "delete"],
+        url_path=r"uploads/(?P<upload_id>[0-9a-f-]+)",
+    )
+    def upload_chunk(self, request, upload_id):
+        if request.method == "GET":
+            return self.upload_response(self.get_upload(upload_id))
+        if request.method == "DELETE":
+            with transaction.atomic():
+                upload = self.get_upload(upload_id, lock=True)
+                upload_id = upload.id
+                upload.delete()
+            _remove_part(upload_id)
+            return Response(status=status.HTTP_204_NO_CONTENT)
+        try:
+            offset = int(request.headers["Upload-Offset"])
+        except (KeyError, ValueError):
+            raise ValidationError({"Upload-Offset": ["Header is required."]})
+
+        with transaction.atomic():
+            upload = self.get_upload(upload_id, lock=True)
+            if offset != upload.offset:
+                # The client must resume from the last acknowledged offset.
+                return self.upload_response(upload, status.HTTP_409_CONFLICT)
+            hasher = _hasher(upload)
+            written = self.write_chunk(request.stream, upload, hasher)
+            upload.offset += written
+            upload.save(update_fields=["offset", "updated_at"])
+        _remember_hasher(upload, hasher)
+        return self.upload_response(upload)
+
+    def write_chunk(self, stream, upload, hasher):
+        """Append the request body to the partial file in fixed-size reads."""
+        limit = min(
+            upload.size - upload.offset, settings.CHUNKED_UPLOAD_MAX_CHUNK_SIZE
+        )
+        written = 0
+        with open(upload_path(upload), "r+b") as part:
+            part.seek(upload.offset)
+            part.truncate()
+            while True:
+                block = stream.read(READ_SIZE) if stream else b""
+                if not block:
+                    break
+                written += len(block)
+                if written > limit:
+                    part.truncate(upload.offset)
+                    raise ValidationError(
+                        {"detail": "Chunk exceeds the upload size or chunk limit."}
+                    )
+                part.write(block)
+                hasher.update(block)
+        return written
+
+    @action(
+        detail=False,
+        methods=["post"],
+        url_path=r"uploads/(?P<upload_id>[0-9a-f-]+)/complete",
+    )
+    def complete_upload(self, request, upload_id):
+        with transaction.atomic():
+            upload = self.get_upload(upload_id, lock=True)
+            if upload.offset != upload.size:
+                return self.upload_response(upload, status.HTTP_409_CONFLICT)
+            sha256 = _hasher(upload).hexdigest()
+            expected = request.data.get("sha256")
+            if expected and expected.lower() != sha256:
+                raise ValidationError(
+                    {"sha256": ["Uploaded content does not match."]}
+                )
+
+            data = {
+                key: request.data.get(key)
+                for key in request.data
+                if key not in ("sha256", self.chunked_upload_field)
+            }
+            # Closed however validation or the save ends; a failed attempt
+            # leaves the part file in place for the client to retry.
+            with ChunkedUploadedFile(
+                upload_path(upload), upload.filename, upload.size, sha256
+            ) as file:
+                data[self.chunked_upload_field] = file
+                serializer = self.get_serializer(data=data)
+                serializer.is_valid(raise_exception=True)
+                self.perform_create(serializer)
+            upload_id = upload.id
+            upload.delete()
+        _remove_part(upload_id)
+        response = dict(serializer.data, sha256=sha256)
+        return Response(response, status=status.HTTP_201_CREATED)
+
+    def upload_response(self, upload, status_code=status.HTTP_200_OK):
+        response = Response(upload_state(upload), status=status_code)
+        response["Upload-Offset"] = str(upload.offset)
+        return response
@@ -5,6 +5,7 @@ from .views import (
     MilestoneViewSet,
     DocumentViewSet,
     AdminAnalyticsView,
+    AdminAnalyticsHistoryView,
 )
 
 router = DefaultRouter()
@@ -19,4 +20,9 @@ from django.urls import path
 
 urlpatterns += [
     path("analytics/", AdminAnalyticsView.as_view(), name="admin-analytics"),
+    path(
+        "analytics/history/",
+        AdminAnalyticsHistoryView.as_view(),
+        name="admin-analytics-history",
+    ),
 ]
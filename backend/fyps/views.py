@@ -1,4 +1,6 @@
-from rest_framework import viewsets, permissions
+from rest_framework import viewsets, permissions, status
+from core.caching import ResponseCacheMixin
+from core.querysets import EagerLoadingMixin
 from .models import ProjectProposal, Project, Milestone, Document
 from .serializers import (
     ProjectProposalSerializer,
@@ -6,13 +8,17 @@ from .serializers import (
     MilestoneSerializer,
     DocumentSerializer,
 )
-from users.models import User
+from .access import accessible_project_ids
+from .analytics import read_snapshot, read_history
+from .downloads import FileDownloadMixin, LINK_AUTHENTICATION_CLASSES
+from .exports import export_response
+from .similarity import similar_proposals
+from .uploads import ChunkedUploadMixin, UPLOAD_ACTIONS
 from rest_framework.views import APIView
 from rest_framework.response import Response
 from rest_framework.permissions import IsAdminUser
-from submissions.models import Submission
-from evaluations.models import Evaluation
-from django.db.models import Avg
+from rest_framework.decorators import action
+from rest_framework.exceptions import NotFound, ValidationError
 
 
 class IsStudentOrReadOnly(permissions.BasePermission):
@@ -37,20 +43,62 @@ class IsSupervisorOrAdmin(permissions.BasePermission):
         ]
 
 
-class ProjectProposalViewSet(viewsets.ModelViewSet):
+class ProjectProposalViewSet(
+    EagerLoadingMixin, ChunkedUploadMixin, FileDownloadMixin, viewsets.ModelViewSet
+):
     queryset = ProjectProposal.objects.all().order_by("-submitted_at")
     serializer_class = ProjectProposalSerializer
+    cursor_ordering = ("-submitted_at", "-id")
+    chunked_upload_field = "document"
+    download_field = "document"
 
     def get_permissions(self):
-        if self.action in ["update", "partial_update", "destroy"]:
+        if self.action in ["update", "partial_update", "destroy", "similar"]:
             return [IsSupervisorOrAdmin()]
-        elif self.action == "create":
+        elif self.action == "create" or self.action in UPLOAD_ACTIONS:
             return [IsStudentOrReadOnly()]
         return [permissions.IsAuthenticated()]
 
     def perform_create(self, serializer):
         serializer.save(student=self.request.user)
 
+    @action(detail=True, methods=["get"])
+    def similar(self, request, pk=None):
+        """The archived proposals closest to this one, most similar first.
+
+        Searches every proposal, not just the reviewer's own, since overlap
+        with any past work matters. ``?k=`` sets how many (default 5).
+        """
+        try:
+            k = min(max(int(request.query_params.get("k", 5)), 1), 50)
+        except ValueError:
+            raise ValidationError({"k": ["A whole number is required."]})
+        scored = similar_proposals(self.get_object(), k)
+        if scored is None:
+            response = Response(
+                {"detail": "This proposal is still being indexed; try again shortly."},
+                status=status.HTTP_503_SERVICE_UNAVAILABLE,
+            )
+            response["Retry-After"] = "60"
+            return response
+        proposals = ProjectProposal.objects.select_related("student").in_bulk(
+            [proposal_id for _, proposal_id in scored]
+        )
+        return Response(
+            [
+                {
+                    "id": proposal_id,
+                    "title": proposals[proposal_id].title,
+                    "student_email": proposals[proposal_id].student.email,
+                    "status": proposals[proposal_id].status,
+                    "submitted_at": proposals[proposal_id].submitted_at,
+                    "similarity": round(score, 3),
+                }
+                for score, proposal_id in scored
+                if proposal_id in proposals
+            ]
+        )
+
     def get_queryset(self):
         user = self.request.user
         if user.role == "student":
@@ -60,27 +108,58 @@ class ProjectProposalViewSet(viewsets.ModelViewSet):
         return ProjectProposal.objects.all()
 
 
-class ProjectViewSet(viewsets.ModelViewSet):
+class ProjectViewSet(ResponseCacheMixin, EagerLoadingMixin, viewsets.ModelViewSet):
     queryset = Project.objects.all().order_by("-start_date")
     serializer_class = ProjectSerializer
+    cursor_ordering = ("-id",)
+    cache_dependencies = ("fyps.project", "fyps.projectproposal", "fyps.milestone")
 
     def get_permissions(self):
-        if self.action in ["create", "update", "partial_update", "destroy"]:
+        if self.action in [
+            "create",
+            "update",
+            "partial_update",
+            "destroy",
+            "export",
+            "export_all",
+        ]:
             return [IsSupervisorOrAdmin()]
         return [permissions.IsAuthenticated()]
 
     def get_queryset(self):
         user = self.request.user
-        if user.role == "student":
-            return Project.objects.filter(students=user)
-        elif user.role == "supervisor":
-            return Project.objects.filter(supervisor=user)
+        if user.role in ("student", "supervisor"):
+            return Project.objects.filter(id__in=accessible_project_ids(user))
         return Project.objects.all()
 
-
-class MilestoneViewSet(viewsets.ModelViewSet):
+    @action(
+        detail=True,
+        methods=["get"],
+        authentication_classes=LINK_AUTHENTICATION_CLASSES,
+    )
+    def export(self, request, pk=None):
+        """Stream a ZIP of the project's submissions and latest documents."""
+        projects = self.get_queryset().filter(pk=pk)
+        if not projects.exists():
+            raise NotFound()
+        return export_response(projects, f"project-{pk}.zip")
+
+    @action(
+        detail=False,
+        methods=["get"],
+        url_path="export",
+        authentication_classes=LINK_AUTHENTICATION_CLASSES,
+    )
+    def export_all(self, request):
+        """The same for every project the user supervises (admins: all)."""
+        return export_response(self.get_queryset(), "projects.zip")
+
+
+class MilestoneViewSet(ResponseCacheMixin, EagerLoadingMixin, viewsets.ModelViewSet):
     queryset = Milestone.objects.all().order_by("due_date")
     serializer_class = MilestoneSerializer
+    cursor_ordering = ("due_date", "id")
+    cache_dependencies = ("fyps.milestone", "fyps.project")
 
     def get_permissions(self):
         if self.action in ["create", "update", "partial_update", "destroy"]:
@@ -89,24 +168,29 @@ class MilestoneViewSet(viewsets.ModelViewSet):
 
     def get_queryset(self):
         user = self.request.user
-        if user.role == "student":
-            return Milestone.objects.filter(project__students=user)
-        elif user.role == "supervisor":
-            return Milestone.objects.filter(project__supervisor=user)
+        if user.role in ("student", "supervisor"):
+            return Milestone.objects.filter(project_id__in=accessible_project_ids(user))
         return Milestone.objects.all()
 
 
-class DocumentViewSet(viewsets.ModelViewSet):
+class DocumentViewSet(
+    ResponseCacheMixin,
+    EagerLoadingMixin,
+    ChunkedUploadMixin,
+    FileDownloadMixin,
+    viewsets.ModelViewSet,
+):
     queryset = Document.objects.all().order_by("-uploaded_at")
     serializer_class = DocumentSerializer
+    cursor_ordering = ("-uploaded_at", "-id")
+    cache_dependencies = ("fyps.document", "fyps.project", "users.user")
+    download_name_field = "name"
     permission_classes = [permissions.IsAuthenticated]
 
     def get_queryset(self):
         user = self.request.user
-        if user.role == "student":
-            return Document.objects.filter(project__students=user)
-        elif user.role == "supervisor":
-            return Document.objects.filter(project__supervisor=user)
+        if user.role in ("student", "supervisor"):
+            return Document.objects.filter(project_id__in=accessible_project_ids(user))
         return Document.objects.all()
 
     def perform_create(self, serializer):
@@ -117,49 +201,15 @@ class AdminAnalyticsView(APIView):
     permission_classes = [IsAdminUser]
 
     def get(self, request):
-        # User stats
-        user_counts = {
-            role: User.objects.filter(role=role).count()
-            for role, _ in User.ROLE_CHOICES
-        }
-        # Project stats
-        project_counts = {
-            status: Project.objects.filter(status=status).count()
-            for status, _ in Project.STATUS_CHOICES
-        }
-        # Proposal stats
-        proposal_counts = {
-            status: ProjectProposal.objects.filter(status=status).count()
-            for status, _ in ProjectProposal.STATUS_CHOICES
-        }
-        # Milestone stats
-        milestone_counts = {
-            status: Milestone.objects.filter(status=status).count()
-            for status, _ in Milestone.STATUS_CHOICES
-        }
-        # Document stats
-        document_counts = {
-            doc_type: Document.objects.filter(type=doc_type).count()
-            for doc_type, _ in Document.DOCUMENT_TYPES
-        }
-        # Submission stats
-        total_submissions = Submission.objects.count()
-        # Evaluation stats
-        avg_evaluation_score = Evaluation.objects.aggregate(avg=Avg("total_score"))[
-            "avg"
-        ]
-        # Overdue milestones
-        overdue_milestones = Milestone.objects.filter(status="overdue").count()
+        return Response(read_snapshot())
 
-        return Response(
-            {
-                "user_counts": user_counts,
-                "project_counts": project_counts,
-                "proposal_counts": proposal_counts,
-                "milestone_counts": milestone_counts,
-                "document_counts": document_counts,
-                "total_submissions": total_submissions,
-                "avg_evaluation_score": avg_evaluation_score,
-                "overdue_milestones": overdue_milestones,
-            }
-        )
+
+class AdminAnalyticsHistoryView(APIView):
+    permission_classes = [IsAdminUser]
+
+    def get(self, request):
+        try:
+            days = max(1, min(int(request.query_params.get("days", 30)), 366))
+        except ValueError:
+            days = 30
+        return Response(read_history(days))
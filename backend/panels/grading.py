@@ -0,0 +1,60 @@
+from django.db import transaction
+from django.db.models import Sum
+from django.utils import timezone
+from evaluations.models import Evaluation
+from evaluations.stats import forget_rubric_stats
+from fyps.analytics import bump_counter, bump_daily
+
+UPDATE_FIELDS = ["rubric", "scores", "total_score", "comments", "updated_at"]
+
+
+@transaction.atomic
+def save_grades(session, evaluator, entries):
+    """Upsert ``evaluator``'s validated grades for ``session`` in one statement.
+
+    Grades replace the evaluator's earlier evaluation of the same project
+    through ``INSERT ... ON CONFLICT (project, evaluator) DO UPDATE``. Bulk
+    writes send no signals, so the analytics counters and cached rubric
+    statistics are adjusted here. Returns one result per entry, in order.
+    """
+    project_ids = [entry["project"] for entry in entries]
+    previous = Evaluation.objects.filter(
+        evaluator=evaluator, project_id__in=project_ids
+    )
+    updated = set(previous.values_list("project_id", flat=True))
+    previous_total = previous.aggregate(total=Sum("total_score"))["total"] or 0
+    rubric_ids = {session.rubric_id, *previous.values_list("rubric_id", flat=True)}
+
+    evaluations = Evaluation.objects.bulk_create(
+        [
+            Evaluation(
+                project_id=entry["project"],
+                evaluator=evaluator,
+                rubric_id=session.rubric_id,
+                scores=entry["scores"],
+                total_score=entry["total_score"],
+                comments=entry["comments"],
+            )
+            for entry in entries
+        ],
+        update_conflicts=True,
+        unique_fields=["project", "evaluator"],
+        update_fields=UPDATE_FIELDS,
+    )
+
+    created = len(entries) - len(updated)
+    total = sum(entry["total_score"] for entry in entries)
+    bump_counter("evaluations", count=created, total=total - previous_total)
+    if created:
+        bump_daily("evaluations", timezone.localdate(), count=created)
+    forget_rubric_stats(rubric_ids)
+    return [
+        {
+            "index": index,
+            "id": evaluation.pk,
+            "project": evaluation.project_id,
+            "total_score": evaluation.total_score,
+            "status": "updated" if evaluation.project_id in updated else "created",
+        }
+        for index, evaluation in enumerate(evaluations)
+    ]
@@ -0,0 +1,35 @@
+# Generated by Django 5.1.15 on 2026-10-18 07:20
+
+import django.db.models.deletion
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    initial = True
+
+    dependencies = [
+        ('evaluations', '0004_evaluation_updated_at_and_more'),
+        ('fyps', '0013_proposal_similarity'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='PanelSession',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('name', models.CharField(max_length=255)),
+                ('scheduled_for', models.DateField()),
+                ('created_at', models.DateTimeField(auto_now_add=True)),
+                ('members', models.ManyToManyField(related_name='panel_sessions', to=settings.AUTH_USER_MODEL)),
+                ('projects', models.ManyToManyField(related_name='panel_sessions', to='fyps.project')),
+                ('rubric', models.ForeignKey(on_delete=django.db.models.deletion.PROTECT, related_name='panel_sessions', to='evaluations.evaluationrubric')),
+            ],
+            options={
+                'ordering': ['-scheduled_for', '-id'],
+                'indexes': [models.Index(fields=['scheduled_for', 'id'], name='panel_scheduled_idx')],
+            },
+        ),
+    ]
@@ -0,0 +1,26 @@
+from django.db import models
+from users.models import User
+from fyps.models import Project
+from evaluations.models import EvaluationRubric
+
+
+class PanelSession(models.Model):
+    """A sitting in which a panel grades a set of projects with one rubric."""
+
+    name = models.CharField(max_length=255)
+    rubric = models.ForeignKey(
+        EvaluationRubric, on_delete=models.PROTECT, related_name="panel_sessions"
+    )
+    scheduled_for = models.DateField()
+    members = models.ManyToManyField(User, related_name="panel_sessions")
+    projects = models.ManyToManyField(Project, related_name="panel_sessions")
+    created_at = models.DateTimeField(auto_now_add=True)
+
+    class Meta:
+        ordering = ["-scheduled_for", "-id"]
+        indexes = [
+            models.Index(fields=["scheduled_for", "id"], name="panel_scheduled_idx"),
+        ]
+
+    def __str__(self):
+        return f"{self.name} ({self.scheduled_for})"
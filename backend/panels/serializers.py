@@ -0,0 +1,53 @@
+from rest_framework import serializers
+from evaluations.rubrics import score
+from .models import PanelSession
+
+MAX_ENTRIES = 500
+
+
+class PanelSessionSerializer(serializers.ModelSerializer):
+    class Meta:
+        model = PanelSession
+        fields = [
+            "id",
+            "name",
+            "rubric",
+            "scheduled_for",
+            "members",
+            "projects",
+            "created_at",
+        ]
+        read_only_fields = ["created_at"]
+
+
+class PanelEntrySerializer(serializers.Serializer):
+    """One grade; checked against the session in the serializer context."""
+
+    project = serializers.IntegerField()
+    scores = serializers.JSONField()
+    comments = serializers.CharField(allow_blank=True, default="")
+
+    def validate_project(self, value):
+        if value not in self.context["project_ids"]:
+            raise serializers.ValidationError("This project is not on the panel.")
+        return value
+
+    def validate(self, attrs):
+        attrs["scores"], attrs["total_score"] = score(
+            self.context["criteria"], attrs["scores"]
+        )
+        return attrs
+
+
+class PanelGradesSerializer(serializers.Serializer):
+    entries = PanelEntrySerializer(many=True, allow_empty=False, max_length=MAX_ENTRIES)
+
+    def validate_entries(self, entries):
+        seen = set()
+        for entry in entries:
+            if entry["project"] in seen:
+                raise serializers.ValidationError(
+                    f"Project {entry['project']} is graded more than once."
+                )
+            seen.add(entry["project"])
+        return entries
@@ -0,0 +1,129 @@
+import datetime
+
+from django.test import TestCase
+from rest_framework.test import APIClient
+from users.models import User
+from fyps.analytics import read_snapshot, rebuild_snapshot
+from fyps.models import Project, ProjectProposal
+from evaluations.models import Evaluation, EvaluationRubric
+from panels.models import PanelSession
+
+
+class PanelGradesTests(TestCase):
+    def setUp(self):
+        self.admin = User.objects.create_user(email="admin@example.com", role="admin")
+        self.examiner = User.objects.create_user(
+            email="examiner@example.com", role="supervisor"
+        )
+        self.outsider = User.objects.create_user(
+            email="outsider@example.com", role="supervisor"
+        )
+        self.rubric = EvaluationRubric.objects.create(
+            name="Defense",
+            criteria=[{"name": "Demo", "max": 10}, {"name": "Viva", "max": 10}],
+            max_score=20,
+        )
+        self.projects = [self.create_project(index) for index in range(3)]
+        self.session = PanelSession.objects.create(
+            name="Defense day",
+            rubric=self.rubric,
+            scheduled_for=datetime.date.today(),
+        )
+        self.session.members.add(self.examiner)
+        self.session.projects.add(*self.projects[:2])
+        self.client = APIClient()
+        self.client.force_authenticate(self.examiner)
+        self.url = f"/api/panels/sessions/{self.session.id}/grades/"
+
+    def create_project(self, index):
+        student = User.objects.create_user(email=f"student{index}@example.com")
+        proposal = ProjectProposal.objects.create(
+            title=f"Proposal {index}",
+            description="",
+            document="proposals/p.pdf",
+            status="approved",
+            student=student,
+            supervisor=self.admin,
+        )
+        return Project.objects.create(
+            proposal=proposal, title=f"Project {index}", description=""
+        )
+
+    def entry(self, project, demo, viva, comments=""):
+        return {
+            "project": project.id,
+            "scores": [
+                {"name": "Demo", "score": demo},
+                {"name": "Viva", "score": viva},
+            ],
+            "comments": comments,
+        }
+
+    def test_grades_are_upserted_in_one_request(self):
+        first, second, _ = self.projects
+        Evaluation.objects.create(
+            project=first,
+            evaluator=self.examiner,
+            scores=[],
+            total_score=3,
+        )
+        rebuild_snapshot()
+        response = self.client.post(
+            self.url,
+            {
+                "entries": [
+                    self.entry(first, 8, 9, "Great"),
+                    self.entry(second, 5, 6),
+                ]
+            },
+            format="json",
+        )
+        self.assertEqual(response.status_code, 200)
+        results = response.data["results"]
+        self.assertEqual([row["status"] for row in results], ["updated", "created"])
+        self.assertEqual([row["total_score"] for row in results], [17, 11])
+
+        self.assertEqual(Evaluation.objects.count(), 2)
+        updated = Evaluation.objects.get(project=first)
+        self.assertEqual(updated.id, results[0]["id"])
+        self.assertEqual(updated.rubric, self.rubric)
+        self.assertEqual(updated.comments, "Great")
+        # The snapshot counters follow the bulk write: (17 + 11) / 2.
+        self.assertEqual(read_snapshot()["avg_evaluation_score"], 14)
+
+    def test_one_invalid_entry_saves_nothing(self):
+        first, second, outside = self.projects
+        response = self.client.post(
+            self.url,
+            {
+                "entries": [
+                    self.entry(first, 8, 9),
+                    self.entry(second, 12, 9),
+                    self.entry(outside, 1, 1),
+                ]
+            },
+            format="json",
+        )
+        self.assertEqual(response.status_code, 400)
+        errors = response.data["entries"]
+        self.assertEqual(errors[0], {})
+        self.assertIn("scores", errors[1])
+        self.assertIn("project", errors[2])
+        self.assertFalse(Evaluation.objects.exists())
+
+    def test_duplicate_projects_are_rejected(self):
+        first = self.projects[0]
+        response = self.client.post(
+            self.url,
+            {"entries": [self.entry(first, 1, 1), self.entry(first, 2, 2)]},
+            format="json",
+        )
+        self.assertEqual(response.status_code, 400)
+        self.assertFalse(Evaluation.objects.exists())
+
+    def test_only_panel_members_can_grade(self):
+        self.client.force_authenticate(self.outsider)
+        response = self.client.post(
+            self.url, {"entries": [self.entry(self.projects[0], 1, 1)]}, format="json"
+        )
+        self.assertEqual(response.status_code, 404)
@@ -0,0 +1,7 @@
+from rest_framework.routers import DefaultRouter
+from .views import PanelSessionViewSet
+
+router = DefaultRouter()
+router.register(r"sessions", PanelSessionViewSet, basename="panel-session")
+
+urlpatterns = router.urls
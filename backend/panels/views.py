@@ -0,0 +1,45 @@
+from rest_framework import viewsets
+from rest_framework.decorators import action
+from rest_framework.response import Response
+from core.querysets import EagerLoadingMixin
+from evaluations.rubrics import compiled_rubric
+from evaluations.views import IsAdminOrReadOnly
+from fyps.views import IsSupervisorOrAdmin
+from .grading import save_grades
+from .models import PanelSession
+from .serializers import PanelGradesSerializer, PanelSessionSerializer
+
+
+class PanelSessionViewSet(EagerLoadingMixin, viewsets.ModelViewSet):
+    queryset = PanelSession.objects.all()
+    serializer_class = PanelSessionSerializer
+    cursor_ordering = ("-scheduled_for", "-id")
+    permission_classes = [IsAdminOrReadOnly]
+
+    def get_queryset(self):
+        user = self.request.user
+        if user.role in ("student", "supervisor"):
+            return PanelSession.objects.filter(members=user)
+        return PanelSession.objects.all()
+
+    @action(detail=True, methods=["post"], permission_classes=[IsSupervisorOrAdmin])
+    def grades(self, request, pk=None):
+        """Grade many projects of the session at once.
+
+        Takes ``{"entries": [{"project", "scores", "comments"}]}``. Every entry
+        is validated against the session's rubric first; if any fails, nothing
+        is saved and the errors come back per entry, in order. Otherwise all
+        grades are upserted together as the signed-in evaluator's.
+        """
+        session = self.get_object()
+        serializer = PanelGradesSerializer(
+            data=request.data,
+            context={
+                "criteria": compiled_rubric(session.rubric),
+                "project_ids": set(session.projects.values_list("id", flat=True)),
+            },
+        )
+        serializer.is_valid(raise_exception=True)
+        entries = serializer.validated_data["entries"]
+        results = save_grades(session, request.user, entries)
+        return Response({"results": results})
@@ -0,0 +1,28 @@
+# Generated by Django 5.1.15 on 2026-10-18 06:45
+
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('fyps', '0007_document_document_project_idx_and_more'),
+        ('submissions', '0002_feedbackmessage_feedback_msg_created_idx_and_more'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='feedbackmessage',
+            index=models.Index(fields=['thread', 'created_at', 'id'], name='feedback_msg_thread_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='submission',
+            index=models.Index(fields=['student', 'submitted_at', 'id'], name='submission_student_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='submission',
+            index=models.Index(fields=['project', 'submitted_at', 'id'], name='submission_project_idx'),
+        ),
+    ]
@@ -0,0 +1,34 @@
+# Generated by Django 5.1.15 on 2026-10-18 07:07
+
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('fyps', '0010_tombstone_updated_at'),
+        ('submissions', '0003_feedbackmessage_feedback_msg_thread_idx_and_more'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='feedbackmessage',
+            name='updated_at',
+            field=models.DateTimeField(auto_now=True),
+        ),
+        migrations.AddField(
+            model_name='submission',
+            name='updated_at',
+            field=models.DateTimeField(auto_now=True),
+        ),
+        migrations.AddIndex(
+            model_name='feedbackmessage',
+            index=models.Index(fields=['updated_at', 'id'], name='feedback_msg_updated_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='submission',
+            index=models.Index(fields=['updated_at', 'id'], name='submission_updated_idx'),
+        ),
+    ]
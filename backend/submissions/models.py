@@ -13,6 +13,21 @@ class Submission(models.Model):
         Project, on_delete=models.CASCADE, related_name="submissions"
     )
     submitted_at = models.DateTimeField(auto_now_add=True)
+    updated_at = models.DateTimeField(auto_now=True)
+
+    class Meta:
+        indexes = [
+            models.Index(fields=["updated_at", "id"], name="submission_updated_idx"),
+            models.Index(
+                fields=["submitted_at", "id"], name="submission_submitted_idx"
+            ),
+            models.Index(
+                fields=["student", "submitted_at", "id"], name="submission_student_idx"
+            ),
+            models.Index(
+                fields=["project", "submitted_at", "id"], name="submission_project_idx"
+            ),
+        ]
 
     def __str__(self):
         return f"{self.title} ({self.student.email})"
@@ -34,6 +49,16 @@ class FeedbackMessage(models.Model):
     sender = models.ForeignKey(User, on_delete=models.CASCADE)
     message = models.TextField()
     created_at = models.DateTimeField(auto_now_add=True)
+    updated_at = models.DateTimeField(auto_now=True)
+
+    class Meta:
+        indexes = [
+            models.Index(fields=["updated_at", "id"], name="feedback_msg_updated_idx"),
+            models.Index(fields=["created_at", "id"], name="feedback_msg_created_idx"),
+            models.Index(
+                fields=["thread", "created_at", "id"], name="feedback_msg_thread_idx"
+            ),
+        ]
 
     def __str__(self):
         return f"{self.sender.email}: {self.message[:30]}..."
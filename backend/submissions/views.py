@@ -1,34 +1,35 @@
 from rest_framework import viewsets, permissions
+from core.querysets import EagerLoadingMixin
 from .models import Submission, FeedbackThread, FeedbackMessage
 from .serializers import (
     SubmissionSerializer,
     FeedbackThreadSerializer,
     FeedbackMessageSerializer,
 )
-from fyps.models import Project
+from fyps.access import accessible_project_ids
+from fyps.downloads import FileDownloadMixin
+from fyps.uploads import ChunkedUploadMixin
 
 
 class IsStudentOrSupervisorOnProject(permissions.BasePermission):
     def has_permission(self, request, view):
         if request.method in permissions.SAFE_METHODS:
             return True
-        project_id = request.data.get("project")
-        if not project_id:
-            return False
         try:
-            project = Project.objects.get(id=project_id)
-        except Project.DoesNotExist:
+            project_id = int(request.data.get("project"))
+        except (TypeError, ValueError):
             return False
-        if request.user.role == "student" and request.user in project.students.all():
-            return True
-        if request.user.role == "supervisor" and request.user == project.supervisor:
-            return True
-        return False
+        if request.user.role not in ("student", "supervisor"):
+            return False
+        return project_id in accessible_project_ids(request.user)
 
 
-class SubmissionViewSet(viewsets.ModelViewSet):
+class SubmissionViewSet(
+    EagerLoadingMixin, ChunkedUploadMixin, FileDownloadMixin, viewsets.ModelViewSet
+):
     queryset = Submission.objects.all().order_by("-submitted_at")
     serializer_class = SubmissionSerializer
+    cursor_ordering = ("-submitted_at", "-id")
     permission_classes = [permissions.IsAuthenticated]
 
     def perform_create(self, serializer):
@@ -39,19 +40,23 @@ class SubmissionViewSet(viewsets.ModelViewSet):
         if user.role == "student":
             return Submission.objects.filter(student=user)
         elif user.role == "supervisor":
-            return Submission.objects.filter(project__supervisor=user)
+            return Submission.objects.filter(
+                project_id__in=accessible_project_ids(user)
+            )
         return Submission.objects.all()
 
 
-class FeedbackThreadViewSet(viewsets.ReadOnlyModelViewSet):
+class FeedbackThreadViewSet(EagerLoadingMixin, viewsets.ReadOnlyModelViewSet):
     queryset = FeedbackThread.objects.all()
     serializer_class = FeedbackThreadSerializer
+    cursor_ordering = ("-id",)
     permission_classes = [permissions.IsAuthenticated]
 
 
-class FeedbackMessageViewSet(viewsets.ModelViewSet):
+class FeedbackMessageViewSet(EagerLoadingMixin, viewsets.ModelViewSet):
     queryset = FeedbackMessage.objects.all().order_by("created_at")
     serializer_class = FeedbackMessageSerializer
+    cursor_ordering = ("created_at", "id")
     permission_classes = [permissions.IsAuthenticated, IsStudentOrSupervisorOnProject]
 
     def perform_create(self, serializer):
@@ -63,6 +68,6 @@ class FeedbackMessageViewSet(viewsets.ModelViewSet):
             return FeedbackMessage.objects.filter(thread__submission__student=user)
         elif user.role == "supervisor":
             return FeedbackMessage.objects.filter(
-                thread__submission__project__supervisor=user
+                thread__submission__project_id__in=accessible_project_ids(user)
             )
         return FeedbackMessage.objects.all()
@@ -1,8 +1,79 @@
+import time
+
+from django.conf import settings
+from django.core import signing
+from django.core.cache import cache
+from django.db import transaction
 from rest_framework_simplejwt.authentication import JWTAuthentication
+from rest_framework_simplejwt.settings import api_settings
+from rest_framework.authentication import BaseAuthentication
 from rest_framework.exceptions import AuthenticationFailed
+from .models import User
+
+LINK_SALT = "users.download-link"
+
+
+def cached_user_key(user_id, jti):
+    return f"auth:user:{user_id}:{jti}"
+
+
+def user_generation_key(user_id):
+    return f"auth:generation:{user_id}"
+
+
+def forget_cached_user(user_id):
+    """Invalidate every cached token resolution for ``user_id``.
+
+    Entries are keyed per token, so instead of finding them all the user's
+    generation moves on and older entries stop matching. It only has to
+    outlive the entries, which share its TTL. The bump is repeated on commit
+    so a lookup made before the change was visible does not linger.
+    """
+
+    def bump():
+        cache.set(
+            user_generation_key(user_id),
+            time.time_ns(),
+            settings.AUTH_USER_CACHE_TTL,
+        )
+
+    bump()
+    transaction.on_commit(bump)
+
+
+class CachedJWTAuthentication(JWTAuthentication):
+    """``JWTAuthentication`` that resolves the token's user from the cache.
+
+    A valid token whose user was resolved in the last
+    ``AUTH_USER_CACHE_TTL`` seconds costs no query; a cold cache falls back
+    to the database lookup and fills it.
+
+    Deactivating a user or changing their role drops their entries only in
+    the cache the write ran against, hence the shared cache required with
+    several workers. The TTL is the revocation window: a worker that missed
+    the drop keeps authenticating the old user object until it expires.
+    """
 
+    def get_user(self, validated_token):
+        user_id = validated_token.get(api_settings.USER_ID_CLAIM)
+        jti = validated_token.get(api_settings.JTI_CLAIM)
+        if user_id is None or jti is None:
+            return super().get_user(validated_token)
 
-class CookiesJWTAuthentication(JWTAuthentication):
+        key = cached_user_key(user_id, jti)
+        generation_key = user_generation_key(user_id)
+        cached = cache.get_many([key, generation_key])
+        generation = cached.get(generation_key, 0)
+        entry = cached.get(key)
+        if entry is not None and entry[0] == generation:
+            return entry[1]
+
+        user = super().get_user(validated_token)
+        cache.set(key, (generation, user), settings.AUTH_USER_CACHE_TTL)
+        return user
+
+
+class CookiesJWTAuthentication(CachedJWTAuthentication):
     def authenticate(self, request):
         access_token = request.COOKIES.get("access_token")
 
@@ -17,3 +88,49 @@ class CookiesJWTAuthentication(JWTAuthentication):
             return None
 
         return (user, validated_token)
+
+
+def sign_link(user, path):
+    """A token that authenticates ``user`` for GET requests to ``path`` only.
+
+    It expires after ``DOWNLOAD_LINK_MAX_AGE`` seconds, so a URL that ends up
+    in a log, the browser history or a Referer header is soon worthless.
+    """
+    return signing.TimestampSigner(salt=LINK_SALT).sign_object(
+        {"user": user.pk, "path": path}
+    )
+
+
+class SignedLinkAuthentication(BaseAuthentication):
+    """Read a ``sign_link`` token from the ``token`` query parameter.
+
+    Only for endpoints opened as plain links (file downloads and exports) or
+    by ``EventSource`` (the notification stream), where the browser cannot
+    attach an ``Authorization`` header. Unlike an
+    access token, the link token is bound to one path and short-lived.
+    """
+
+    def authenticate(self, request):
+        token = request.query_params.get("token")
+        if not token:
+            return None
+        return link_user(token, request.method, request.path), None
+
+
+def link_user(token, method, path):
+    """The active user a ``sign_link`` token authenticates for ``method path``.
+
+    Raises ``AuthenticationFailed`` for a forged, expired or misdirected token.
+    """
+    try:
+        claims = signing.TimestampSigner(salt=LINK_SALT).unsign_object(
+            token, max_age=settings.DOWNLOAD_LINK_MAX_AGE
+        )
+    except signing.BadSignature:
+        raise AuthenticationFailed("This link is invalid or has expired.")
+    if method != "GET" or claims.get("path") != path:
+        raise AuthenticationFailed("This link is not valid for this address.")
+    user = User.objects.filter(pk=claims.get("user"), is_active=True).first()
+    if user is None:
+        raise AuthenticationFailed("User not found or inactive.")
+    return user
@@ -0,0 +1,152 @@
+import csv
+import io
+import json
+import os
+import time
+from collections import Counter
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+
+from django.conf import settings
+from django.contrib.auth.hashers import make_password
+from django.core.exceptions import ValidationError
+from django.core.validators import validate_email
+from core.caching import bump_versions
+from fyps.analytics import bump_counter
+from .models import User
+
+FIELDS = ("email", "first_name", "last_name", "role", "password")
+ROLES = {role for role, _ in User.ROLE_CHOICES}
+BATCH_SIZE = 1000
+
+
+def read_rows(data, format):
+    """Parse CSV (with a header row) or a JSON list of objects into dicts."""
+    if isinstance(data, bytes):
+        data = data.decode("utf-8-sig")
+    if format == "json":
+        rows = json.loads(data)
+        if not isinstance(rows, list) or not all(isinstance(r, dict) for r in rows):
+            raise ValueError("Expected a JSON list of objects.")
+        return rows
+    if format == "csv":
+        return list(csv.DictReader(io.StringIO(data)))
+    raise ValueError(f"Unsupported format: {format}")
+
+
+def _init_worker():
+    # Spawned (not forked) workers start without Django configured.
+    import django
+
+    django.setup()
+
+
+def hash_passwords(passwords, workers=None, processes=False):
+    """Hash ``passwords`` on a pool of ``workers``, preserving order.
+
+    Django's PBKDF2 hasher runs in ``hashlib``, which releases the GIL, so a
+    bounded thread pool (default ``PROVISION_HASH_THREADS``) parallelizes it
+    inside a web worker. ``processes`` uses a process pool instead (default
+    one per CPU), for the management command only. Missing passwords become
+    unusable ones; those users set theirs by reset.
+    """
+    passwords = [password or None for password in passwords]
+    if processes:
+        workers = workers or os.cpu_count() or 1
+    else:
+        workers = workers or settings.PROVISION_HASH_THREADS
+    if workers == 1 or len(passwords) < 2:
+        return [make_password(password) for password in passwords]
+    if processes:
+        pool = ProcessPoolExecutor(max_workers=workers, initializer=_init_worker)
+    else:
+        pool = ThreadPoolExecutor(max_workers=workers)
+    with pool:
+        chunksize = max(1, len(passwords) // (workers * 4))
+        return list(pool.map(make_password, passwords, chunksize=chunksize))
+
+
+def _clean(row):
+    if not isinstance(row, dict):
+        raise ValidationError("Expected an object with an email.")
+    cleaned = {field: str(row.get(field) or "").strip() for field in FIELDS}
+    cleaned["password"] = str(row.get("password") or "")
+    cleaned["email"] = User.objects.normalize_email(cleaned["email"])
+    validate_email(cleaned["email"])
+    cleaned["role"] = cleaned["role"] or "student"
+    if cleaned["role"] not in ROLES:
+        raise ValidationError(f"Unknown role {cleaned['role']!r}.")
+    return cleaned
+
+
+def _insert(users, batch_size):
+    """Insert ``users`` in batches; returns how many rows were really added.
+
+    ``ignore_conflicts`` silently drops emails created concurrently, so each
+    batch's emails are looked up before and after the insert. Bulk inserts
+    send no signals, so the analytics counters and the ``users.user`` cache
+    stamp are adjusted here.
+    """
+    roles = Counter()
+    for start in range(0, len(users), batch_size):
+        batch = users[start : start + batch_size]
+        emails = User.objects.filter(email__in=[user.email for user in batch])
+        present = set(emails.values_list("email", flat=True))
+        User.objects.bulk_create(batch, ignore_conflicts=True)
+        inserted = set(emails.values_list("email", flat=True)) - present
+        roles.update(user.role for user in batch if user.email in inserted)
+    for role, count in roles.items():
+        bump_counter(f"user_counts.{role}", count=count)
+    if roles:
+        bump_versions(User._meta.label_lower)
+    return sum(roles.values())
+
+
+def provision_users(rows, batch_size=BATCH_SIZE, workers=None, processes=False):
+    """Create users from ``rows``, skipping emails that already exist.
+
+    Existing emails are loaded once into a set, so each row is checked with a
+    set lookup; duplicates within ``rows`` are skipped the same way. Passwords
+    are hashed as ``hash_passwords`` describes. Returns counts, per-row errors
+    and the hashing/insert throughput.
+    """
+    started = time.perf_counter()
+    existing = set(User.objects.values_list("email", flat=True))
+    accepted, errors, skipped = [], [], 0
+    for number, row in enumerate(rows, start=1):
+        try:
+            row = _clean(row)
+        except ValidationError as error:
+            errors.append({"row": number, "error": " ".join(error.messages)})
+            continue
+        if row["email"] in existing:
+            skipped += 1
+            continue
+        existing.add(row["email"])
+        accepted.append(row)
+
+    hashed_at = time.perf_counter()
+    passwords = hash_passwords(
+        [row.pop("password", "") for row in accepted], workers, processes
+    )
+    inserted_at = time.perf_counter()
+    created = _insert(
+        [
+            User(password=password, **row)
+            for row, password in zip(accepted, passwords)
+        ],
+        batch_size,
+    )
+    # Rows another request created meanwhile count as existing.
+    skipped += len(accepted) - created
+    finished = time.perf_counter()
+
+    seconds = finished - started
+    return {
+        "created": created,
+        "skipped": skipped,
+        "errors": errors,
+        "seconds": round(seconds, 3),
+        "hashing_seconds": round(inserted_at - hashed_at, 3),
+        "insert_seconds": round(finished - inserted_at, 3),
+        "users_per_second": round(created / seconds, 1) if seconds else None,
+    }
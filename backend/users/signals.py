@@ -0,0 +1,21 @@
+from django.db.models.signals import post_delete, post_save
+from core.caching import track_versions
+from rest_framework_simplejwt.token_blacklist.models import BlacklistedToken
+from .authentication import forget_cached_user
+from .models import User
+
+
+def forget_user(sender, instance, **kwargs):
+    forget_cached_user(instance.pk)
+
+
+def forget_blacklisted_token_user(sender, instance, created, **kwargs):
+    user_id = instance.token.user_id
+    if created and user_id is not None:
+        forget_cached_user(user_id)
+
+
+post_save.connect(forget_user, sender=User)
+post_delete.connect(forget_user, sender=User)
+post_save.connect(forget_blacklisted_token_user, sender=BlacklistedToken)
+track_versions(User)
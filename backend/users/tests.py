@@ -1,3 +1,154 @@
-from django.test import TestCase
+import io
+import json
+import tempfile
+from unittest import mock
 
-# Create your tests here.
+from django.core.cache import cache
+from django.core.files.uploadedfile import SimpleUploadedFile
+from django.core.management import call_command
+from django.test import RequestFactory, TestCase, override_settings
+from rest_framework.test import APIClient
+from rest_framework_simplejwt.tokens import RefreshToken
+from users.authentication import CookiesJWTAuthentication
+from users.models import User
+from users.provisioning import _insert, provision_users
+from fyps.analytics import read_snapshot, rebuild_snapshot
+
+
+class CachedJWTAuthenticationTests(TestCase):
+    def setUp(self):
+        cache.clear()
+        self.user = User.objects.create_user(email="student@example.com")
+        self.refresh = RefreshToken.for_user(self.user)
+        self.access = str(self.refresh.access_token)
+        self.client = APIClient()
+        self.client.credentials(HTTP_AUTHORIZATION=f"Bearer {self.access}")
+        self.url = "/api/announcements/notifications/unread_count/"
+
+    def test_warm_cache_resolves_user_without_queries(self):
+        self.assertEqual(self.client.get(self.url).status_code, 200)
+        with self.assertNumQueries(0):
+            self.assertEqual(self.client.get(self.url).status_code, 200)
+
+    def test_cookie_token_uses_the_same_cache(self):
+        self.client.get(self.url)
+        request = RequestFactory().get(self.url)
+        request.COOKIES["access_token"] = self.access
+        with self.assertNumQueries(0):
+            user, _ = CookiesJWTAuthentication().authenticate(request)
+        self.assertEqual(user, self.user)
+
+    def test_saving_the_user_invalidates(self):
+        self.client.get(self.url)
+        self.user.is_active = False
+        self.user.save()
+        self.assertEqual(self.client.get(self.url).status_code, 401)
+
+    def test_blacklisting_a_token_invalidates(self):
+        self.client.get(self.url)
+        self.refresh.blacklist()
+        with self.assertNumQueries(1):
+            self.client.get(self.url)
+
+
+@override_settings(PASSWORD_HASHERS=["django.contrib.auth.hashers.MD5PasswordHasher"])
+class ProvisioningTests(TestCase):
+    def setUp(self):
+        self.admin = User.objects.create_user(
+            email="admin@example.com", role="admin", is_staff=True
+        )
+        self.client = APIClient()
+        self.client.force_authenticate(self.admin)
+
+    def test_bulk_insert_skips_existing_emails(self):
+        rows = [
+            {"email": f"student{index}@example.com", "password": "secret"}
+            for index in range(50)
+        ]
+        rows.append({"email": "admin@example.com"})
+        # The existing emails, then per batch one INSERT between two email
+        # lookups, and one counter UPDATE per role.
+        with self.assertNumQueries(5):
+            result = provision_users(rows, workers=1)
+        self.assertEqual(result["created"], 50)
+        self.assertEqual(result["skipped"], 1)
+        user = User.objects.get(email="student7@example.com")
+        self.assertTrue(user.check_password("secret"))
+        self.assertEqual(user.role, "student")
+
+    def test_counts_only_inserted_rows_and_updates_analytics(self):
+        rebuild_snapshot()
+        # Created by someone else after provision_users read the existing
+        # emails: the insert skips the real row and does not count it.
+        with self.captureOnCommitCallbacks(execute=True):
+            User.objects.create_user(email="sara@example.com", role="supervisor")
+        users = [User(email=f"student{index}@example.com") for index in range(5)]
+        users.append(User(email="sara@example.com", role="supervisor"))
+        self.assertEqual(_insert(users, batch_size=4), 5)
+        self.assertEqual(User.objects.filter(email="sara@example.com").count(), 1)
+        counts = read_snapshot()["user_counts"]
+        self.assertEqual(counts["student"], 5)
+        self.assertEqual(counts["supervisor"], 1)  # the real row, counted once
+
+    def test_api_hashes_on_threads_and_caps_rows(self):
+        rows = [
+            {"email": f"t{index}@example.com", "password": "pw"} for index in range(3)
+        ]
+        with mock.patch("users.provisioning.ProcessPoolExecutor") as processes:
+            response = self.client.post("/api/users/provision/", rows, format="json")
+        processes.assert_not_called()
+        self.assertEqual(response.data["created"], 3)
+        self.assertTrue(User.objects.get(email="t2@example.com").check_password("pw"))
+
+        with override_settings(PROVISION_API_MAX_ROWS=2):
+            response = self.client.post("/api/users/provision/", rows, format="json")
+        self.assertEqual(response.status_code, 400)
+
+    def test_rows_must_be_objects(self):
+        response = self.client.post(
+            "/api/users/provision/",
+            ["x@y.com", {"email": "ok@example.com"}],
+            format="json",
+        )
+        self.assertEqual(response.status_code, 201)
+        self.assertEqual(response.data["created"], 1)
+        self.assertEqual(response.data["errors"][0]["row"], 1)
+
+    def test_csv_upload_through_the_admin_api(self):
+        data = (
+            "email,first_name,last_name,role,password\n"
+            "ali@example.com,Ali,Khan,student,pw1\n"
+            "ali@example.com,Ali,Khan,student,pw1\n"
+            "not-an-email,X,Y,student,pw\n"
+            "sara@example.com,Sara,Ahmed,supervisor,\n"
+        )
+        response = self.client.post(
+            "/api/users/provision/",
+            {"file": SimpleUploadedFile("users.csv", data.encode())},
+        )
+        self.assertEqual(response.status_code, 201)
+        self.assertEqual(response.data["created"], 2)
+        self.assertEqual(response.data["skipped"], 1)
+        self.assertEqual(response.data["errors"][0]["row"], 3)
+        sara = User.objects.get(email="sara@example.com")
+        self.assertEqual(sara.role, "supervisor")
+        self.assertFalse(sara.has_usable_password())
+
+        self.client.force_authenticate(sara)
+        response = self.client.post("/api/users/provision/", [], format="json")
+        self.assertEqual(response.status_code, 403)
+
+    def test_command_hashes_in_a_process_pool(self):
+        users = [
+            {"email": f"s{index}@example.com", "password": f"pw{index}"}
+            for index in range(8)
+        ]
+        with tempfile.NamedTemporaryFile("w", suffix=".json") as file:
+            json.dump(users, file)
+            file.flush()
+            out = io.StringIO()
+            call_command("provision_users", file.name, workers=2, stdout=out)
+        self.assertIn("Created 8 users", out.getvalue())
+        self.assertTrue(
+            User.objects.get(email="s5@example.com").check_password("pw5")
+        )
@@ -1,6 +1,7 @@
 from django.urls import path
-from .views import CurrentUserView
+from .views import CurrentUserView, ProvisionUsersView
 
 urlpatterns = [
     path("me/", CurrentUserView.as_view(), name="current-user"),
+    path("provision/", ProvisionUsersView.as_view(), name="provision-users"),
 ]
@@ -1,6 +1,12 @@
+import os
+
+from django.conf import settings
+from rest_framework import status
 from rest_framework.views import APIView
 from rest_framework.response import Response
-from rest_framework.permissions import IsAuthenticated
+from rest_framework.permissions import IsAdminUser, IsAuthenticated
+from rest_framework.exceptions import ValidationError
+from .provisioning import provision_users, read_rows
 from .serializers import UserSerializer
 
 
@@ -10,3 +16,38 @@ class CurrentUserView(APIView):
     def get(self, request):
         serializer = UserSerializer(request.user)
         return Response(serializer.data)
+
+
+class ProvisionUsersView(APIView):
+    """Bulk-create users from an uploaded CSV/JSON ``file`` or a JSON list.
+
+    At most ``PROVISION_API_MAX_ROWS`` rows, hashed on a bounded thread pool;
+    larger imports go through the ``provision_users`` command.
+    """
+
+    permission_classes = [IsAdminUser]
+
+    def post(self, request):
+        upload = request.FILES.get("file")
+        try:
+            if upload is not None:
+                format = request.data.get("format") or (
+                    os.path.splitext(upload.name)[1].lstrip(".").lower()
+                )
+                rows = read_rows(upload.read(), format)
+            elif isinstance(request.data, list):
+                rows = request.data
+            else:
+                rows = request.data.get("users")
+                if not isinstance(rows, list):
+                    raise ValueError("Send a file or a list of users.")
+        except ValueError as error:
+            raise ValidationError({"detail": str(error)})
+        if len(rows) > settings.PROVISION_API_MAX_ROWS:
+            raise ValidationError(
+                {
+                    "detail": f"At most {settings.PROVISION_API_MAX_ROWS} users per "
+                    "request; use the provision_users command for larger imports."
+                }
+            )
+        return Response(provision_users(rows), status=status.HTTP_201_CREATED)
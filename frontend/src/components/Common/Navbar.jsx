@@ -11,8 +11,11 @@ import {
   faBell,
 } from "@fortawesome/free-solid-svg-icons";
 import {
-  getNotifications,
+  getRecentNotifications,
+  getUnreadCount,
   markNotificationRead,
+  markAllNotificationsRead,
+  subscribeToNotifications,
 } from "../../services/announcements";
 
 const Navbar = () => {
@@ -61,35 +64,68 @@ const Navbar = () => {
     }
   };
 
-  const { user, logout } = useContext(AuthContext);
+  const { user, logout, accessToken } = useContext(AuthContext);
   const [notifications, setNotifications] = useState([]);
   const [showNotifications, setShowNotifications] = useState(false);
   const [notifError, setNotifError] = useState("");
-  const unreadCount = notifications.filter((n) => !n.read).length;
+  const [notificationsLoaded, setNotificationsLoaded] = useState(false);
+  const [unreadCount, setUnreadCount] = useState(0);
 
   useEffect(() => {
-    if (user) fetchNotifications();
+    if (!user || !accessToken) return;
+    getUnreadCount(accessToken)
+      .then(setUnreadCount)
+      .catch(() => setNotifError("Failed to load notifications"));
+    // New notifications are pushed by the server instead of re-fetched. A new
+    // access token closes the stream and reopens it with the new credentials.
+    return subscribeToNotifications(accessToken, {
+      onNotification: (notification) => {
+        setNotifications((current) => [notification, ...current]);
+        if (!notification.read) setUnreadCount((count) => count + 1);
+      },
+    });
+  }, [user, accessToken]);
+
+  // The list itself is only downloaded once the dropdown is opened.
+  useEffect(() => {
+    if (showNotifications && !notificationsLoaded) fetchNotifications();
     // eslint-disable-next-line
-  }, [user]);
+  }, [showNotifications]);
 
   const fetchNotifications = async () => {
     try {
       setNotifError("");
       const token =
         localStorage.getItem("access") || sessionStorage.getItem("access");
-      const data = await getNotifications(token);
+      const data = await getRecentNotifications(token);
       setNotifications(data);
+      setNotificationsLoaded(true);
     } catch (err) {
       setNotifError("Failed to load notifications");
     }
   };
 
+  const handleMarkAllRead = async () => {
+    try {
+      const token =
+        localStorage.getItem("access") || sessionStorage.getItem("access");
+      await markAllNotificationsRead(token);
+      setNotifications((current) => current.map((n) => ({ ...n, read: true })));
+      setUnreadCount(0);
+    } catch (err) {
+      setNotifError("Failed to mark as read");
+    }
+  };
+
   const handleMarkRead = async (id) => {
     try {
       const token =
         localStorage.getItem("access") || sessionStorage.getItem("access");
       await markNotificationRead(id, token);
-      fetchNotifications();
+      setNotifications((current) =>
+        current.map((n) => (n.id === id ? { ...n, read: true } : n))
+      );
+      setUnreadCount((count) => Math.max(0, count - 1));
     } catch (err) {
       setNotifError("Failed to mark as read");
     }
@@ -130,8 +166,16 @@ const Navbar = () => {
               </button>
               {showNotifications && (
                 <div className="absolute right-0 mt-2 w-80 bg-white shadow-lg rounded-md z-50 max-h-96 overflow-y-auto">
-                  <div className="p-2 border-b font-semibold">
+                  <div className="p-2 border-b font-semibold flex justify-between items-center">
                     Notifications
+                    {unreadCount > 0 && (
+                      <button
+                        onClick={handleMarkAllRead}
+                        className="text-xs font-normal text-blue-600"
+                      >
+                        Mark all as read
+                      </button>
+                    )}
                   </div>
                   {notifError && (
                     <div className="text-red-600 text-xs p-2">{notifError}</div>
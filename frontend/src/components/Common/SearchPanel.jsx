@@ -0,0 +1,64 @@
+import React, { useEffect, useState } from "react";
+import { search } from "../../services/search";
+
+const DEBOUNCE_MS = 250;
+
+// Snippets mark matched words with **; render them as <mark> without HTML.
+const Highlighted = ({ text }) =>
+  (text || "")
+    .split("**")
+    .map((part, index) =>
+      index % 2 ? <mark key={index}>{part}</mark> : part
+    );
+
+const SearchPanel = () => {
+  const [query, setQuery] = useState("");
+  const [results, setResults] = useState([]);
+  const [error, setError] = useState("");
+
+  useEffect(() => {
+    if (!query.trim()) {
+      setResults([]);
+      return undefined;
+    }
+    const timer = setTimeout(async () => {
+      try {
+        setError("");
+        const token =
+          localStorage.getItem("access") || sessionStorage.getItem("access");
+        setResults(await search(token, query));
+      } catch (err) {
+        setError("Search failed");
+      }
+    }, DEBOUNCE_MS);
+    return () => clearTimeout(timer);
+  }, [query]);
+
+  return (
+    <div className="bg-white rounded shadow p-4 mb-4">
+      <input
+        type="search"
+        className="w-full border rounded px-2 py-1"
+        placeholder="Search proposals, projects, documents and feedback..."
+        value={query}
+        onChange={(e) => setQuery(e.target.value)}
+      />
+      {error && <p className="text-red-600 text-sm">{error}</p>}
+      {results.length > 0 && (
+        <ul className="mt-2 space-y-2 text-sm">
+          {results.map((r) => (
+            <li key={`${r.kind}-${r.id}`}>
+              <span className="text-gray-500 mr-2">{r.kind}</span>
+              <span className="font-semibold">{r.title}</span>
+              <p className="text-gray-600">
+                <Highlighted text={r.snippet} />
+              </p>
+            </li>
+          ))}
+        </ul>
+      )}
+    </div>
+  );
+};
+
+export default SearchPanel;
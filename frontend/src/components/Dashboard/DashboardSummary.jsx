@@ -0,0 +1,124 @@
+import React, { useEffect, useState } from "react";
+import { getDashboard } from "../../services/dashboard";
+
+const DashboardSummary = () => {
+  const [summary, setSummary] = useState(null);
+  const [error, setError] = useState("");
+
+  useEffect(() => {
+    const token =
+      localStorage.getItem("access") || sessionStorage.getItem("access");
+    getDashboard(token)
+      .then(setSummary)
+      .catch(() => setError("Failed to load dashboard"));
+  }, []);
+
+  if (error) return <p className="text-red-600 text-sm">{error}</p>;
+  if (!summary) return <div>Loading...</div>;
+
+  const { counts } = summary;
+  const stats = [
+    { name: "Projects", value: counts.projects.total },
+    { name: "Pending Proposals", value: counts.proposals.pending },
+    { name: "Open Milestones", value: counts.milestones.pending },
+    { name: "Overdue Milestones", value: counts.milestones.overdue },
+    { name: "Submissions", value: counts.submissions },
+    { name: "Unread Notifications", value: counts.unread_notifications },
+    {
+      name: "Average Score",
+      value:
+        summary.average_score === null
+          ? "-"
+          : summary.average_score.toFixed(1),
+    },
+  ];
+
+  return (
+    <div className="space-y-6">
+      <div className="grid grid-cols-2 md:grid-cols-4 gap-4">
+        {stats.map((stat) => (
+          <div key={stat.name} className="bg-white rounded shadow p-4">
+            <h3 className="text-sm text-gray-500">{stat.name}</h3>
+            <p className="text-2xl font-semibold">{stat.value}</p>
+          </div>
+        ))}
+      </div>
+
+      <div className="bg-white rounded shadow p-4">
+        <h3 className="font-semibold mb-2">Upcoming Milestones</h3>
+        {summary.upcoming_milestones.length === 0 ? (
+          <p>No upcoming milestones.</p>
+        ) : (
+          <table className="w-full text-sm">
+            <thead>
+              <tr>
+                <th>Project</th>
+                <th>Title</th>
+                <th>Status</th>
+                <th>Due</th>
+              </tr>
+            </thead>
+            <tbody>
+              {summary.upcoming_milestones.map((m) => (
+                <tr key={m.id}>
+                  <td>{m.project__title}</td>
+                  <td>{m.title}</td>
+                  <td>{m.status}</td>
+                  <td>{m.due_date}</td>
+                </tr>
+              ))}
+            </tbody>
+          </table>
+        )}
+      </div>
+
+      <div className="bg-white rounded shadow p-4">
+        <h3 className="font-semibold mb-2">Latest Submissions</h3>
+        {summary.latest_submissions.length === 0 ? (
+          <p>No submissions yet.</p>
+        ) : (
+          <table className="w-full text-sm">
+            <thead>
+              <tr>
+                <th>Project</th>
+                <th>Title</th>
+                <th>Student</th>
+                <th>Submitted</th>
+              </tr>
+            </thead>
+            <tbody>
+              {summary.latest_submissions.map((s) => (
+                <tr key={s.id}>
+                  <td>{s.project__title}</td>
+                  <td>{s.title}</td>
+                  <td>{s.student__email}</td>
+                  <td>{new Date(s.submitted_at).toLocaleString()}</td>
+                </tr>
+              ))}
+            </tbody>
+          </table>
+        )}
+      </div>
+
+      <div className="bg-white rounded shadow p-4">
+        <h3 className="font-semibold mb-2">Unread Notifications</h3>
+        {summary.unread_notifications.length === 0 ? (
+          <p>You're all caught up.</p>
+        ) : (
+          <ul className="space-y-2 text-sm">
+            {summary.unread_notifications.map((n) => (
+              <li key={n.id}>
+                {n.message}{" "}
+                <span className="text-gray-500">
+                  {new Date(n.created_at).toLocaleString()}
+                </span>
+              </li>
+            ))}
+          </ul>
+        )}
+      </div>
+    </div>
+  );
+};
+
+export default DashboardSummary;
@@ -1,5 +1,6 @@
 import React, { createContext, useState, useEffect } from "react";
 import { loginUser, fetchUserProfile } from "../services/auth";
+import { clearSyncCache } from "../services/sync";
 export const AuthContext = createContext();
 
 const API_BASE =
@@ -52,6 +53,7 @@ export const AuthProvider = ({ children }) => {
     localStorage.removeItem("refresh");
     sessionStorage.removeItem("access");
     sessionStorage.removeItem("refresh");
+    clearSyncCache();
     setUser(null);
     setAccessToken(null);
     setRefreshToken(null);
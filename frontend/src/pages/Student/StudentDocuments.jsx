@@ -1,6 +1,13 @@
 import React, { useState, useContext, useEffect } from "react";
 import { AuthContext } from "../../contexts/AuthContext";
-import { getDocuments, uploadDocument } from "../../services/proposals";
+import {
+  getDocuments,
+  uploadDocument,
+  openDocumentDownload,
+} from "../../services/proposals";
+
+const accessToken = () =>
+  localStorage.getItem("access") || sessionStorage.getItem("access");
 
 const StudentDocuments = () => {
   const { user, isAuthenticated, loading } = useContext(AuthContext);
@@ -183,9 +190,17 @@ const StudentDocuments = () => {
                   <td>{d.uploaded_by_email}</td>
                   <td>{new Date(d.uploaded_at).toLocaleString()}</td>
                   <td>
-                    <a href={d.file} target="_blank" rel="noopener noreferrer">
+                    <button
+                      type="button"
+                      className="text-blue-600 underline"
+                      onClick={() =>
+                        openDocumentDownload(d.id, accessToken()).catch((err) =>
+                          setError(err.message)
+                        )
+                      }
+                    >
                       Download
-                    </a>
+                    </button>
                   </td>
                   <td>{d.description}</td>
                 </tr>
@@ -1,9 +1,20 @@
-import React from 'react'
+import React, { useContext } from "react";
+import { AuthContext } from "../../contexts/AuthContext";
+import DashboardSummary from "../../components/Dashboard/DashboardSummary";
 
 const StudentHome = () => {
+  const { user, isAuthenticated, loading } = useContext(AuthContext);
+
+  if (loading) return <div>Loading...</div>;
+  if (!isAuthenticated || user?.role !== "student")
+    return <div>Unauthorized</div>;
+
   return (
-    <div>StudentHome</div>
-  )
-}
+    <div className="max-w-4xl mx-auto py-8">
+      <h2 className="text-2xl font-bold mb-4">Dashboard</h2>
+      <DashboardSummary />
+    </div>
+  );
+};
 
-export default StudentHome
\ No newline at end of file
+export default StudentHome;
@@ -5,8 +5,12 @@ import {
   submitSubmission,
   getFeedbackThread,
   postFeedbackMessage,
+  openSubmissionDownload,
 } from "../../services/submissions";
 
+const accessToken = () =>
+  localStorage.getItem("access") || sessionStorage.getItem("access");
+
 const StudentSubmissions = () => {
   const { user, isAuthenticated, loading } = useContext(AuthContext);
   const [submissions, setSubmissions] = useState([]);
@@ -169,9 +173,17 @@ const StudentSubmissions = () => {
                   <td>{s.title}</td>
                   <td>{s.project}</td>
                   <td>
-                    <a href={s.file} target="_blank" rel="noopener noreferrer">
+                    <button
+                      type="button"
+                      className="text-blue-600 underline"
+                      onClick={() =>
+                        openSubmissionDownload(s.id, accessToken()).catch(
+                          (err) => setError(err.message)
+                        )
+                      }
+                    >
                       Download
-                    </a>
+                    </button>
                   </td>
                   <td>{new Date(s.submitted_at).toLocaleString()}</td>
                   <td>
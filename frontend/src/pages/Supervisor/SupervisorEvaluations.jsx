@@ -97,8 +97,6 @@ const SupervisorEvaluations = () => {
     setError("");
     setSuccess("");
     try {
-      const rubric = rubrics.find((r) => r.id === parseInt(selectedRubric));
-      const total = scores.reduce((sum, s) => sum + s.score, 0);
       const token =
         localStorage.getItem("access") || sessionStorage.getItem("access");
       await submitEvaluation(
@@ -106,7 +104,6 @@ const SupervisorEvaluations = () => {
           project: selectedProject,
           rubric: selectedRubric,
           scores,
-          total_score: total,
           comments,
         },
         token
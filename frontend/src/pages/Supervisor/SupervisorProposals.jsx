@@ -1,6 +1,11 @@
 import React, { useState, useContext, useEffect } from "react";
 import { AuthContext } from "../../contexts/AuthContext";
-import { getProposals, updateProposal } from "../../services/proposals";
+import {
+  getProposals,
+  getSimilarProposals,
+  updateProposal,
+} from "../../services/proposals";
+import SearchPanel from "../../components/Common/SearchPanel";
 
 const SupervisorProposals = () => {
   const { user, isAuthenticated, loading } = useContext(AuthContext);
@@ -9,6 +14,7 @@ const SupervisorProposals = () => {
   const [success, setSuccess] = useState("");
   const [updatingId, setUpdatingId] = useState(null);
   const [feedback, setFeedback] = useState({});
+  const [similar, setSimilar] = useState({});
 
   useEffect(() => {
     if (isAuthenticated && user) {
@@ -46,6 +52,18 @@ const SupervisorProposals = () => {
     }
   };
 
+  const handleSimilar = async (id) => {
+    setError("");
+    try {
+      const token =
+        localStorage.getItem("access") || sessionStorage.getItem("access");
+      const matches = await getSimilarProposals(id, token);
+      setSimilar((s) => ({ ...s, [id]: matches }));
+    } catch (err) {
+      setError("Failed to check for similar proposals");
+    }
+  };
+
   if (loading) return <div>Loading...</div>;
   if (!isAuthenticated || user?.role !== "supervisor")
     return <div>Unauthorized</div>;
@@ -53,6 +71,7 @@ const SupervisorProposals = () => {
   return (
     <div className="max-w-3xl mx-auto py-8">
       <h2 className="text-2xl font-bold mb-4">Project Proposals</h2>
+      <SearchPanel />
       {error && <p className="text-red-600 text-sm">{error}</p>}
       {success && <p className="text-green-600 text-sm">{success}</p>}
       <div className="bg-white rounded shadow p-4">
@@ -72,7 +91,20 @@ const SupervisorProposals = () => {
             <tbody>
               {proposals.map((p) => (
                 <tr key={p.id}>
-                  <td>{p.title}</td>
+                  <td>
+                    {p.title}
+                    {similar[p.id] && (
+                      <ul className="text-xs text-gray-600 mt-1">
+                        {similar[p.id].length === 0 && <li>No overlap found.</li>}
+                        {similar[p.id].map((s) => (
+                          <li key={s.id}>
+                            {Math.round(s.similarity * 100)}% {s.title} (
+                            {s.student_email})
+                          </li>
+                        ))}
+                      </ul>
+                    )}
+                  </td>
                   <td>{p.student}</td>
                   <td>{p.status}</td>
                   <td>
@@ -99,6 +131,12 @@ const SupervisorProposals = () => {
                     >
                       Reject
                     </button>
+                    <button
+                      className="bg-gray-600 text-white px-2 py-1 rounded ml-1"
+                      onClick={() => handleSimilar(p.id)}
+                    >
+                      Similar
+                    </button>
                   </td>
                 </tr>
               ))}
@@ -4,7 +4,12 @@ import {
   getSubmissions,
   getFeedbackThread,
   postFeedbackMessage,
+  openSubmissionDownload,
 } from "../../services/submissions";
+import { openProjectsExport } from "../../services/proposals";
+
+const accessToken = () =>
+  localStorage.getItem("access") || sessionStorage.getItem("access");
 
 const SupervisorSubmissions = () => {
   const { user, isAuthenticated, loading } = useContext(AuthContext);
@@ -73,7 +78,22 @@ const SupervisorSubmissions = () => {
       <h2 className="text-2xl font-bold mb-4">Project Submissions</h2>
       {error && <p className="text-red-600 text-sm">{error}</p>}
       <div className="bg-white rounded shadow p-4">
-        <h3 className="text-lg font-semibold mb-2">Submissions</h3>
+        <div className="flex justify-between items-center mb-2">
+          <h3 className="text-lg font-semibold">Submissions</h3>
+          {submissions.length > 0 && (
+            <button
+              type="button"
+              onClick={() =>
+                openProjectsExport(accessToken()).catch((err) =>
+                  setError(err.message)
+                )
+              }
+              className="text-blue-600 underline text-sm"
+            >
+              Download all (ZIP)
+            </button>
+          )}
+        </div>
         {submissions.length === 0 ? (
           <p>No submissions yet.</p>
         ) : (
@@ -95,9 +115,17 @@ const SupervisorSubmissions = () => {
                   <td>{s.student}</td>
                   <td>{s.project}</td>
                   <td>
-                    <a href={s.file} target="_blank" rel="noopener noreferrer">
+                    <button
+                      type="button"
+                      className="text-blue-600 underline"
+                      onClick={() =>
+                        openSubmissionDownload(s.id, accessToken()).catch(
+                          (err) => setError(err.message)
+                        )
+                      }
+                    >
                       Download
-                    </a>
+                    </button>
                   </td>
                   <td>{new Date(s.submitted_at).toLocaleString()}</td>
                   <td>
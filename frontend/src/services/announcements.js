@@ -1,11 +1,48 @@
+import { fetchAllPages, fetchPage } from "../utils/pagination";
+import { signLink } from "../utils/signedLink";
+
 const API_BASE =
   import.meta.env.VITE_API_BASE_URL || "http://localhost:8000/api";
 
 export const getNotifications = async (token) => {
-  const response = await fetch(`${API_BASE}/announcements/notifications/`, {
-    headers: { Authorization: `Bearer ${token}` },
-  });
-  if (!response.ok) throw new Error("Failed to fetch notifications");
+  return await fetchAllPages(
+    `${API_BASE}/announcements/notifications/`,
+    token,
+    "Failed to fetch notifications"
+  );
+};
+
+// Only the newest page, for the notification dropdown.
+export const getRecentNotifications = async (token) => {
+  const page = await fetchPage(
+    `${API_BASE}/announcements/notifications/`,
+    token,
+    "Failed to fetch notifications"
+  );
+  return page.results;
+};
+
+export const getUnreadCount = async (token) => {
+  const response = await fetch(
+    `${API_BASE}/announcements/notifications/unread_count/`,
+    {
+      headers: { Authorization: `Bearer ${token}` },
+    }
+  );
+  if (!response.ok) throw new Error("Failed to fetch unread count");
+  const data = await response.json();
+  return data.unread_count;
+};
+
+export const markAllNotificationsRead = async (token) => {
+  const response = await fetch(
+    `${API_BASE}/announcements/notifications/mark_all_read/`,
+    {
+      method: "POST",
+      headers: { Authorization: `Bearer ${token}` },
+    }
+  );
+  if (!response.ok) throw new Error("Failed to mark notifications as read");
   return await response.json();
 };
 
@@ -24,3 +61,54 @@ export const markNotificationRead = async (id, token) => {
   if (!response.ok) throw new Error("Failed to mark notification as read");
   return await response.json();
 };
+
+// Opens the server-sent event stream of new notifications and feedback
+// messages. Returns a function that closes the connection.
+//
+// EventSource cannot send the Authorization header, so the stream URL carries
+// a short-lived token signed for it. The browser reconnects dropped streams by
+// itself but gives up once the server answers with an error, e.g. after that
+// token has expired: the stream is then reopened with a freshly signed URL.
+// If signing fails the access token itself is stale; callers resubscribe with
+// the new one.
+const STREAM_REOPEN_DELAY = 5000;
+
+export const subscribeToNotifications = (token, handlers) => {
+  let source = null;
+  let reopen = null;
+  let closed = false;
+
+  const open = async () => {
+    let url;
+    try {
+      url = await signLink(
+        `${API_BASE}/announcements/stream/`,
+        token,
+        "Failed to open the notification stream"
+      );
+    } catch (err) {
+      handlers.onError?.(err);
+      return;
+    }
+    if (closed) return;
+    source = new EventSource(url);
+    source.addEventListener("notification", (event) =>
+      handlers.onNotification?.(JSON.parse(event.data))
+    );
+    source.addEventListener("feedback_message", (event) =>
+      handlers.onFeedbackMessage?.(JSON.parse(event.data))
+    );
+    source.onerror = () => {
+      if (source.readyState === EventSource.CLOSED && !closed) {
+        reopen = setTimeout(open, STREAM_REOPEN_DELAY);
+      }
+    };
+  };
+
+  open();
+  return () => {
+    closed = true;
+    clearTimeout(reopen);
+    source?.close();
+  };
+};
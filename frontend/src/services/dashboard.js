@@ -0,0 +1,12 @@
+const API_BASE =
+  import.meta.env.VITE_API_BASE_URL || "http://localhost:8000/api";
+
+// Counts, upcoming milestones, latest submissions, unread notifications and
+// average scores for the signed-in user, in one request.
+export const getDashboard = async (token) => {
+  const response = await fetch(`${API_BASE}/dashboard/`, {
+    headers: { Authorization: `Bearer ${token}` },
+  });
+  if (!response.ok) throw new Error("Failed to fetch dashboard");
+  return await response.json();
+};
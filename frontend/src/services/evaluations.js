@@ -1,22 +1,20 @@
+import { fetchAllPages } from "../utils/pagination";
+
 const API_BASE =
   import.meta.env.VITE_API_BASE_URL || "http://localhost:8000/api";
 
 export const getRubrics = async (token) => {
-  const response = await fetch(`${API_BASE}/evaluations/rubrics/`, {
-    headers: { Authorization: `Bearer ${token}` },
-  });
-  if (!response.ok) throw new Error("Failed to fetch rubrics");
-  return await response.json();
+  return await fetchAllPages(
+    `${API_BASE}/evaluations/rubrics/`,
+    token,
+    "Failed to fetch rubrics"
+  );
 };
 
 export const getEvaluations = async (token, projectId = null) => {
   let url = `${API_BASE}/evaluations/evaluations/`;
   if (projectId) url += `?project=${projectId}`;
-  const response = await fetch(url, {
-    headers: { Authorization: `Bearer ${token}` },
-  });
-  if (!response.ok) throw new Error("Failed to fetch evaluations");
-  return await response.json();
+  return await fetchAllPages(url, token, "Failed to fetch evaluations");
 };
 
 export const submitEvaluation = async (data, token) => {
@@ -31,3 +29,12 @@ export const submitEvaluation = async (data, token) => {
   if (!response.ok) throw new Error("Failed to submit evaluation");
   return await response.json();
 };
+
+export const getRubricStats = async (rubricId, token) => {
+  const response = await fetch(
+    `${API_BASE}/evaluations/rubrics/${rubricId}/stats/`,
+    { headers: { Authorization: `Bearer ${token}` } }
+  );
+  if (!response.ok) throw new Error("Failed to fetch rubric statistics");
+  return await response.json();
+};
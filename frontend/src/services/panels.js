@@ -0,0 +1,35 @@
+import { fetchAllPages } from "../utils/pagination";
+
+const API_BASE =
+  import.meta.env.VITE_API_BASE_URL || "http://localhost:8000/api";
+
+export const getPanelSessions = async (token) => {
+  return await fetchAllPages(
+    `${API_BASE}/panels/sessions/`,
+    token,
+    "Failed to fetch panel sessions"
+  );
+};
+
+// entries: [{ project, scores: [{ name, score }], comments }]. Nothing is
+// saved unless every entry is valid; the error body lists problems per entry.
+export const submitPanelGrades = async (sessionId, entries, token) => {
+  const response = await fetch(
+    `${API_BASE}/panels/sessions/${sessionId}/grades/`,
+    {
+      method: "POST",
+      headers: {
+        Authorization: `Bearer ${token}`,
+        "Content-Type": "application/json",
+      },
+      body: JSON.stringify({ entries }),
+    }
+  );
+  const data = await response.json();
+  if (!response.ok) {
+    const error = new Error("Failed to save panel grades");
+    error.details = data;
+    throw error;
+  }
+  return data.results;
+};
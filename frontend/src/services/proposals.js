@@ -1,15 +1,28 @@
+import { fetchAllPages } from "../utils/pagination";
+import { chunkedUpload, isLargeFile } from "../utils/chunkedUpload";
+import { openSignedLink } from "../utils/signedLink";
+
 const API_BASE =
   import.meta.env.VITE_API_BASE_URL || "http://localhost:8000/api";
 
 export const getProposals = async (token) => {
-  const response = await fetch(`${API_BASE}/fyps/proposals/`, {
-    headers: { Authorization: `Bearer ${token}` },
-  });
-  if (!response.ok) throw new Error("Failed to fetch proposals");
-  return await response.json();
+  return await fetchAllPages(
+    `${API_BASE}/fyps/proposals/`,
+    token,
+    "Failed to fetch proposals"
+  );
 };
 
 export const submitProposal = async (data, token) => {
+  if (isLargeFile(data.document)) {
+    return chunkedUpload(
+      `${API_BASE}/fyps/proposals/`,
+      "document",
+      data,
+      token,
+      "Failed to submit proposal"
+    );
+  }
   const formData = new FormData();
   for (const key in data) {
     formData.append(key, data[key]);
@@ -36,14 +49,26 @@ export const updateProposal = async (id, data, token) => {
   return await response.json();
 };
 
-export const getProjects = async (token) => {
-  const response = await fetch(`${API_BASE}/fyps/projects/`, {
-    headers: { Authorization: `Bearer ${token}` },
-  });
-  if (!response.ok) throw new Error("Failed to fetch projects");
+// Past proposals that overlap with this one, most similar first.
+export const getSimilarProposals = async (id, token, k = 5) => {
+  const response = await fetch(
+    `${API_BASE}/fyps/proposals/${id}/similar/?k=${k}`,
+    {
+      headers: { Authorization: `Bearer ${token}` },
+    }
+  );
+  if (!response.ok) throw new Error("Failed to fetch similar proposals");
   return await response.json();
 };
 
+export const getProjects = async (token) => {
+  return await fetchAllPages(
+    `${API_BASE}/fyps/projects/`,
+    token,
+    "Failed to fetch projects"
+  );
+};
+
 export const createProject = async (data, token) => {
   const response = await fetch(`${API_BASE}/fyps/projects/`, {
     method: "POST",
@@ -73,11 +98,7 @@ export const updateProject = async (id, data, token) => {
 export const getMilestones = async (token, projectId = null) => {
   let url = `${API_BASE}/fyps/milestones/`;
   if (projectId) url += `?project=${projectId}`;
-  const response = await fetch(url, {
-    headers: { Authorization: `Bearer ${token}` },
-  });
-  if (!response.ok) throw new Error("Failed to fetch milestones");
-  return await response.json();
+  return await fetchAllPages(url, token, "Failed to fetch milestones");
 };
 
 export const createMilestone = async (data, token) => {
@@ -109,14 +130,19 @@ export const updateMilestone = async (id, data, token) => {
 export const getDocuments = async (token, projectId = null) => {
   let url = `${API_BASE}/fyps/documents/`;
   if (projectId) url += `?project=${projectId}`;
-  const response = await fetch(url, {
-    headers: { Authorization: `Bearer ${token}` },
-  });
-  if (!response.ok) throw new Error("Failed to fetch documents");
-  return await response.json();
+  return await fetchAllPages(url, token, "Failed to fetch documents");
 };
 
 export const uploadDocument = async (data, token) => {
+  if (isLargeFile(data.file)) {
+    return chunkedUpload(
+      `${API_BASE}/fyps/documents/`,
+      "file",
+      data,
+      token,
+      "Failed to upload document"
+    );
+  }
   const formData = new FormData();
   for (const key in data) {
     formData.append(key, data[key]);
@@ -129,3 +155,22 @@ export const uploadDocument = async (data, token) => {
   if (!response.ok) throw new Error("Failed to upload document");
   return await response.json();
 };
+
+export const openDocumentDownload = async (id, token) => {
+  await openSignedLink(
+    `${API_BASE}/fyps/documents/${id}/download/`,
+    token,
+    "Failed to download document"
+  );
+};
+
+// A ZIP of every submission and latest document of the user's projects, or
+// of one project when `projectId` is given.
+export const openProjectsExport = async (token, projectId = null) => {
+  const path = projectId ? `${projectId}/export/` : "export/";
+  await openSignedLink(
+    `${API_BASE}/fyps/projects/${path}`,
+    token,
+    "Failed to export projects"
+  );
+};
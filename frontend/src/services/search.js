@@ -0,0 +1,14 @@
+const API_BASE =
+  import.meta.env.VITE_API_BASE_URL || "http://localhost:8000/api";
+
+// Ranked full-text search over proposals, projects, documents and feedback
+// the user can see. `kinds` optionally narrows it, e.g. ["proposal"].
+export const search = async (token, query, kinds = []) => {
+  const params = new URLSearchParams({ q: query });
+  if (kinds.length) params.set("kind", kinds.join(","));
+  const response = await fetch(`${API_BASE}/search/?${params}`, {
+    headers: { Authorization: `Bearer ${token}` },
+  });
+  if (!response.ok) throw new Error("Search failed");
+  return (await response.json()).results;
+};
@@ -1,15 +1,28 @@
+import { fetchAllPages } from "../utils/pagination";
+import { chunkedUpload, isLargeFile } from "../utils/chunkedUpload";
+import { openSignedLink } from "../utils/signedLink";
+
 const API_BASE =
   import.meta.env.VITE_API_BASE_URL || "http://localhost:8000/api";
 
 export const getSubmissions = async (token) => {
-  const response = await fetch(`${API_BASE}/submissions/submissions/`, {
-    headers: { Authorization: `Bearer ${token}` },
-  });
-  if (!response.ok) throw new Error("Failed to fetch submissions");
-  return await response.json();
+  return await fetchAllPages(
+    `${API_BASE}/submissions/submissions/`,
+    token,
+    "Failed to fetch submissions"
+  );
 };
 
 export const submitSubmission = async (data, token) => {
+  if (isLargeFile(data.file)) {
+    return chunkedUpload(
+      `${API_BASE}/submissions/submissions/`,
+      "file",
+      data,
+      token,
+      "Failed to submit submission"
+    );
+  }
   const formData = new FormData();
   for (const key in data) {
     formData.append(key, data[key]);
@@ -46,3 +59,11 @@ export const postFeedbackMessage = async (data, token) => {
   if (!response.ok) throw new Error("Failed to post feedback message");
   return await response.json();
 };
+
+export const openSubmissionDownload = async (id, token) => {
+  await openSignedLink(
+    `${API_BASE}/submissions/submissions/${id}/download/`,
+    token,
+    "Failed to download submission"
+  );
+};
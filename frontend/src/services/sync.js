@@ -0,0 +1,83 @@
+const API_BASE =
+  import.meta.env.VITE_API_BASE_URL || "http://localhost:8000/api";
+
+const STORAGE_KEY = "syncCache";
+
+const emptyCache = () => ({ token: null, collections: {} });
+
+const loadCache = () => {
+  try {
+    return JSON.parse(localStorage.getItem(STORAGE_KEY)) || emptyCache();
+  } catch {
+    return emptyCache();
+  }
+};
+
+export const clearSyncCache = () => localStorage.removeItem(STORAGE_KEY);
+
+export const fetchChanges = async (token, since, cursor) => {
+  const params = new URLSearchParams();
+  if (cursor) params.set("cursor", cursor);
+  else if (since) params.set("since", since);
+  const query = params.toString() ? `?${params}` : "";
+  const response = await fetch(`${API_BASE}/sync/${query}`, {
+    headers: { Authorization: `Bearer ${token}` },
+  });
+  if (!response.ok) throw new Error("Failed to sync");
+  return await response.json();
+};
+
+// Fetch every page of one sync: responses are capped at a page of rows and
+// name the next page's cursor until the last one, which carries the token.
+const fetchAllChanges = async (token, since) => {
+  const pages = [await fetchChanges(token, since)];
+  while (pages[pages.length - 1].next) {
+    pages.push(await fetchChanges(token, null, pages[pages.length - 1].next));
+  }
+  return pages;
+};
+
+// Apply one /sync/ page to the cached collections (objects keyed by id).
+const applyChanges = (collections, data) => {
+  const updated = { ...collections };
+  Object.entries(data.changed).forEach(([name, rows]) => {
+    const rowsById = { ...(updated[name] || {}) };
+    rows.forEach((row) => {
+      rowsById[row.id] = row;
+    });
+    (data.deleted[name] || []).forEach((id) => {
+      delete rowsById[id];
+    });
+    updated[name] = rowsById;
+  });
+  return updated;
+};
+
+// Bring the locally cached projects, milestones, documents, submissions,
+// feedback messages, evaluations and notifications up to date, downloading
+// only what changed since the last sync. Returns each collection as a list.
+export const syncAll = async (token) => {
+  let cache = loadCache();
+  let pages;
+  try {
+    pages = await fetchAllChanges(token, cache.token);
+  } catch (error) {
+    if (!cache.token) throw error;
+    // The stored token may be unusable; start over with a full snapshot.
+    cache = emptyCache();
+    pages = await fetchAllChanges(token);
+  }
+  // A full snapshot replaces the cached copy once all its pages are in.
+  const collections = pages.reduce(
+    applyChanges,
+    pages[0].full ? {} : cache.collections
+  );
+  cache = { token: pages[pages.length - 1].token, collections };
+  localStorage.setItem(STORAGE_KEY, JSON.stringify(cache));
+  return Object.fromEntries(
+    Object.entries(cache.collections).map(([name, rowsById]) => [
+      name,
+      Object.values(rowsById),
+    ])
+  );
+};
@@ -0,0 +1,90 @@
+// Large files are sent in resumable chunks: open an upload session, PATCH the
+// bytes at the server's offset, then complete it with the remaining fields.
+
+export const CHUNKED_UPLOAD_THRESHOLD = 8 * 1024 * 1024;
+const CHUNK_SIZE = 4 * 1024 * 1024;
+const MAX_RETRIES = 5;
+
+const sendChunk = async (url, file, offset, token) => {
+  const response = await fetch(url, {
+    method: "PATCH",
+    headers: {
+      Authorization: `Bearer ${token}`,
+      "Content-Type": "application/offset+octet-stream",
+      "Upload-Offset": String(offset),
+    },
+    body: file.slice(offset, offset + CHUNK_SIZE),
+  });
+  // 409 means the server already has a different offset; resume from it.
+  if (!response.ok && response.status !== 409) {
+    throw new Error("Failed to upload chunk");
+  }
+  return (await response.json()).offset;
+};
+
+// Best effort: sessions the server never hears about again expire anyway.
+const abortUpload = (url, token) =>
+  fetch(url, {
+    method: "DELETE",
+    headers: { Authorization: `Bearer ${token}` },
+  }).catch(() => {});
+
+const currentOffset = async (url, token) => {
+  const response = await fetch(url, {
+    headers: { Authorization: `Bearer ${token}` },
+  });
+  if (!response.ok) throw new Error("Failed to resume upload");
+  return (await response.json()).offset;
+};
+
+export const chunkedUpload = async (
+  endpoint,
+  fileField,
+  data,
+  token,
+  errorMessage
+) => {
+  const file = data[fileField];
+  const start = await fetch(`${endpoint}uploads/`, {
+    method: "POST",
+    headers: {
+      Authorization: `Bearer ${token}`,
+      "Content-Type": "application/json",
+    },
+    body: JSON.stringify({ filename: file.name, size: file.size }),
+  });
+  if (!start.ok) throw new Error(errorMessage);
+  const { id } = await start.json();
+  const url = `${endpoint}uploads/${id}/`;
+
+  let offset = 0;
+  let retries = 0;
+  while (offset < file.size) {
+    try {
+      offset = await sendChunk(url, file, offset, token);
+      retries = 0;
+    } catch (error) {
+      if (++retries > MAX_RETRIES) {
+        await abortUpload(url, token);
+        throw new Error(errorMessage);
+      }
+      offset = await currentOffset(url, token);
+    }
+  }
+
+  const fields = { ...data };
+  delete fields[fileField];
+  const response = await fetch(`${url}complete/`, {
+    method: "POST",
+    headers: {
+      Authorization: `Bearer ${token}`,
+      "Content-Type": "application/json",
+    },
+    body: JSON.stringify(fields),
+  });
+  if (!response.ok) throw new Error(errorMessage);
+  return await response.json();
+};
+
+export const isLargeFile = (file) =>
+  file instanceof Blob && file.size > CHUNKED_UPLOAD_THRESHOLD;
@@ -0,0 +1,21 @@
+// List endpoints are cursor-paginated: each page is { next, previous, results }.
+
+export const fetchPage = async (url, token, errorMessage) => {
+  const response = await fetch(url, {
+    headers: { Authorization: `Bearer ${token}` },
+  });
+  if (!response.ok) throw new Error(errorMessage);
+  return await response.json();
+};
+
+// Follows the `next` cursor links and returns every row as a plain array.
+export const fetchAllPages = async (url, token, errorMessage) => {
+  const results = [];
+  let next = url;
+  while (next) {
+    const page = await fetchPage(next, token, errorMessage);
+    results.push(...page.results);
+    next = page.next;
+  }
+  return results;
+};
@@ -0,0 +1,24 @@
+// Download and export URLs are opened as plain links, which cannot carry the
+// Authorization header. Instead of putting the access token in the URL, ask
+// the API for a short-lived token signed for that one path.
+
+const API_BASE =
+  import.meta.env.VITE_API_BASE_URL || "http://localhost:8000/api";
+
+export const signLink = async (url, token, errorMessage) => {
+  const response = await fetch(`${API_BASE}/download-links/`, {
+    method: "POST",
+    headers: {
+      Authorization: `Bearer ${token}`,
+      "Content-Type": "application/json",
+    },
+    body: JSON.stringify({ path: new URL(url).pathname }),
+  });
+  if (!response.ok) throw new Error(errorMessage);
+  const { url: signed } = await response.json();
+  return new URL(signed, url).href;
+};
+
+export const openSignedLink = async (url, token, errorMessage) => {
+  window.location.assign(await signLink(url, token, errorMessage));
+};